@@ -1,5 +1,6 @@
 from src.db.database import DATABASE_URL
 from src.db.database import get_metadata
+from src.db.search import FTS_TABLES
 
 from logging.config import fileConfig
 
@@ -28,6 +29,23 @@ if config.config_file_name is not None:
 # ... etc.
 
 
+# FTS5 virtual tables (migration 7d3e5a9b1f42) and the shadow tables SQLite
+# creates for them are not in the models; autogenerate must not drop them
+FTS_SHADOW_SUFFIXES = ("_data", "_idx", "_docsize", "_config")
+FTS_TABLE_NAMES = {fts_table for fts_table, _ in FTS_TABLES.values()} | {
+    fts_table + suffix
+    for fts_table, _ in FTS_TABLES.values()
+    for suffix in FTS_SHADOW_SUFFIXES
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leaves the full-text search tables out of autogenerate."""
+    if type_ == "table" and name in FTS_TABLE_NAMES:
+        return False
+    return True
+
+
 if DATABASE_URL is None:
     raise ValueError(
         "Database URL cannot be determined. Set DATABASE_URL environment variable."
@@ -50,6 +68,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=DATABASE_URL,
         target_metadata=get_metadata(),
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -77,7 +96,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=get_metadata())
+        context.configure(
+            connection=connection,
+            target_metadata=get_metadata(),
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
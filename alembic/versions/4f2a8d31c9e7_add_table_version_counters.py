@@ -0,0 +1,76 @@
+"""add_table_version_counters
+
+Revision ID: 4f2a8d31c9e7
+Revises: 9b1e4c7d2a60
+Create Date: 2026-10-16 14:27:05.318842
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2a8d31c9e7"
+down_revision: str | None = "9b1e4c7d2a60"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Reference tables read through CachedSQLModelRepository
+VERSIONED_TABLES = ["bidding", "supplier", "bidder"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table_version = op.create_table(
+        "table_version",
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+    op.bulk_insert(
+        table_version, [{"table_name": name, "version": 0} for name in VERSIONED_TABLES]
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            """
+            CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+            BEGIN
+                UPDATE table_version SET version = version + 1
+                WHERE table_name = TG_TABLE_NAME;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        for name in VERSIONED_TABLES:
+            op.execute(
+                f"CREATE TRIGGER trg_{name}_version "
+                f"AFTER INSERT OR UPDATE OR DELETE ON {name} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+            )
+    else:  # SQLite: one row-level trigger per operation
+        for name in VERSIONED_TABLES:
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                op.execute(
+                    f"CREATE TRIGGER trg_{name}_version_{operation.lower()} "
+                    f"AFTER {operation} ON {name} BEGIN "
+                    "UPDATE table_version SET version = version + 1 "
+                    f"WHERE table_name = '{name}'; END"
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        for name in VERSIONED_TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{name}_version ON {name}")
+        op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    else:
+        for name in VERSIONED_TABLES:
+            for operation in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER IF EXISTS trg_{name}_version_{operation}")
+    op.drop_table("table_version")
@@ -0,0 +1,85 @@
+"""add_full_text_search_indexes
+
+Revision ID: 7d3e5a9b1f42
+Revises: 4f2a8d31c9e7
+Create Date: 2026-10-16 16:02:48.771305
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3e5a9b1f42"
+down_revision: str | None = "4f2a8d31c9e7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Searched columns per table (kept in sync with db/search.py FTS_TABLES)
+SEARCH_COLUMNS = {
+    "item": ["name", "desc", "code"],
+    "supplier": ["name", "website", "email", "phone", "desc"],
+    "bidder": ["name", "website", "email", "phone", "desc"],
+    "bidding": ["city", "process_number"],
+}
+
+
+def _quoted(columns: list[str], prefix: str = "") -> str:
+    # "desc" is an SQL keyword, so every column name is quoted
+    return ", ".join(f'{prefix}"{name}"' for name in columns)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        # ILIKE '%term%' is answered from trigram GIN indexes
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table_name, columns in SEARCH_COLUMNS.items():
+            for name in columns:
+                op.execute(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{name}_trgm "
+                    f'ON {table_name} USING gin ("{name}" gin_trgm_ops)'
+                )
+        return
+
+    # SQLite: external-content FTS5 tables (trigram tokenizer = substring search)
+    for table_name, columns in SEARCH_COLUMNS.items():
+        fts = f"{table_name}_fts"
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({_quoted(columns)}, "
+            f"content='{table_name}', content_rowid='id', tokenize='trigram')"
+        )
+        new_values = f"new.id, {_quoted(columns, 'new.')}"
+        old_values = f"'delete', old.id, {_quoted(columns, 'old.')}"
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+            f"INSERT INTO {fts}(rowid, {_quoted(columns)}) VALUES ({new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {_quoted(columns)}) VALUES ({old_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {_quoted(columns)}) VALUES ({old_values}); "
+            f"INSERT INTO {fts}(rowid, {_quoted(columns)}) VALUES ({new_values}); END"
+        )
+        # Index the rows that already exist
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        for table_name, columns in SEARCH_COLUMNS.items():
+            for name in columns:
+                op.execute(f"DROP INDEX IF EXISTS ix_{table_name}_{name}_trgm")
+        return
+
+    for table_name in SEARCH_COLUMNS:
+        fts = f"{table_name}_fts"
+        for suffix in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,45 @@
+"""add_foreign_key_and_filter_indexes
+
+Revision ID: 9b1e4c7d2a60
+Revises: 621d0e3f2702
+Create Date: 2026-10-16 09:12:31.204518
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b1e4c7d2a60"
+down_revision: str | None = "621d0e3f2702"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f("ix_item_bidding_id"), "item", ["bidding_id"], unique=False)
+    op.create_index(op.f("ix_quote_item_id"), "quote", ["item_id"], unique=False)
+    op.create_index(
+        op.f("ix_quote_supplier_id"), "quote", ["supplier_id"], unique=False
+    )
+    op.create_index(op.f("ix_bid_item_id"), "bid", ["item_id"], unique=False)
+    op.create_index(op.f("ix_bid_bidding_id"), "bid", ["bidding_id"], unique=False)
+    op.create_index(op.f("ix_bid_bidder_id"), "bid", ["bidder_id"], unique=False)
+    # Bid timeline chart: bids of one item ordered by time
+    op.create_index(
+        "ix_bid_item_id_created_at", "bid", ["item_id", "created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_bid_item_id_created_at", table_name="bid")
+    op.drop_index(op.f("ix_bid_bidder_id"), table_name="bid")
+    op.drop_index(op.f("ix_bid_bidding_id"), table_name="bid")
+    op.drop_index(op.f("ix_bid_item_id"), table_name="bid")
+    op.drop_index(op.f("ix_quote_supplier_id"), table_name="quote")
+    op.drop_index(op.f("ix_quote_item_id"), table_name="quote")
+    op.drop_index(op.f("ix_item_bidding_id"), table_name="item")
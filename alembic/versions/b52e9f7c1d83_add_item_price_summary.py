@@ -0,0 +1,51 @@
+"""add_item_price_summary
+
+Revision ID: b52e9f7c1d83
+Revises: 7d3e5a9b1f42
+Create Date: 2026-10-16 23:41:09.512377
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b52e9f7c1d83"
+down_revision: str | None = "7d3e5a9b1f42"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are filled by the application (services/price_summary.py): calculated
+    # quote prices come from the pricing engine, and items without a row are
+    # summarized on first read, so there is no backfill here. Deleting an item
+    # removes its row through the item_id ON DELETE CASCADE, which SQLite only
+    # runs on connections with PRAGMA foreign_keys=ON (set in db/database.py).
+    op.create_table(
+        "item_price_summary",
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("quote_count", sa.Integer(), nullable=False),
+        sa.Column("min_quote_price", sa.Numeric(precision=20, scale=4), nullable=True),
+        sa.Column("avg_quote_price", sa.Numeric(precision=20, scale=4), nullable=True),
+        sa.Column("max_quote_price", sa.Numeric(precision=20, scale=4), nullable=True),
+        sa.Column("best_supplier_id", sa.Integer(), nullable=True),
+        sa.Column("bid_count", sa.Integer(), nullable=False),
+        sa.Column("lowest_bid_price", sa.Numeric(precision=20, scale=5), nullable=True),
+        sa.Column("leading_bidder_id", sa.Integer(), nullable=True),
+        sa.Column("last_bid_at", sa.DateTime(), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["item_id"], ["item.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["best_supplier_id"], ["supplier.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["leading_bidder_id"], ["bidder.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("item_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("item_price_summary")
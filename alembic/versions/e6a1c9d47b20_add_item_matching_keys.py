@@ -0,0 +1,107 @@
+"""add_item_matching_keys
+
+Revision ID: e6a1c9d47b20
+Revises: b52e9f7c1d83
+Create Date: 2026-10-17 00:12:44.903126
+
+"""
+
+import re
+import unicodedata
+from collections.abc import Sequence
+from typing import Any
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e6a1c9d47b20"
+down_revision: str | None = "b52e9f7c1d83"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+# Frozen copy of db/keys.py at this revision: the backfill must keep producing
+# these keys even if the application's normalization changes later
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(value: Any) -> str:
+    if value is None:
+        return ""
+    text = str(value)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALPHANUMERIC.sub(" ", text.lower()).strip()
+
+
+def normalize_code(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return normalize_name(value).replace(" ", "")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("item", sa.Column("code_key", sa.String(), nullable=True))
+    op.add_column("item", sa.Column("name_key", sa.String(), nullable=True))
+    op.create_index(op.f("ix_item_code_key"), "item", ["code_key"], unique=False)
+    op.create_index(op.f("ix_item_name_key"), "item", ["name_key"], unique=False)
+
+    # Keys of the existing items, computed like the application does on
+    # insert/update (db/models.py) with the frozen copy above
+    item = sa.table(
+        "item",
+        sa.column("id", sa.Integer),
+        sa.column("code", sa.String),
+        sa.column("name", sa.String),
+        sa.column("code_key", sa.String),
+        sa.column("name_key", sa.String),
+    )
+    bind = op.get_bind()
+    update = (
+        item.update()
+        .where(item.c.id == sa.bindparam("item_id"))
+        .values(code_key=sa.bindparam("new_code_key"), name_key=sa.bindparam("new_name_key"))
+    )
+    # Batches of BACKFILL_BATCH_SIZE rows by id range (each starts after the last
+    # id of the previous one): one SELECT and one executemany UPDATE per batch,
+    # so the table is never held in memory at once
+    last_id = -1
+    while True:
+        rows = bind.execute(
+            sa.select(item.c.id, item.c.code, item.c.name)
+            .where(item.c.id > last_id)
+            .order_by(item.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        bind.execute(
+            update,
+            [
+                {
+                    "item_id": row.id,
+                    "new_code_key": normalize_code(row.code) or None,
+                    "new_name_key": normalize_name(row.name) or None,
+                }
+                for row in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_item_name_key"), table_name="item")
+    op.drop_index(op.f("ix_item_code_key"), table_name="item")
+    # Plain DROP COLUMN (SQLite >= 3.35): a batch table copy would drop the
+    # item_fts triggers
+    op.drop_column("item", "name_key")
+    op.drop_column("item", "code_key")
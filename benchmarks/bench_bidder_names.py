@@ -0,0 +1,102 @@
+"""
+Bidder name resolution in get_bids_dataframe: row-wise apply vs map + fillna.
+
+Usage (from the project root):
+    python benchmarks/bench_bidder_names.py [--rows 100000] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from db.models import Bidder  # noqa: E402
+from services.dataframes import get_bids_dataframe  # noqa: E402
+
+UNKNOWN_BIDDER = "Licitante Desconhecido"
+
+
+def make_bids(rows: int, bidders: int, null_share: float, seed: int = 8) -> pd.DataFrame:
+    """Bid rows with random bidder ids; `null_share` of them without bidder."""
+    rng = np.random.default_rng(seed)
+    # One id past the bidders list, so some ids are missing from the map too
+    bidder_ids = pd.Series(rng.integers(1, bidders + 2, rows), dtype="Int64")
+    bidder_ids[rng.random(rows) < null_share] = pd.NA
+    return pd.DataFrame(
+        {
+            "id": np.arange(1, rows + 1),
+            "item_id": rng.integers(1, 500, rows),
+            "bidding_id": 1,
+            "bidder_id": bidder_ids.astype(object).where(bidder_ids.notna(), None),
+            "price": rng.integers(100, 10**6, rows) / 100,
+            "notes": None,
+            "created_at": pd.Timestamp("2026-01-01"),
+            "updated_at": pd.Timestamp("2026-01-01"),
+            "item_name": "Item",
+        }
+    )
+
+
+def names_with_apply(bids_df: pd.DataFrame, bidders_list: list[Bidder]) -> pd.Series:
+    """The resolution get_bids_dataframe used before: map, then a row-wise apply."""
+    bidder_map = {b.id: b.name for b in bidders_list}
+    bids_df = bids_df.copy()
+    bids_df["bidder_name"] = bids_df["bidder_id"].map(bidder_map)
+    return bids_df.apply(
+        lambda row: UNKNOWN_BIDDER
+        if pd.isna(row["bidder_id"])
+        else bidder_map.get(row["bidder_id"], UNKNOWN_BIDDER),
+        axis=1,
+    )
+
+
+def names_with_map(bids_df: pd.DataFrame, bidders_list: list[Bidder]) -> pd.Series:
+    """The current resolution: one map and one fillna."""
+    bidder_map = {b.id: b.name for b in bidders_list}
+    return bids_df["bidder_id"].map(bidder_map).fillna(UNKNOWN_BIDDER)
+
+
+def best_time(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--bidders", type=int, default=60)
+    parser.add_argument("--null-share", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bids_df = make_bids(args.rows, args.bidders, args.null_share)
+    bidders_list = [Bidder(id=i, name=f"Licitante {i}") for i in range(1, args.bidders + 1)]
+
+    old = names_with_apply(bids_df, bidders_list)
+    new = names_with_map(bids_df, bidders_list)
+    # No 'bidder_name' column, so get_bids_dataframe resolves it from the list
+    full = get_bids_dataframe(bids_df, bidders_list)["bidder_name"]
+    assert old.equals(new) and new.equals(full), "bidder_name differs between the paths"
+
+    nulls = int(bids_df["bidder_id"].isna().sum())
+    print(f"{args.rows} bids, {args.bidders} bidders, {nulls} without bidder")
+    paths = {
+        "apply(axis=1)": lambda: names_with_apply(bids_df, bidders_list),
+        "map().fillna()": lambda: names_with_map(bids_df, bidders_list),
+        "get_bids_dataframe": lambda: get_bids_dataframe(bids_df, bidders_list),
+    }
+    for label, fn in paths.items():
+        print(f"{label:<20} {best_time(fn, args.repeat):.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 from decimal import Decimal
+import functools
+import logging
+import os
 import streamlit as st
 import pandas as pd
 
@@ -12,12 +15,30 @@ from db.models import (
 )
 
 from repository.sqlmodel import SQLModelRepository  # Updated import for new location
+from repository.cached import CachedSQLModelRepository
+from repository.unit_of_work import request_scope
 
 # from services import core as core_services # No longer needed in app.py
 from services.dataframes import get_quotes_dataframe, get_bids_dataframe
+from repository.queries import bids_with_names, quotes_with_names
+from services.diff import build_change_set
+from services.export import EXPORT_MIME_TYPES, available_formats, export_bidding
+from services.price_summary import PriceSummaryStore
+from services.price_history import (
+    MATCH_MODES,
+    load_price_history,
+    summarize_price_history,
+)
+from services.auction import NO_BIDDER_NAME
+from services.similarity import similar_item_quotes
+from services.scenarios import ScenarioOverrides, simulate_bidding
 
 # from state import initialize_session_state # Will be defined in-file
-from services.plotting import create_quotes_figure, create_bids_figure
+from services.plotting import (
+    cached_bids_figure,
+    cached_quotes_figure,
+    create_price_history_figure,
+)
 from ui.utils.utils import get_options_map  # Added src. and .utils
 from ui.components.dialogs import (  # Added src. and changed to components
     manage_bidding_dialog_wrapper,
@@ -29,6 +50,7 @@ from ui.components.dialogs import (  # Added src. and changed to components
 from ui.pages.main_page import (
     show_management_tables_view,
 )  # Added src. and changed to pages
+from ui.pages.auction_page import show_auction_view
 
 # --- Application Setup (must be first Streamlit command) ---
 APP_TITLE = "📊 Licitações"  # Define APP_TITLE before using it
@@ -91,17 +113,27 @@ def _open_dialog_exclusively(dialog_type_to_open: str):
         st.session_state.show_manage_bidder_dialog = True
 
 
+# Per-run query counts are logged at INFO (see repository.unit_of_work)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
 # --- Database Repository Instances ---
 db_url = "sqlite:///data/bidtrack.db"  # Define the database URL
+# All repositories below share one cached engine/pool for this URL (see db.database.get_engine),
+# so reruns and sessions reuse the same connections instead of building new engines.
 
-bidding_repo = SQLModelRepository(Bidding, db_url)
+# Biddings, suppliers and bidders change rarely and are read many times per rerun
+# (selects, dialogs, parent selection): their reads are served from a process-wide
+# cache that is dropped on writes (see repository.cached.CachedSQLModelRepository).
+bidding_repo = CachedSQLModelRepository(Bidding, db_url)
 item_repo = SQLModelRepository(Item, db_url)
-supplier_repo = SQLModelRepository(Supplier, db_url)
-bidder_repo = SQLModelRepository(
+supplier_repo = CachedSQLModelRepository(Supplier, db_url)
+bidder_repo = CachedSQLModelRepository(
     Bidder, db_url
 )  # competitor_repo -> bidder_repo, Competitor -> Bidder
 quote_repo = SQLModelRepository(Quote, db_url)
 bid_repo = SQLModelRepository(Bid, db_url)
+# Per-item min/avg/max quote, lowest bid, leader... kept up to date on every write
+price_summaries = PriceSummaryStore(quote_repo.engine)
 
 # --- Constants ---
 DEFAULT_BIDDING_SELECT_MESSAGE = "Selecione ou Cadastre uma Licitação..."
@@ -118,7 +150,7 @@ initialize_session_state()
 st.sidebar.title("Navegação")
 current_view = st.sidebar.radio(
     "Escolha uma visualização:",
-    ["Principal", "Visão Geral"],
+    ["Principal", "Visão Geral", "Pregão ao Vivo"],
     key="navigation_radio",  # Add key for explicit state management
 )
 if current_view != st.session_state.current_view:
@@ -126,6 +158,874 @@ if current_view != st.session_state.current_view:
     # st.rerun() # Re-run to update view if selection changes
 
 
+# --- Item Detail Fragments ---
+# The parts of the item panel rerun on their own (st.fragment): typing in a form,
+# editing a cell or opening an expander reruns only that part, not the selectors,
+# the other editor and the charts. Writes and dialog buttons call st.rerun(),
+# which reruns the whole script so every part shows the new state.
+
+
+def item_fragment(name: str):
+    """st.fragment whose reruns open their own unit of work (see request_scope)."""
+
+    def decorator(func):
+        @st.fragment
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # During a full run this reuses the run's scope
+            with request_scope(f"Fragmento ({name})"):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def load_item_quotes_df(item_id: int) -> pd.DataFrame:
+    """Quotes of the item with supplier/item names joined in the database."""
+    return get_quotes_dataframe(
+        quotes_list=quote_repo.fetch_frame(quotes_with_names(item_id=item_id))
+    )
+
+
+def load_item_bids_df(item_id: int) -> pd.DataFrame:
+    """Bids of the item with bidder/item names joined in the database."""
+    return get_bids_dataframe(
+        bids_list=bid_repo.fetch_frame(bids_with_names(item_id=item_id))
+    )
+
+
+@item_fragment("novo orçamento")
+def show_quote_entry(current_item_details: Item):
+    with st.expander(
+        "Novo Orçamento",
+        expanded=False,
+    ):
+        col_supp_select, col_supp_manage = st.columns(
+            [3, 2], vertical_alignment="bottom"
+        )
+        all_suppliers = supplier_repo.get_all()
+        supplier_options_map, supplier_option_ids = get_options_map(
+            data_list=all_suppliers,
+            default_message=DEFAULT_SUPPLIER_SELECT_MESSAGE,
+        )
+        with col_supp_select:
+            selected_supplier_id_quote = st.selectbox(
+                "Fornecedor*:",
+                options=supplier_option_ids,
+                format_func=lambda x: supplier_options_map.get(
+                    x, DEFAULT_SUPPLIER_SELECT_MESSAGE
+                ),
+                key="sb_supplier_quote_exp",
+            )
+        with col_supp_manage:
+            if st.button(
+                "👤 Ger. Fornecedores",
+                key="btn_manage_suppliers_quote_exp",
+                use_container_width=True,
+            ):
+                st.session_state.editing_supplier_id = (
+                    selected_supplier_id_quote
+                )
+                _open_dialog_exclusively("supplier")
+                st.rerun()  # The dialog is rendered outside this fragment
+        with st.form(key="new_quote_form"):
+            quote_price = st.number_input(
+                "Preço do Orçamento (Custo do Produto)*",
+                min_value=0.01,
+                format="%.2f",
+                key="quote_price_input_exp",
+            )
+            quote_freight = st.number_input(
+                "Frete (R$)",
+                min_value=0.00,
+                format="%.2f",
+                key="quote_freight_input_exp",
+                value=0.00,
+            )
+            quote_additional_costs = st.number_input(
+                "Custos Adicionais (R$)",
+                min_value=0.00,
+                format="%.2f",
+                key="quote_additional_costs_input_exp",
+                value=0.00,
+            )
+            quote_taxes = st.number_input(
+                "Impostos (%)",
+                min_value=0.00,
+                format="%.2f",
+                key="quote_taxes_input_exp",
+                help="Percentual de impostos sobre o preço de venda. Ex: 6 para 6%",
+                value=0.00,
+            )
+            quote_margin = st.number_input(
+                "Margem de Lucro Desejada (%)*",
+                min_value=0.0,
+                format="%.2f",
+                key="quote_margin_input_exp",
+                help="Valor da margem em decimal. Ex: 0.2 para 20%",
+            )
+            quote_notes = st.text_area(
+                "Notas do Orçamento", key="quote_notes_input_exp"
+            )
+            quote_link = st.text_input(
+                "Link do Produto (Opcional)",
+                key="quote_link_input_exp",
+            )
+            if st.form_submit_button("💾 Salvar Orçamento"):
+                if (
+                    selected_supplier_id_quote
+                    and quote_price > 0
+                    and st.session_state.selected_item_id
+                    is not None
+                ):
+                    try:
+                        new_quote_instance = Quote(
+                            item_id=st.session_state.selected_item_id,
+                            supplier_id=selected_supplier_id_quote,
+                            price=Decimal(str(quote_price)),
+                            freight=Decimal(str(quote_freight)),
+                            additional_costs=Decimal(
+                                str(quote_additional_costs)
+                            ),
+                            taxes=Decimal(str(quote_taxes)),
+                            margin=quote_margin,
+                            notes=quote_notes
+                            if quote_notes
+                            else None,
+                            link=quote_link
+                            if quote_link
+                            else None,  # Added line
+                        )
+                        added_quote = quote_repo.add(
+                            new_quote_instance
+                        )
+                        st.success(
+                            f"Orçamento de {supplier_options_map.get(selected_supplier_id_quote, 'Fornecedor')} (ID: {added_quote.id}) adicionado!"
+                        )
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Erro ao salvar orçamento: {e}")
+                else:
+                    st.error(
+                        "Selecione um item, um fornecedor, e insira preço e margem válidos."
+                    )
+
+
+@item_fragment("novo lance")
+def show_bid_entry(current_item_details: Item):
+    with st.expander(
+        "Novo Lance",
+        expanded=False,
+    ):
+        col_bidder_select, col_bidder_manage = st.columns(
+            [3, 2], vertical_alignment="bottom"
+        )
+        all_bidders = bidder_repo.get_all()
+        bidder_options_map, bidder_option_ids = get_options_map(
+            data_list=all_bidders,
+            default_message=DEFAULT_COMPETITOR_SELECT_MESSAGE,
+        )
+
+        NO_BIDDER_SENTINEL = "___NO_BIDDER___"
+        initial_prompt_id = (
+            bidder_option_ids[0]
+            if bidder_option_ids and bidder_option_ids[0] is None
+            else "___NO_DEFAULT_PROMPT___"
+        )
+
+        bidder_options_map_display = bidder_options_map.copy()
+        bidder_option_ids_display = list(bidder_option_ids)
+        bidder_options_map_display[NO_BIDDER_SENTINEL] = (
+            "Nenhum Licitante"
+        )
+
+        prompt_is_none_and_present = (
+            initial_prompt_id is None
+            and None in bidder_option_ids_display
+        )
+        insert_idx = 1 if prompt_is_none_and_present else 0
+        if NO_BIDDER_SENTINEL not in bidder_option_ids_display:
+            bidder_option_ids_display.insert(
+                insert_idx, NO_BIDDER_SENTINEL
+            )
+
+        try:
+            default_bidder_index = bidder_option_ids_display.index(
+                NO_BIDDER_SENTINEL
+            )
+        except ValueError:
+            default_bidder_index = 0
+
+        with col_bidder_select:
+            selected_bidder_id_bid = st.selectbox(
+                "Licitante:",
+                options=bidder_option_ids_display,
+                format_func=lambda x: bidder_options_map_display.get(
+                    x, DEFAULT_COMPETITOR_SELECT_MESSAGE
+                ),
+                key="sb_bidder_bid_exp",
+                index=default_bidder_index,
+            )
+        with col_bidder_manage:
+            if st.button(
+                "👤 Ger. Licitantes",
+                key="btn_manage_bidders_bid_exp",
+                use_container_width=True,
+            ):
+                st.session_state.editing_bidder_id = (
+                    selected_bidder_id_bid
+                )
+                _open_dialog_exclusively("bidder")
+                st.rerun()  # The dialog is rendered outside this fragment
+        with st.form(key="new_bid_form"):
+            bid_price = st.number_input(
+                "Preço do Lance*",
+                min_value=0.01,
+                format="%.2f",
+                key="bid_price_input_exp",
+            )
+            bid_notes = st.text_area(
+                "Notas do Lance", key="bid_notes_input_exp"
+            )
+            if st.form_submit_button("💾 Salvar Lance"):
+                actual_bidder_id_to_save = selected_bidder_id_bid
+                if selected_bidder_id_bid == NO_BIDDER_SENTINEL:
+                    actual_bidder_id_to_save = None
+
+                if selected_bidder_id_bid is None:
+                    st.error(
+                        "Por favor, selecione um Licitante ou a opção 'Nenhum Licitante'."
+                    )
+                elif (
+                    bid_price > 0
+                    and st.session_state.selected_item_id
+                    is not None
+                    and hasattr(current_item_details, "bidding_id")
+                ):
+                    try:
+                        new_bid_instance = Bid(
+                            item_id=st.session_state.selected_item_id,
+                            bidding_id=current_item_details.bidding_id,
+                            bidder_id=actual_bidder_id_to_save,
+                            price=Decimal(str(bid_price)),
+                            notes=bid_notes if bid_notes else None,
+                        )
+                        added_bid = bid_repo.add(new_bid_instance)
+
+                        bidder_name_for_success_message = (
+                            "Nenhum Licitante"
+                        )
+                        if actual_bidder_id_to_save is not None:
+                            bidder_name_for_success_message = (
+                                bidder_options_map_display.get(
+                                    actual_bidder_id_to_save,
+                                    "Licitante Desconhecido",
+                                )
+                            )
+
+                        st.success(
+                            f"Lance de {bidder_name_for_success_message} (ID: {added_bid.id}) adicionado!"
+                        )
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Erro ao salvar lance: {e}")
+                else:
+                    st.error(
+                        "Insira um preço de lance válido e certifique-se que um item está selecionado. Verifique também a seleção do licitante."
+                    )
+
+
+@item_fragment("orçamentos")
+def show_quotes_editor(item_id: int):
+    original_quotes_df = load_item_quotes_df(item_id)
+    st.markdown("##### Orçamentos do Item")
+    if not original_quotes_df.empty:
+        # original_quotes_df is the direct output of get_quotes_dataframe (all columns, 'id' is a column)
+
+        # 2. Update column_config_quotes_main
+        column_config_quotes_main = {
+            "id": None,  # Hide 'id' column by default
+            "item_id": None,  # Hide 'item_id'
+            "supplier_id": None,  # Hide 'supplier_id'
+            "created_at": None,  # Hide 'created_at'
+            "updated_at": None,  # Hide 'updated_at'
+            "item_name": None,  # Hide "Item" column by default
+            "supplier_name": st.column_config.TextColumn(
+                "Fornecedor",
+                disabled=True,
+                help="Nome do fornecedor (não editável aqui)",
+            ),
+            "price": st.column_config.NumberColumn(
+                "Custo Base (R$)",
+                format="%.2f",
+                required=True,
+                help="Preço de custo do produto/serviço junto ao fornecedor.",
+            ),
+            "freight": st.column_config.NumberColumn(
+                "Frete (R$)", format="%.2f", help="Valor do frete."
+            ),
+            "additional_costs": st.column_config.NumberColumn(
+                "Custos Adic. (R$)",
+                format="%.2f",
+                help="Outros custos diretos.",
+            ),
+            "taxes": st.column_config.NumberColumn(
+                "Impostos (%)",
+                format="%.2f",
+                help="Percentual de impostos incidentes sobre o preço de venda. Ex: 6 para 6%.",
+            ),
+            "margin": st.column_config.NumberColumn(
+                "Margem (%)",
+                format="%.2f",
+                required=True,
+                help="Margem de lucro desejada sobre o custo total. Ex: 20 para 20%.",
+            ),
+            "calculated_price": st.column_config.NumberColumn(
+                "Preço Final Calculado",
+                format="R$ %.2f",
+                disabled=True,
+                help="Preço final de venda (calculado automaticamente).",
+            ),
+            "notes": st.column_config.TextColumn(
+                "Notas", help="Observações sobre o orçamento."
+            ),
+            "link": st.column_config.LinkColumn(
+                "Link do Produto",
+                help="Link para a página do produto no site do fornecedor.",
+                validate=r"^https?://[\w\.-]+",
+            ),
+        }
+        # Ensure all columns from original_quotes_df are present in config, adding None if missing
+        for col_name in original_quotes_df.columns:
+            if col_name not in column_config_quotes_main:
+                column_config_quotes_main[col_name] = (
+                    None  # Hide unspecified columns by default
+                )
+
+        # 1. DataFrame for Editor: Pass original_quotes_df
+        # hide_index=True means edited_quotes_df will have a range index. 'id' will be a column in edited_quotes_df.
+        edited_quotes_df = st.data_editor(
+            original_quotes_df,  # Pass the full original DataFrame
+            column_config=column_config_quotes_main,
+            key="quotes_editor_main_view",
+            use_container_width=True,
+            hide_index=True,
+            num_rows="dynamic",
+        )
+
+        if st.button(
+            "Salvar Alterações nos Orçamentos",
+            key="save_quotes_main_view",
+        ):
+            changes_made = False
+            # Vectorized diff of the editor against the loaded quotes
+            # (see services/diff.py); only changed rows are written
+            quote_change_set = build_change_set(
+                original_quotes_df,
+                edited_quotes_df,
+                editable_columns=[
+                    "price",
+                    "freight",
+                    "additional_costs",
+                    "taxes",
+                    "margin",
+                    "notes",
+                    "link",
+                ],
+                required_fields=["price", "margin"],
+                decimal_fields=[
+                    "price",
+                    "freight",
+                    "additional_costs",
+                    "taxes",
+                ],
+            )
+            for quote_id, error in quote_change_set.errors.items():
+                st.error(f"Orçamento ID {quote_id}: {error}")
+            quote_updates = quote_change_set.changes
+
+            # All edited quotes are written in one transaction
+            if quote_updates:
+                update_result = quote_repo.update_many(
+                    quote_updates
+                )
+                for quote_id in update_result.succeeded:
+                    st.success(
+                        f"Orçamento ID {quote_id} atualizado com sucesso."
+                    )
+                for quote_id, error in update_result.failed.items():
+                    st.error(
+                        f"Erro ao atualizar orçamento ID {quote_id}: {error}. Dados: {quote_updates[quote_id]}"
+                    )
+                if update_result.succeeded:
+                    changes_made = True
+
+            # --- DELETION LOGIC FOR QUOTES ---
+            original_ids_quotes = set()
+            if (
+                not original_quotes_df.empty
+                and "id" in original_quotes_df.columns
+            ):
+                original_ids_quotes = set(original_quotes_df["id"])
+            elif not original_quotes_df.empty:
+                st.warning(
+                    "Tabela de orçamentos original não possui coluna 'id'. Deleção de orçamentos não pode ser processada."
+                )
+
+            edited_ids_quotes = set()
+            if (
+                not edited_quotes_df.empty
+                and "id" in edited_quotes_df.columns
+            ):
+                edited_ids_quotes = set(edited_quotes_df["id"])
+            elif (
+                not edited_quotes_df.empty
+                and "id" not in edited_quotes_df.columns
+            ):
+                st.warning(
+                    "Tabela de orçamentos editada não possui coluna 'id'. Deleção de orçamentos pode ser imprecisa."
+                )
+
+            if (
+                not original_quotes_df.empty
+                and "id" in original_quotes_df.columns
+            ):
+                deleted_quote_ids = (
+                    original_ids_quotes - edited_ids_quotes
+                )
+
+                if deleted_quote_ids:
+                    delete_result = quote_repo.delete_many(
+                        [int(i) for i in deleted_quote_ids]
+                    )
+                    for quote_id_deleted in delete_result.succeeded:
+                        st.success(
+                            f"Orçamento ID {quote_id_deleted} deletado com sucesso."
+                        )
+                    for (
+                        quote_id_failed,
+                        error,
+                    ) in delete_result.failed.items():
+                        st.error(
+                            f"Erro ao deletar orçamento ID {quote_id_failed}: {error}"
+                        )
+                    if delete_result.succeeded:
+                        changes_made = True
+
+            if changes_made:
+                st.rerun()
+    else:
+        st.info("Nenhum orçamento cadastrado para este item.")
+
+
+@item_fragment("lances")
+def show_bids_editor(item_id: int):
+    original_bids_df = load_item_bids_df(item_id)
+    st.markdown("##### Lances do Item")
+    if not original_bids_df.empty:
+        # original_bids_df is the direct output of get_bids_dataframe (all columns, 'id' is a column)
+
+        # 2. Update column_config_bids_main
+        column_config_bids_main = {
+            "id": None,  # Hide 'id' column by default
+            "item_id": None,  # Hide 'item_id'
+            "bidding_id": None,  # Hide 'bidding_id'
+            "bidder_id": None,  # Hide 'bidder_id'
+            "created_at": None,  # Hide 'created_at'
+            "updated_at": None,  # Hide 'updated_at'
+            "item_name": None,  # Hide "Item" column by default
+            "bidder_name": st.column_config.TextColumn(
+                "Licitante",
+                disabled=True,
+                help="Nome do licitante (não editável aqui).",
+            ),
+            "price": st.column_config.NumberColumn(
+                "Preço Ofertado (R$)",
+                format="R$ %.2f",
+                min_value=0.01,
+                required=True,
+                help="Valor do lance ofertado.",
+            ),
+            "notes": st.column_config.TextColumn(
+                "Notas", help="Observações sobre o lance."
+            ),
+        }
+        # Ensure all columns from original_bids_df are present in config, adding None if missing
+        for col_name in original_bids_df.columns:
+            if col_name not in column_config_bids_main:
+                column_config_bids_main[col_name] = (
+                    None  # Hide unspecified columns by default
+                )
+
+        # 1. DataFrame for Editor: Pass original_bids_df
+        # hide_index=True means edited_bids_df will have a range index. 'id' will be a column in edited_bids_df.
+        edited_bids_df = st.data_editor(
+            original_bids_df,  # Pass the full original DataFrame
+            column_config=column_config_bids_main,
+            key="bids_editor_main_view",
+            use_container_width=True,
+            hide_index=True,
+            num_rows="dynamic",
+        )
+
+        if st.button(
+            "Salvar Alterações nos Lances",
+            key="save_bids_main_view",
+        ):
+            changes_made = False
+            # Vectorized diff of the editor against the loaded bids
+            bid_change_set = build_change_set(
+                original_bids_df,
+                edited_bids_df,
+                editable_columns=["price", "notes"],
+                required_fields=["price"],
+                decimal_fields=["price"],
+            )
+            for bid_id, error in bid_change_set.errors.items():
+                st.error(f"Lance ID {bid_id}: {error}")
+            bid_updates = bid_change_set.changes
+
+            # All edited bids are written in one transaction
+            if bid_updates:
+                update_result = bid_repo.update_many(bid_updates)
+                for bid_id in update_result.succeeded:
+                    st.success(
+                        f"Lance ID {bid_id} atualizado com sucesso."
+                    )
+                for bid_id, error in update_result.failed.items():
+                    st.error(
+                        f"Erro ao atualizar lance ID {bid_id}: {error}. Dados: {bid_updates[bid_id]}"
+                    )
+                if update_result.succeeded:
+                    changes_made = True
+
+            # --- DELETION LOGIC FOR BIDS ---
+            original_ids_bids = set()
+            if (
+                not original_bids_df.empty
+                and "id" in original_bids_df.columns
+            ):
+                original_ids_bids = set(original_bids_df["id"])
+            elif not original_bids_df.empty:
+                st.warning(
+                    "Tabela de lances original não possui coluna 'id'. Deleção de lances não pode ser processada."
+                )
+
+            edited_ids_bids = set()
+            if (
+                not edited_bids_df.empty
+                and "id" in edited_bids_df.columns
+            ):
+                edited_ids_bids = set(edited_bids_df["id"])
+            elif (
+                not edited_bids_df.empty
+                and "id" not in edited_bids_df.columns
+            ):
+                st.warning(
+                    "Tabela de lances editada não possui coluna 'id'. Deleção de lances pode ser imprecisa."
+                )
+
+            if (
+                not original_bids_df.empty
+                and "id" in original_bids_df.columns
+            ):
+                deleted_bid_ids = (
+                    original_ids_bids - edited_ids_bids
+                )
+
+                if deleted_bid_ids:
+                    delete_result = bid_repo.delete_many(
+                        [int(i) for i in deleted_bid_ids]
+                    )
+                    for bid_id_deleted in delete_result.succeeded:
+                        st.success(
+                            f"Lance ID {bid_id_deleted} deletado com sucesso."
+                        )
+                    for (
+                        bid_id_failed,
+                        error,
+                    ) in delete_result.failed.items():
+                        st.error(
+                            f"Erro ao deletar lance ID {bid_id_failed}: {error}"
+                        )
+                    if delete_result.succeeded:
+                        changes_made = True
+
+            if changes_made:
+                st.rerun()
+    else:
+        st.info("Nenhum lance cadastrado para este item.")
+
+
+@item_fragment("gráficos")
+def show_item_charts(item_id: int):
+    # Charts show the saved quotes and bids; saving an editor reruns the whole script
+    quotes_df = load_item_quotes_df(item_id)
+    bids_df = load_item_bids_df(item_id)
+    graph_cols_display = st.columns(2)
+    with graph_cols_display[0]:
+        if (
+            not quotes_df.empty
+            and "calculated_price" in quotes_df.columns
+            and "supplier_name" in quotes_df.columns
+        ):
+            st.plotly_chart(
+                cached_quotes_figure(item_id, quotes_df),
+                use_container_width=True,
+            )
+        else:
+            st.caption("Gráfico de orçamentos não disponível.")
+    with graph_cols_display[1]:
+        # bids_df keeps 'created_at', used for the time axis
+        if (
+            not bids_df.empty
+            and "price" in bids_df.columns
+            and "bidder_name" in bids_df.columns
+            and "created_at" in bids_df.columns
+        ):
+            summary = price_summaries.get(item_id)
+            min_quote_price_val = (
+                summary["min_quote_price"]
+                if summary is not None and summary["quote_count"] > 0
+                else None
+            )
+            st.plotly_chart(
+                cached_bids_figure(item_id, bids_df, min_quote_price_val),
+                use_container_width=True,
+            )
+        else:
+            st.caption("Gráfico de lances não disponível.")
+
+
+@item_fragment("histórico de preços")
+def show_item_price_history(current_item_details: Item):
+    # Same product in every bidding, found through the indexed Item.code_key/name_key
+    match = st.radio(
+        "Agrupar itens por:",
+        options=list(MATCH_MODES),
+        format_func=MATCH_MODES.get,
+        horizontal=True,
+        key=f"price_history_match_{current_item_details.id}",
+    )
+    history = load_price_history(quote_repo, current_item_details, match)
+    summary = summarize_price_history(history)
+    if len(summary) <= 1:
+        st.caption("Este produto não aparece em outras licitações.")
+        return
+    st.plotly_chart(
+        create_price_history_figure(summary, current_item_details.id),
+        use_container_width=True,
+    )
+    st.dataframe(
+        summary.drop(columns=["item_id", "bidding_id"]),
+        column_config={
+            "reference_date": st.column_config.DateColumn("Data", format="DD/MM/YYYY"),
+            "bidding_label": "Licitação",
+            "quote_count": "Orçamentos",
+            "min_quote_price": st.column_config.NumberColumn(
+                "Menor Orçamento", format="R$ %.2f"
+            ),
+            "best_supplier": "Fornecedor",
+            "bid_count": "Lances",
+            "winning_bid": st.column_config.NumberColumn(
+                "Lance Vencedor", format="R$ %.2f"
+            ),
+            "winner": "Licitante",
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+
+
+@item_fragment("itens semelhantes")
+def show_similar_item_quotes(current_item_details: Item):
+    # Trigram index of every item name/description (services/similarity.py)
+    with st.expander("💡 Orçamentos de Itens Semelhantes em Outras Licitações"):
+        suggestions = similar_item_quotes(quote_repo, current_item_details)
+        if suggestions.empty:
+            st.caption("Nenhum item semelhante com orçamentos foi encontrado.")
+            return
+        st.dataframe(
+            suggestions[
+                [
+                    "item_name",
+                    "similarity",
+                    "supplier_name",
+                    "calculated_price",
+                    "price",
+                    "created_at",
+                ]
+            ],
+            column_config={
+                "item_name": "Item",
+                "similarity": st.column_config.ProgressColumn(
+                    "Semelhança", format="%.2f", min_value=0.0, max_value=1.0
+                ),
+                "supplier_name": "Fornecedor",
+                "calculated_price": st.column_config.NumberColumn(
+                    "Preço Calculado", format="R$ %.2f"
+                ),
+                "price": st.column_config.NumberColumn("Custo", format="R$ %.2f"),
+                "created_at": st.column_config.DatetimeColumn(
+                    "Data", format="DD/MM/YYYY"
+                ),
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def show_item_price_summary(item_id: int):
+    # One row of item_price_summary instead of aggregating the item's quotes and bids
+    summary = price_summaries.get(item_id)
+    if summary is None:
+        return
+
+    def money(value) -> str:
+        return f"R$ {float(value):,.2f}" if pd.notna(value) else "—"
+
+    summary_cols = st.columns(4)
+    summary_cols[0].metric("Menor Orçamento", money(summary["min_quote_price"]))
+    summary_cols[1].metric(
+        "Orçamento Médio",
+        money(summary["avg_quote_price"]),
+        help=f"{summary['quote_count']} orçamento(s); maior: {money(summary['max_quote_price'])}",
+    )
+    summary_cols[2].metric("Menor Lance", money(summary["lowest_bid_price"]))
+    summary_cols[3].metric("Lances", int(summary["bid_count"]))
+    if summary["quote_count"] > 0:
+        summary_cols[0].caption(
+            f"Fornecedor: {summary['best_supplier_name'] or 'Fornecedor Desconhecido'}"
+        )
+    if summary["bid_count"] > 0:
+        summary_cols[2].caption(
+            f"Licitante: {summary['leading_bidder_name'] or NO_BIDDER_NAME}"
+        )
+        if pd.notna(summary["last_bid_at"]):
+            summary_cols[3].caption(
+                f"Último: {pd.Timestamp(summary['last_bid_at']):%d/%m/%Y %H:%M}"
+            )
+
+
+@st.fragment
+def show_bidding_export(bidding_id: int):
+    # Choosing the format reruns only this part; the file is generated on click
+    with st.expander("📤 Exportar Orçamentos e Lances da Licitação"):
+        formats = available_formats()
+        file_format = st.radio(
+            "Formato:",
+            options=formats,
+            format_func=str.upper,
+            horizontal=True,
+            key="export_format_main",
+        )
+        if "xlsx" not in formats:
+            st.caption("Instale o pacote 'openpyxl' para exportar em XLSX.")
+
+        def generate_file() -> bytes:
+            # Runs in a separate thread when the button is clicked (deferred data)
+            with export_bidding(quote_repo, bidding_id, file_format) as output:
+                return output.read()
+
+        st.download_button(
+            "⬇️ Baixar Arquivo",
+            data=generate_file,
+            file_name=f"licitacao_{bidding_id}.{file_format}",
+            mime=EXPORT_MIME_TYPES[file_format],
+            on_click="ignore",
+            key="btn_export_bidding_main",
+        )
+
+
+@st.fragment
+def show_bidding_scenarios(bidding_id: int):
+    # Submitting the form reruns only this part; every quote is recalculated at once
+    with st.expander("🧮 Simulação de Cenários de Preço"):
+        with st.form(key="form_bidding_scenario"):
+            input_cols = st.columns(5)
+            margin_points = input_cols[0].number_input(
+                "Margem (p.p.)", value=0.0, step=0.5, format="%.2f"
+            )
+            taxes_points = input_cols[1].number_input(
+                "Impostos (p.p.)", value=0.0, step=0.5, format="%.2f"
+            )
+            freight_pct = input_cols[2].number_input(
+                "Frete (%)", value=0.0, step=5.0, format="%.1f"
+            )
+            price_pct = input_cols[3].number_input(
+                "Custo do Produto (%)", value=0.0, step=5.0, format="%.1f"
+            )
+            additional_costs_pct = input_cols[4].number_input(
+                "Custos Adicionais (%)", value=0.0, step=5.0, format="%.1f"
+            )
+            submitted = st.form_submit_button("Simular")
+        if not submitted:
+            st.caption(
+                "Informe as variações e clique em Simular para recalcular todos os "
+                "orçamentos da licitação e compará-los com os menores lances."
+            )
+            return
+
+        overrides = ScenarioOverrides(
+            price_pct=price_pct,
+            freight_pct=freight_pct,
+            additional_costs_pct=additional_costs_pct,
+            taxes_points=taxes_points,
+            margin_points=margin_points,
+        )
+        quotes, items = simulate_bidding(
+            quote_repo, price_summaries, bidding_id, overrides
+        )
+        if items.empty:
+            st.info("Nenhum orçamento cadastrado para esta licitação.")
+            return
+
+        current_wins = int(items["current_beats_lowest_bid"].sum())
+        scenario_wins = int(items["beats_lowest_bid"].sum())
+        metric_cols = st.columns(3)
+        metric_cols[0].metric("Orçamentos Recalculados", len(quotes))
+        metric_cols[1].metric(
+            "Itens Abaixo do Menor Lance",
+            scenario_wins,
+            delta=scenario_wins - current_wins,
+            help="Melhor orçamento do cenário menor que o menor lance do item.",
+        )
+        metric_cols[2].metric(
+            "Variação Média do Melhor Orçamento",
+            f"{items['change_pct'].mean():+.2f}%",
+        )
+        st.dataframe(
+            items.drop(columns=["item_id", "current_beats_lowest_bid"]),
+            column_config={
+                "item_name": "Item",
+                "current_best": st.column_config.NumberColumn(
+                    "Melhor Orçamento Atual", format="R$ %.2f"
+                ),
+                "scenario_best": st.column_config.NumberColumn(
+                    "Melhor Orçamento no Cenário", format="R$ %.2f"
+                ),
+                "change_pct": st.column_config.NumberColumn("Variação", format="%+.2f%%"),
+                "scenario_supplier": "Fornecedor",
+                "lowest_bid": st.column_config.NumberColumn(
+                    "Menor Lance", format="R$ %.2f"
+                ),
+                "gap": st.column_config.NumberColumn(
+                    "Diferença para o Lance", format="R$ %.2f"
+                ),
+                "beats_lowest_bid": st.column_config.CheckboxColumn("Abaixo do Lance"),
+                "break_even_margin": st.column_config.NumberColumn(
+                    "Margem de Equilíbrio",
+                    format="%.2f%%",
+                    help="Margem com a qual o orçamento igualaria o menor lance.",
+                ),
+                "break_even_supplier": "Fornecedor (Equilíbrio)",
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
 # --- View Functions ---
 def show_main_view():
     # --- Seleção de Licitação e Botão de Gerenciamento ---
@@ -174,6 +1074,10 @@ def show_main_view():
         if not is_open:
             st.session_state.show_manage_bidding_dialog = False
 
+    if st.session_state.selected_bidding_id is not None:
+        show_bidding_export(st.session_state.selected_bidding_id)
+        show_bidding_scenarios(st.session_state.selected_bidding_id)
+
     # --- Seleção de Item e Botão de Gerenciamento ---
     items_for_select = []  # Initialize items_for_select here
     if st.session_state.selected_bidding_id is not None:
@@ -181,13 +1085,10 @@ def show_main_view():
             [5, 2], vertical_alignment="bottom"
         )
 
-        # Fetch all items and then filter in Python
-        all_items_from_repo = item_repo.get_all()
-        items_for_select = [
-            item
-            for item in all_items_from_repo
-            if item.bidding_id == st.session_state.selected_bidding_id
-        ]
+        # Only the items of the selected bidding are loaded
+        items_for_select = item_repo.find_by(
+            bidding_id=st.session_state.selected_bidding_id
+        )
         item_options_map, item_option_ids = get_options_map(
             data_list=items_for_select,
             name_col="name",
@@ -269,813 +1170,27 @@ def show_main_view():
                         f"**Observações:** {current_item_details.notes if current_item_details.notes else 'N/A'}"
                     )
 
+                    show_item_price_summary(current_item_details.id)
+
                     st.subheader("Orçamentos e Lances")
+                    show_similar_item_quotes(current_item_details)
                     expander_cols = st.columns(2)
                     with expander_cols[0]:
-                        with st.expander(
-                            "Novo Orçamento",
-                            expanded=False,
-                        ):
-                            col_supp_select, col_supp_manage = st.columns(
-                                [3, 2], vertical_alignment="bottom"
-                            )
-                            all_suppliers = supplier_repo.get_all()
-                            supplier_options_map, supplier_option_ids = get_options_map(
-                                data_list=all_suppliers,
-                                default_message=DEFAULT_SUPPLIER_SELECT_MESSAGE,
-                            )
-                            with col_supp_select:
-                                selected_supplier_id_quote = st.selectbox(
-                                    "Fornecedor*:",
-                                    options=supplier_option_ids,
-                                    format_func=lambda x: supplier_options_map.get(
-                                        x, DEFAULT_SUPPLIER_SELECT_MESSAGE
-                                    ),
-                                    key="sb_supplier_quote_exp",
-                                )
-                            with col_supp_manage:
-                                if st.button(
-                                    "👤 Ger. Fornecedores",
-                                    key="btn_manage_suppliers_quote_exp",
-                                    use_container_width=True,
-                                ):
-                                    st.session_state.editing_supplier_id = (
-                                        selected_supplier_id_quote
-                                    )
-                                    _open_dialog_exclusively("supplier")
-                            with st.form(key="new_quote_form"):
-                                quote_price = st.number_input(
-                                    "Preço do Orçamento (Custo do Produto)*",
-                                    min_value=0.01,
-                                    format="%.2f",
-                                    key="quote_price_input_exp",
-                                )
-                                quote_freight = st.number_input(
-                                    "Frete (R$)",
-                                    min_value=0.00,
-                                    format="%.2f",
-                                    key="quote_freight_input_exp",
-                                    value=0.00,
-                                )
-                                quote_additional_costs = st.number_input(
-                                    "Custos Adicionais (R$)",
-                                    min_value=0.00,
-                                    format="%.2f",
-                                    key="quote_additional_costs_input_exp",
-                                    value=0.00,
-                                )
-                                quote_taxes = st.number_input(
-                                    "Impostos (%)",
-                                    min_value=0.00,
-                                    format="%.2f",
-                                    key="quote_taxes_input_exp",
-                                    help="Percentual de impostos sobre o preço de venda. Ex: 6 para 6%",
-                                    value=0.00,
-                                )
-                                quote_margin = st.number_input(
-                                    "Margem de Lucro Desejada (%)*",
-                                    min_value=0.0,
-                                    format="%.2f",
-                                    key="quote_margin_input_exp",
-                                    help="Valor da margem em decimal. Ex: 0.2 para 20%",
-                                )
-                                quote_notes = st.text_area(
-                                    "Notas do Orçamento", key="quote_notes_input_exp"
-                                )
-                                quote_link = st.text_input(
-                                    "Link do Produto (Opcional)",
-                                    key="quote_link_input_exp",
-                                )
-                                if st.form_submit_button("💾 Salvar Orçamento"):
-                                    if (
-                                        selected_supplier_id_quote
-                                        and quote_price > 0
-                                        and st.session_state.selected_item_id
-                                        is not None
-                                    ):
-                                        try:
-                                            new_quote_instance = Quote(
-                                                item_id=st.session_state.selected_item_id,
-                                                supplier_id=selected_supplier_id_quote,
-                                                price=Decimal(str(quote_price)),
-                                                freight=Decimal(str(quote_freight)),
-                                                additional_costs=Decimal(
-                                                    str(quote_additional_costs)
-                                                ),
-                                                taxes=Decimal(str(quote_taxes)),
-                                                margin=quote_margin,
-                                                notes=quote_notes
-                                                if quote_notes
-                                                else None,
-                                                link=quote_link
-                                                if quote_link
-                                                else None,  # Added line
-                                            )
-                                            added_quote = quote_repo.add(
-                                                new_quote_instance
-                                            )
-                                            st.success(
-                                                f"Orçamento de {supplier_options_map.get(selected_supplier_id_quote, 'Fornecedor')} (ID: {added_quote.id}) adicionado!"
-                                            )
-                                            st.rerun()
-                                        except Exception as e:
-                                            st.error(f"Erro ao salvar orçamento: {e}")
-                                    else:
-                                        st.error(
-                                            "Selecione um item, um fornecedor, e insira preço e margem válidos."
-                                        )
+                        show_quote_entry(current_item_details)
                     with expander_cols[1]:
-                        with st.expander(
-                            "Novo Lance",
-                            expanded=False,
-                        ):
-                            col_bidder_select, col_bidder_manage = st.columns(
-                                [3, 2], vertical_alignment="bottom"
-                            )
-                            all_bidders = bidder_repo.get_all()
-                            bidder_options_map, bidder_option_ids = get_options_map(
-                                data_list=all_bidders,
-                                default_message=DEFAULT_COMPETITOR_SELECT_MESSAGE,
-                            )
-
-                            NO_BIDDER_SENTINEL = "___NO_BIDDER___"
-                            initial_prompt_id = (
-                                bidder_option_ids[0]
-                                if bidder_option_ids and bidder_option_ids[0] is None
-                                else "___NO_DEFAULT_PROMPT___"
-                            )
-
-                            bidder_options_map_display = bidder_options_map.copy()
-                            bidder_option_ids_display = list(bidder_option_ids)
-                            bidder_options_map_display[NO_BIDDER_SENTINEL] = (
-                                "Nenhum Licitante"
-                            )
-
-                            prompt_is_none_and_present = (
-                                initial_prompt_id is None
-                                and None in bidder_option_ids_display
-                            )
-                            insert_idx = 1 if prompt_is_none_and_present else 0
-                            if NO_BIDDER_SENTINEL not in bidder_option_ids_display:
-                                bidder_option_ids_display.insert(
-                                    insert_idx, NO_BIDDER_SENTINEL
-                                )
-
-                            try:
-                                default_bidder_index = bidder_option_ids_display.index(
-                                    NO_BIDDER_SENTINEL
-                                )
-                            except ValueError:
-                                default_bidder_index = 0
-
-                            with col_bidder_select:
-                                selected_bidder_id_bid = st.selectbox(
-                                    "Licitante:",
-                                    options=bidder_option_ids_display,
-                                    format_func=lambda x: bidder_options_map_display.get(
-                                        x, DEFAULT_COMPETITOR_SELECT_MESSAGE
-                                    ),
-                                    key="sb_bidder_bid_exp",
-                                    index=default_bidder_index,
-                                )
-                            with col_bidder_manage:
-                                if st.button(
-                                    "👤 Ger. Licitantes",
-                                    key="btn_manage_bidders_bid_exp",
-                                    use_container_width=True,
-                                ):
-                                    st.session_state.editing_bidder_id = (
-                                        selected_bidder_id_bid
-                                    )
-                                    _open_dialog_exclusively("bidder")
-                            with st.form(key="new_bid_form"):
-                                bid_price = st.number_input(
-                                    "Preço do Lance*",
-                                    min_value=0.01,
-                                    format="%.2f",
-                                    key="bid_price_input_exp",
-                                )
-                                bid_notes = st.text_area(
-                                    "Notas do Lance", key="bid_notes_input_exp"
-                                )
-                                if st.form_submit_button("💾 Salvar Lance"):
-                                    actual_bidder_id_to_save = selected_bidder_id_bid
-                                    if selected_bidder_id_bid == NO_BIDDER_SENTINEL:
-                                        actual_bidder_id_to_save = None
-
-                                    if selected_bidder_id_bid is None:
-                                        st.error(
-                                            "Por favor, selecione um Licitante ou a opção 'Nenhum Licitante'."
-                                        )
-                                    elif (
-                                        bid_price > 0
-                                        and st.session_state.selected_item_id
-                                        is not None
-                                        and hasattr(current_item_details, "bidding_id")
-                                    ):
-                                        try:
-                                            new_bid_instance = Bid(
-                                                item_id=st.session_state.selected_item_id,
-                                                bidding_id=current_item_details.bidding_id,
-                                                bidder_id=actual_bidder_id_to_save,
-                                                price=Decimal(str(bid_price)),
-                                                notes=bid_notes if bid_notes else None,
-                                            )
-                                            added_bid = bid_repo.add(new_bid_instance)
-
-                                            bidder_name_for_success_message = (
-                                                "Nenhum Licitante"
-                                            )
-                                            if actual_bidder_id_to_save is not None:
-                                                bidder_name_for_success_message = (
-                                                    bidder_options_map_display.get(
-                                                        actual_bidder_id_to_save,
-                                                        "Licitante Desconhecido",
-                                                    )
-                                                )
-
-                                            st.success(
-                                                f"Lance de {bidder_name_for_success_message} (ID: {added_bid.id}) adicionado!"
-                                            )
-                                            st.rerun()
-                                        except Exception as e:
-                                            st.error(f"Erro ao salvar lance: {e}")
-                                    else:
-                                        st.error(
-                                            "Insira um preço de lance válido e certifique-se que um item está selecionado. Verifique também a seleção do licitante."
-                                        )
-
-                    all_quotes_from_repo = quote_repo.get_all()
-                    quotes_for_item_list = [
-                        q
-                        for q in all_quotes_from_repo
-                        if q.item_id == st.session_state.selected_item_id
-                    ]
-                    all_bids_from_repo = bid_repo.get_all()
-                    bids_for_item_list = [
-                        b
-                        for b in all_bids_from_repo
-                        if b.item_id == st.session_state.selected_item_id
-                    ]
-
-                    # Ensure all_items_list is available for get_quotes_dataframe
-                    all_items_list = item_repo.get_all()  # Fetch all items
-                    quotes_for_item_list = [
-                        q
-                        for q in all_quotes_from_repo
-                        if q.item_id == st.session_state.selected_item_id
-                    ]
-                    all_bids_from_repo = bid_repo.get_all()
-                    bids_for_item_list = [
-                        b
-                        for b in all_bids_from_repo
-                        if b.item_id == st.session_state.selected_item_id
-                    ]
-
-                    # Ensure all_items_list is available for get_quotes_dataframe
-                    all_items_list = item_repo.get_all()  # Fetch all items
-
-                    # Prepare original DataFrames for comparison later
-                    original_quotes_df = get_quotes_dataframe(
-                        quotes_list=quotes_for_item_list,
-                        suppliers_list=all_suppliers,
-                        items_list=all_items_list,
-                    )
-                    original_bids_df = get_bids_dataframe(
-                        bids_list=bids_for_item_list,
-                        bidders_list=all_bidders,
-                        items_list=all_items_list,
-                    )
+                        show_bid_entry(current_item_details)
 
-                    edited_quotes_df = pd.DataFrame()
                     table_cols_display = st.columns(2)
                     with table_cols_display[0]:
-                        st.markdown("##### Orçamentos do Item")
-                        if not original_quotes_df.empty:
-                            # original_quotes_df is the direct output of get_quotes_dataframe (all columns, 'id' is a column)
-
-                            # 2. Update column_config_quotes_main
-                            column_config_quotes_main = {
-                                "id": None,  # Hide 'id' column by default
-                                "item_id": None,  # Hide 'item_id'
-                                "supplier_id": None,  # Hide 'supplier_id'
-                                "created_at": None,  # Hide 'created_at'
-                                "updated_at": None,  # Hide 'updated_at'
-                                "item_name": None,  # Hide "Item" column by default
-                                "supplier_name": st.column_config.TextColumn(
-                                    "Fornecedor",
-                                    disabled=True,
-                                    help="Nome do fornecedor (não editável aqui)",
-                                ),
-                                "price": st.column_config.NumberColumn(
-                                    "Custo Base (R$)",
-                                    format="%.2f",
-                                    required=True,
-                                    help="Preço de custo do produto/serviço junto ao fornecedor.",
-                                ),
-                                "freight": st.column_config.NumberColumn(
-                                    "Frete (R$)", format="%.2f", help="Valor do frete."
-                                ),
-                                "additional_costs": st.column_config.NumberColumn(
-                                    "Custos Adic. (R$)",
-                                    format="%.2f",
-                                    help="Outros custos diretos.",
-                                ),
-                                "taxes": st.column_config.NumberColumn(
-                                    "Impostos (%)",
-                                    format="%.2f",
-                                    help="Percentual de impostos incidentes sobre o preço de venda. Ex: 6 para 6%.",
-                                ),
-                                "margin": st.column_config.NumberColumn(
-                                    "Margem (%)",
-                                    format="%.2f",
-                                    required=True,
-                                    help="Margem de lucro desejada sobre o custo total. Ex: 20 para 20%.",
-                                ),
-                                "calculated_price": st.column_config.NumberColumn(
-                                    "Preço Final Calculado",
-                                    format="R$ %.2f",
-                                    disabled=True,
-                                    help="Preço final de venda (calculado automaticamente).",
-                                ),
-                                "notes": st.column_config.TextColumn(
-                                    "Notas", help="Observações sobre o orçamento."
-                                ),
-                                "link": st.column_config.LinkColumn(
-                                    "Link do Produto",
-                                    help="Link para a página do produto no site do fornecedor.",
-                                    validate=r"^https?://[\w\.-]+",
-                                ),
-                            }
-                            # Ensure all columns from original_quotes_df are present in config, adding None if missing
-                            for col_name in original_quotes_df.columns:
-                                if col_name not in column_config_quotes_main:
-                                    column_config_quotes_main[col_name] = (
-                                        None  # Hide unspecified columns by default
-                                    )
-
-                            # 1. DataFrame for Editor: Pass original_quotes_df
-                            # hide_index=True means edited_quotes_df will have a range index. 'id' will be a column in edited_quotes_df.
-                            edited_quotes_df = st.data_editor(
-                                original_quotes_df,  # Pass the full original DataFrame
-                                column_config=column_config_quotes_main,
-                                key="quotes_editor_main_view",
-                                use_container_width=True,
-                                hide_index=True,
-                                num_rows="dynamic",
-                            )
-
-                            if st.button(
-                                "Salvar Alterações nos Orçamentos",
-                                key="save_quotes_main_view",
-                            ):
-                                changes_made = False
-                                # 3. Update Save Logic for Quotes
-                                editable_quote_cols = [
-                                    "price",
-                                    "freight",
-                                    "additional_costs",
-                                    "taxes",
-                                    "margin",
-                                    "notes",
-                                    "link",
-                                ]
-
-                                if not edited_quotes_df.empty:
-                                    for (
-                                        editor_idx,
-                                        edited_row_series,
-                                    ) in (
-                                        edited_quotes_df.iterrows()
-                                    ):  # editor_idx is range index
-                                        quote_id = edited_row_series[
-                                            "id"
-                                        ]  # Get 'id' from the row data
-
-                                        # Find the original row from original_quotes_df (the DataFrame before editor)
-                                        original_row_df_filtered = original_quotes_df[
-                                            original_quotes_df["id"] == quote_id
-                                        ]
-
-                                        if original_row_df_filtered.empty:
-                                            st.error(
-                                                f"Erro: Orçamento original com ID {quote_id} não encontrado para comparação."
-                                            )
-                                            continue
-                                        original_row_series = (
-                                            original_row_df_filtered.iloc[0]
-                                        )
-
-                                        update_dict = {}
-                                        for col in editable_quote_cols:
-                                            if (
-                                                col not in edited_row_series.index
-                                            ):  # Should not happen if editable_quote_cols is correct
-                                                st.warning(
-                                                    f"Coluna editável '{col}' não encontrada na linha editada do orçamento ID {quote_id}."
-                                                )
-                                                continue
-                                            if (
-                                                col not in original_row_series.index
-                                            ):  # Should not happen
-                                                st.warning(
-                                                    f"Coluna editável '{col}' não encontrada na linha original do orçamento ID {quote_id}."
-                                                )
-                                                continue
-
-                                            original_value = original_row_series[col]
-                                            edited_value = edited_row_series[col]
-
-                                            if col in [
-                                                "price",
-                                                "freight",
-                                                "additional_costs",
-                                                "taxes",
-                                                "margin",
-                                            ]:
-                                                try:
-                                                    # Handle None or empty string for optional Decimal fields before conversion
-                                                    if edited_value is None or (
-                                                        isinstance(edited_value, str)
-                                                        and not edited_value.strip()
-                                                    ):
-                                                        edited_value_decimal = None
-                                                    else:
-                                                        edited_value_decimal = Decimal(
-                                                            str(edited_value)
-                                                        )
-
-                                                    # Special handling for optional fields where None is different from 0 for comparison
-                                                    if (
-                                                        original_value is None
-                                                        and edited_value_decimal is None
-                                                    ):  # Both None, no change
-                                                        pass
-                                                    elif (
-                                                        original_value is None
-                                                        and edited_value_decimal
-                                                        == Decimal(0)
-                                                        and col
-                                                        in [
-                                                            "freight",
-                                                            "additional_costs",
-                                                            "taxes",
-                                                        ]
-                                                    ):
-                                                        # If original was None, and new is 0 for an optional field, consider it a change to 0
-                                                        update_dict[col] = Decimal(0)
-                                                    elif (
-                                                        original_value
-                                                        != edited_value_decimal
-                                                    ):
-                                                        update_dict[col] = (
-                                                            edited_value_decimal
-                                                        )
-                                                except ValueError:  # More specific error for Decimal conversion
-                                                    st.error(
-                                                        f"Valor inválido para {col} (decimal) no orçamento ID {quote_id}: '{edited_value}'."
-                                                    )
-                                                    continue
-                                                except Exception as e:  # Catch any other conversion error
-                                                    st.error(
-                                                        f"Erro ao converter {col} no orçamento ID {quote_id}: {edited_value}. Erro: {e}"
-                                                    )
-                                                    continue
-                                            elif col in ["notes", "link"]:
-                                                # Process string fields, handling None and actual strings
-                                                processed_edited_value = (
-                                                    str(edited_value)
-                                                    if pd.notna(edited_value)
-                                                    else None
-                                                )
-                                                if (
-                                                    original_value
-                                                    != processed_edited_value
-                                                ):
-                                                    update_dict[col] = (
-                                                        processed_edited_value
-                                                    )
-                                            elif (
-                                                original_value != edited_value
-                                            ):  # Fallback for any other column types
-                                                update_dict[col] = edited_value
-
-                                        if update_dict:
-                                            try:
-                                                quote_repo.update(quote_id, update_dict)
-                                                st.success(
-                                                    f"Orçamento ID {quote_id} atualizado com sucesso."
-                                                )
-                                                changes_made = True
-                                            except Exception as e:
-                                                st.error(
-                                                    f"Erro ao atualizar orçamento ID {quote_id}: {e}. Dados: {update_dict}"
-                                                )
-
-                                # --- DELETION LOGIC FOR QUOTES ---
-                                original_ids_quotes = set()
-                                if (
-                                    not original_quotes_df.empty
-                                    and "id" in original_quotes_df.columns
-                                ):
-                                    original_ids_quotes = set(original_quotes_df["id"])
-                                elif not original_quotes_df.empty:
-                                    st.warning(
-                                        "Tabela de orçamentos original não possui coluna 'id'. Deleção de orçamentos não pode ser processada."
-                                    )
-
-                                edited_ids_quotes = set()
-                                if (
-                                    not edited_quotes_df.empty
-                                    and "id" in edited_quotes_df.columns
-                                ):
-                                    edited_ids_quotes = set(edited_quotes_df["id"])
-                                elif (
-                                    not edited_quotes_df.empty
-                                    and "id" not in edited_quotes_df.columns
-                                ):
-                                    st.warning(
-                                        "Tabela de orçamentos editada não possui coluna 'id'. Deleção de orçamentos pode ser imprecisa."
-                                    )
-
-                                if (
-                                    not original_quotes_df.empty
-                                    and "id" in original_quotes_df.columns
-                                ):
-                                    deleted_quote_ids = (
-                                        original_ids_quotes - edited_ids_quotes
-                                    )
-
-                                    if deleted_quote_ids:
-                                        for quote_id_to_delete in deleted_quote_ids:
-                                            try:
-                                                quote_repo.delete(quote_id_to_delete)
-                                                st.success(
-                                                    f"Orçamento ID {quote_id_to_delete} deletado com sucesso."
-                                                )
-                                                changes_made = True
-                                            except Exception as e:
-                                                st.error(
-                                                    f"Erro ao deletar orçamento ID {quote_id_to_delete}: {e}"
-                                                )
-
-                                if changes_made:
-                                    st.rerun()
-                        else:
-                            st.info("Nenhum orçamento cadastrado para este item.")
-
+                        show_quotes_editor(current_item_details.id)
                     with table_cols_display[1]:
-                        st.markdown("##### Lances do Item")
-                        if not original_bids_df.empty:
-                            # original_bids_df is the direct output of get_bids_dataframe (all columns, 'id' is a column)
-
-                            # 2. Update column_config_bids_main
-                            column_config_bids_main = {
-                                "id": None,  # Hide 'id' column by default
-                                "item_id": None,  # Hide 'item_id'
-                                "bidding_id": None,  # Hide 'bidding_id'
-                                "bidder_id": None,  # Hide 'bidder_id'
-                                "created_at": None,  # Hide 'created_at'
-                                "updated_at": None,  # Hide 'updated_at'
-                                "item_name": None,  # Hide "Item" column by default
-                                "bidder_name": st.column_config.TextColumn(
-                                    "Licitante",
-                                    disabled=True,
-                                    help="Nome do licitante (não editável aqui).",
-                                ),
-                                "price": st.column_config.NumberColumn(
-                                    "Preço Ofertado (R$)",
-                                    format="R$ %.2f",
-                                    min_value=0.01,
-                                    required=True,
-                                    help="Valor do lance ofertado.",
-                                ),
-                                "notes": st.column_config.TextColumn(
-                                    "Notas", help="Observações sobre o lance."
-                                ),
-                            }
-                            # Ensure all columns from original_bids_df are present in config, adding None if missing
-                            for col_name in original_bids_df.columns:
-                                if col_name not in column_config_bids_main:
-                                    column_config_bids_main[col_name] = (
-                                        None  # Hide unspecified columns by default
-                                    )
-
-                            # 1. DataFrame for Editor: Pass original_bids_df
-                            # hide_index=True means edited_bids_df will have a range index. 'id' will be a column in edited_bids_df.
-                            edited_bids_df = st.data_editor(
-                                original_bids_df,  # Pass the full original DataFrame
-                                column_config=column_config_bids_main,
-                                key="bids_editor_main_view",
-                                use_container_width=True,
-                                hide_index=True,
-                                num_rows="dynamic",
-                            )
-
-                            if st.button(
-                                "Salvar Alterações nos Lances",
-                                key="save_bids_main_view",
-                            ):
-                                changes_made = False
-                                # 3. Update Save Logic for Bids
-                                editable_bid_cols = ["price", "notes"]
-
-                                if not edited_bids_df.empty:
-                                    for (
-                                        editor_idx,
-                                        edited_row_series,
-                                    ) in (
-                                        edited_bids_df.iterrows()
-                                    ):  # editor_idx is range index
-                                        bid_id = edited_row_series[
-                                            "id"
-                                        ]  # Get 'id' from the row data
-
-                                        # Find the original row from original_bids_df (the DataFrame before editor)
-                                        original_row_df_filtered = original_bids_df[
-                                            original_bids_df["id"] == bid_id
-                                        ]
-
-                                        if original_row_df_filtered.empty:
-                                            st.error(
-                                                f"Erro: Lance original com ID {bid_id} não encontrado para comparação."
-                                            )
-                                            continue
-                                        original_row_series = (
-                                            original_row_df_filtered.iloc[0]
-                                        )
-
-                                        update_dict = {}
-                                        for col in editable_bid_cols:
-                                            if (
-                                                col not in edited_row_series.index
-                                            ):  # Should not happen if editable_bid_cols is correct
-                                                st.warning(
-                                                    f"Coluna editável '{col}' não encontrada na linha editada do lance ID {bid_id}."
-                                                )
-                                                continue
-                                            if (
-                                                col not in original_row_series.index
-                                            ):  # Should not happen
-                                                st.warning(
-                                                    f"Coluna editável '{col}' não encontrada na linha original do lance ID {bid_id}."
-                                                )
-                                                continue
-
-                                            original_value = original_row_series[col]
-                                            edited_value = edited_row_series[col]
-
-                                            if col == "price":
-                                                try:
-                                                    if edited_value is None or (
-                                                        isinstance(edited_value, str)
-                                                        and not str(
-                                                            edited_value
-                                                        ).strip()
-                                                    ):
-                                                        st.error(
-                                                            f"Preço não pode ser vazio para o lance ID {bid_id}."
-                                                        )
-                                                        # update_dict.clear() # Clear to prevent partial update for this row
-                                                        # break # Stop processing this row
-                                                        # To prevent saving this row if price is invalid, we can set a flag or skip adding to update_dict
-                                                        # For now, let's assume an error message is enough and other valid fields for this row might be saved if any.
-                                                        # A better approach would be to invalidate the entire row's update.
-                                                        # For simplicity in this step, we'll just show error and skip this field.
-                                                        # The `required=True` in NumberColumn should ideally prevent this,
-                                                        # but explicit check here is safer.
-                                                        continue  # Skip this problematic field
-
-                                                    edited_value_decimal = Decimal(
-                                                        str(edited_value)
-                                                    )
-                                                    if (
-                                                        original_value
-                                                        != edited_value_decimal
-                                                    ):
-                                                        update_dict[col] = (
-                                                            edited_value_decimal
-                                                        )
-                                                except ValueError:
-                                                    st.error(
-                                                        f"Valor inválido para preço no lance ID {bid_id}: '{edited_value}'."
-                                                    )
-                                                    continue
-                                                except Exception as e:  # Catch any other conversion error
-                                                    st.error(
-                                                        f"Erro ao converter preço no lance ID {bid_id}: {edited_value}. Erro: {e}"
-                                                    )
-                                                    continue
-                                            elif original_value != edited_value:
-                                                update_dict[col] = edited_value
-
-                                        if update_dict:  # Only proceed if there are changes to save for this row
-                                            try:
-                                                bid_repo.update(bid_id, update_dict)
-                                                st.success(
-                                                    f"Lance ID {bid_id} atualizado com sucesso."
-                                                )
-                                                changes_made = True
-                                            except Exception as e:
-                                                st.error(
-                                                    f"Erro ao atualizar lance ID {bid_id}: {e}. Dados: {update_dict}"
-                                                )
-
-                                # --- DELETION LOGIC FOR BIDS ---
-                                original_ids_bids = set()
-                                if (
-                                    not original_bids_df.empty
-                                    and "id" in original_bids_df.columns
-                                ):
-                                    original_ids_bids = set(original_bids_df["id"])
-                                elif not original_bids_df.empty:
-                                    st.warning(
-                                        "Tabela de lances original não possui coluna 'id'. Deleção de lances não pode ser processada."
-                                    )
-
-                                edited_ids_bids = set()
-                                if (
-                                    not edited_bids_df.empty
-                                    and "id" in edited_bids_df.columns
-                                ):
-                                    edited_ids_bids = set(edited_bids_df["id"])
-                                elif (
-                                    not edited_bids_df.empty
-                                    and "id" not in edited_bids_df.columns
-                                ):
-                                    st.warning(
-                                        "Tabela de lances editada não possui coluna 'id'. Deleção de lances pode ser imprecisa."
-                                    )
-
-                                if (
-                                    not original_bids_df.empty
-                                    and "id" in original_bids_df.columns
-                                ):
-                                    deleted_bid_ids = (
-                                        original_ids_bids - edited_ids_bids
-                                    )
-
-                                    if deleted_bid_ids:
-                                        for bid_id_to_delete in deleted_bid_ids:
-                                            try:
-                                                bid_repo.delete(bid_id_to_delete)
-                                                st.success(
-                                                    f"Lance ID {bid_id_to_delete} deletado com sucesso."
-                                                )
-                                                changes_made = True
-                                            except Exception as e:
-                                                st.error(
-                                                    f"Erro ao deletar lance ID {bid_id_to_delete}: {e}"
-                                                )
-
-                                if changes_made:
-                                    st.rerun()
-                        else:
-                            st.info("Nenhum lance cadastrado para este item.")
+                        show_bids_editor(current_item_details.id)
 
                     st.subheader("Gráficos")
-                    graph_cols_display = st.columns(2)
-                    with graph_cols_display[0]:
-                        if (
-                            not edited_quotes_df.empty  # Use standardized edited_quotes_df
-                            and "calculated_price" in edited_quotes_df.columns
-                            and "supplier_name" in edited_quotes_df.columns
-                        ):
-                            st.plotly_chart(
-                                create_quotes_figure(
-                                    edited_quotes_df
-                                ),  # Use standardized edited_quotes_df
-                                use_container_width=True,
-                            )
-                        else:
-                            st.caption("Gráfico de orçamentos não disponível.")
-                    with graph_cols_display[1]:
-                        # Use original_bids_df for the chart data to ensure 'created_at' is present
-                        # and for the emptiness check related to plotting.
-                        if (
-                            not original_bids_df.empty  # Changed to original_bids_df
-                            and "price" in original_bids_df.columns
-                            and "bidder_name" in original_bids_df.columns
-                            and "created_at"
-                            in original_bids_df.columns  # Ensure created_at is checked on original_bids_df
-                        ):
-                            min_quote_price_val = (
-                                edited_quotes_df[
-                                    "calculated_price"
-                                ].min()  # Use standardized edited_quotes_df
-                                if not edited_quotes_df.empty
-                                and "calculated_price" in edited_quotes_df.columns
-                                else None
-                            )
-                            st.plotly_chart(
-                                create_bids_figure(
-                                    original_bids_df,
-                                    min_quote_price_val,  # Changed to original_bids_df
-                                ),
-                                use_container_width=True,
-                            )
-                        else:
-                            st.caption("Gráfico de lances não disponível.")
+                    show_item_charts(current_item_details.id)
+
+                    st.subheader("Histórico de Preços")
+                    show_item_price_history(current_item_details)
                 else:
                     if st.session_state.selected_item_id is not None:
                         st.warning(
@@ -1124,9 +1239,20 @@ set_dialog_repositories(
 st.title(APP_TITLE)
 
 # --- Conditional View Rendering ---
-if st.session_state.current_view == "Principal":
-    show_main_view()
-elif st.session_state.current_view == "Visão Geral":
-    show_management_tables_view(
-        bidding_repo, item_repo, supplier_repo, quote_repo, bidder_repo, bid_repo
-    )
+# One unit of work per script run: identical repository reads made while rendering
+# are loaded once, and the number of queries of the run is logged.
+with request_scope(f"Execução ({st.session_state.current_view})"):
+    if st.session_state.current_view == "Principal":
+        show_main_view()
+    elif st.session_state.current_view == "Visão Geral":
+        show_management_tables_view(
+            bidding_repo,
+            item_repo,
+            supplier_repo,
+            quote_repo,
+            bidder_repo,
+            bid_repo,
+            price_summaries,
+        )
+    elif st.session_state.current_view == "Pregão ao Vivo":
+        show_auction_view(bidding_repo, item_repo, bidder_repo, bid_repo, price_summaries)
@@ -1,11 +1,104 @@
+from sqlalchemy import Engine, event
 from sqlmodel import SQLModel, Session, create_engine
 import os
+import threading
 from collections.abc import Generator
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Pool settings, overridable through the environment.
+# pool_size/max_overflow only apply to dialects that use a QueuePool
+# (file-based SQLite, PostgreSQL, MySQL); in-memory SQLite ignores them.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds, -1 disables
+
+# --- Engine registry ---
+# Engines are cached per process and keyed by URL, so every repository and every
+# Streamlit rerun/session reuses the same connection pool.
+_engines: dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(
+    db_url: str,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_pre_ping: bool | None = None,
+    pool_recycle: int | None = None,
+) -> Engine:
+    """
+    Returns the shared engine for `db_url`, creating it on first use.
+
+    Pool settings are only used when the engine is created; later calls for the
+    same URL return the cached engine unchanged. Use `dispose_engines()` to
+    rebuild engines with new settings.
+    """
+    engine = _engines.get(db_url)
+    if engine is not None:
+        return engine
+
+    with _engines_lock:
+        engine = _engines.get(db_url)  # Another thread may have created it meanwhile
+        if engine is None:
+            engine = _create_pooled_engine(
+                db_url,
+                pool_size=POOL_SIZE if pool_size is None else pool_size,
+                max_overflow=POOL_MAX_OVERFLOW if max_overflow is None else max_overflow,
+                pool_pre_ping=POOL_PRE_PING if pool_pre_ping is None else pool_pre_ping,
+                pool_recycle=POOL_RECYCLE if pool_recycle is None else pool_recycle,
+            )
+            _engines[db_url] = engine
+        return engine
+
+
+def _create_pooled_engine(
+    db_url: str,
+    pool_size: int,
+    max_overflow: int,
+    pool_pre_ping: bool,
+    pool_recycle: int,
+) -> Engine:
+    engine_kwargs: dict = {
+        "pool_pre_ping": pool_pre_ping,
+        "pool_recycle": pool_recycle,
+    }
+    is_sqlite = db_url.startswith("sqlite")
+    is_memory_sqlite = is_sqlite and (
+        db_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in db_url
+    )
+    if not is_memory_sqlite:
+        engine_kwargs["pool_size"] = pool_size
+        engine_kwargs["max_overflow"] = max_overflow
+    if is_sqlite:
+        # Streamlit serves each session from its own thread; pooled SQLite
+        # connections must be allowed to move between threads.
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+    engine = create_engine(db_url, **engine_kwargs)
+    if is_sqlite:
+        event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+    return engine
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    # SQLite only enforces foreign keys (and runs their ON DELETE CASCADE/SET NULL)
+    # on connections that ask for it
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def dispose_engines() -> None:
+    """Closes every pooled connection and clears the engine registry."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
 if DATABASE_URL is not None:
-    engine = create_engine(DATABASE_URL)
+    engine = get_engine(DATABASE_URL)
 
 
 def init_db():
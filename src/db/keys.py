@@ -0,0 +1,30 @@
+import re
+import unicodedata
+from typing import Any
+
+# --- Matching keys ---
+# Names and codes typed by different people (editais, supplier price lists) rarely
+# match byte for byte: accents, case, punctuation and spacing vary. These keys fold
+# those differences away so the values can be compared with a dict lookup.
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(value: Any) -> str:
+    """'Caneta Esferográfica, Azul (cx. c/ 50)' -> 'caneta esferografica azul cx c 50'."""
+    if value is None:
+        return ""
+    text = str(value)
+    if not text.isascii():  # Most codes and many names have no accents to strip
+        # NFKD splits 'é' into 'e' + accent; the ascii round trip drops the accent
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALPHANUMERIC.sub(" ", text.lower()).strip()
+
+
+def normalize_code(value: Any) -> str:
+    """'  AB-00.12 ' -> 'ab0012'; spreadsheet numbers such as 12.0 -> '12'."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return normalize_name(value).replace(" ", "")
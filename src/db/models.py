@@ -2,16 +2,20 @@ from datetime import datetime
 from decimal import Decimal
 from enum import Enum as PyEnum
 from typing import Optional  # Added import
+from sqlalchemy import event
 from sqlmodel import (
     Column,
     Enum,
     Field,
+    Index,
     Numeric,
     Relationship,
     SQLModel,
     DateTime,
 )
 
+from db.keys import normalize_code, normalize_name
+
 
 class Quote(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
@@ -25,10 +29,10 @@ class Quote(SQLModel, table=True):
     )
 
     item_id: int | None = Field(
-        foreign_key="item.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item.id", nullable=False, ondelete="CASCADE", index=True
     )
     supplier_id: int | None = Field(
-        foreign_key="supplier.id", nullable=False, ondelete="CASCADE"
+        foreign_key="supplier.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     price: Decimal = Field(  # This is the Custo do Produto
@@ -56,6 +60,9 @@ class Quote(SQLModel, table=True):
 
 
 class Bid(SQLModel, table=True):
+    # Bid timeline chart: bids of one item ordered by time
+    __table_args__ = (Index("ix_bid_item_id_created_at", "item_id", "created_at"),)
+
     id: int | None = Field(default=None, primary_key=True)
 
     created_at: datetime | None = Field(
@@ -67,13 +74,17 @@ class Bid(SQLModel, table=True):
     )
 
     item_id: int | None = Field(
-        foreign_key="item.id", nullable=False, ondelete="CASCADE"
+        foreign_key="item.id", nullable=False, ondelete="CASCADE", index=True
     )
     bidder_id: int | None = Field(
-        default=None, foreign_key="bidder.id", nullable=True, ondelete="SET NULL"
+        default=None,
+        foreign_key="bidder.id",
+        nullable=True,
+        ondelete="SET NULL",
+        index=True,
     )  # Now optional
     bidding_id: int | None = Field(
-        foreign_key="bidding.id", nullable=False, ondelete="CASCADE"
+        foreign_key="bidding.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     notes: str | None = Field(default=None)
@@ -126,13 +137,17 @@ class Item(SQLModel, table=True):
 
     code: str = Field(nullable=False)  # New field
     name: str = Field(nullable=False)
+    # Matching keys of code/name (db/keys.py), set on every insert/update: the
+    # price history groups items of different biddings by them (NULL when empty)
+    code_key: str | None = Field(default=None, index=True)
+    name_key: str | None = Field(default=None, index=True)
     desc: str | None = Field(default=None)
     unit: str = Field(nullable=False)
     quantity: float
     notes: str | None = Field(default=None)
 
     bidding_id: int | None = Field(
-        foreign_key="bidding.id", nullable=False, ondelete="CASCADE"
+        foreign_key="bidding.id", nullable=False, ondelete="CASCADE", index=True
     )
 
     bidding: Bidding | None = Relationship(back_populates="items")
@@ -144,6 +159,13 @@ class Item(SQLModel, table=True):
     )
 
 
+@event.listens_for(Item, "before_insert")
+@event.listens_for(Item, "before_update")
+def _set_item_keys(mapper, connection, target: Item) -> None:
+    target.code_key = normalize_code(target.code) or None
+    target.name_key = normalize_name(target.name) or None
+
+
 class Supplier(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
 
@@ -186,3 +208,57 @@ class Bidder(SQLModel, table=True):  # Renamed class
     items: Optional[list["Item"]] = Relationship(
         back_populates="bidders", link_model=Bid
     )
+
+
+class ItemPriceSummary(SQLModel, table=True):
+    """
+    Price aggregates of one item, kept up to date by services/price_summary.py on
+    every quote/bid write (and computed on first read for items without a row).
+    Quote prices are the calculated prices of the pricing engine.
+    """
+
+    __tablename__ = "item_price_summary"
+
+    item_id: int = Field(foreign_key="item.id", primary_key=True, ondelete="CASCADE")
+
+    quote_count: int = Field(default=0, nullable=False)
+    min_quote_price: Decimal | None = Field(
+        default=None,
+        sa_column=Column(Numeric(precision=20, scale=4, asdecimal=True), nullable=True),
+    )
+    avg_quote_price: Decimal | None = Field(
+        default=None,
+        sa_column=Column(Numeric(precision=20, scale=4, asdecimal=True), nullable=True),
+    )
+    max_quote_price: Decimal | None = Field(
+        default=None,
+        sa_column=Column(Numeric(precision=20, scale=4, asdecimal=True), nullable=True),
+    )
+    best_supplier_id: int | None = Field(
+        default=None, foreign_key="supplier.id", nullable=True, ondelete="SET NULL"
+    )
+
+    bid_count: int = Field(default=0, nullable=False)
+    lowest_bid_price: Decimal | None = Field(
+        default=None,
+        sa_column=Column(Numeric(precision=20, scale=5, asdecimal=True), nullable=True),
+    )
+    leading_bidder_id: int | None = Field(
+        default=None, foreign_key="bidder.id", nullable=True, ondelete="SET NULL"
+    )
+    last_bid_at: datetime | None = Field(default=None, sa_column=Column(DateTime))
+
+    refreshed_at: datetime | None = Field(default=None, sa_column=Column(DateTime))
+
+
+class TableVersion(SQLModel, table=True):
+    """
+    Write counter per table, bumped by database triggers on every INSERT, UPDATE
+    and DELETE (see migration 4f2a8d31c9e7). Caches compare it to detect writes
+    made outside their own repository (other processes, scripts, migrations).
+    """
+
+    __tablename__ = "table_version"
+
+    table_name: str = Field(primary_key=True)
+    version: int = Field(default=0, nullable=False)
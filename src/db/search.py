@@ -0,0 +1,139 @@
+import os
+import time
+from collections.abc import Sequence
+from typing import Any
+from sqlalchemy import ColumnElement, Engine, String, cast, column, or_, select, table, text
+
+# --- Full-text search ---
+# On SQLite, items, suppliers, bidders and biddings have FTS5 tables using the
+# trigram tokenizer (migration 7d3e5a9b1f42), kept in sync with their content
+# table by triggers. A trigram MATCH is a case-insensitive substring search, like
+# the LIKE it replaces, but answered from the index instead of scanning the table.
+# Terms shorter than a trigram, columns outside the index and databases without
+# the FTS tables fall back to LIKE. On PostgreSQL the same LIKE/ILIKE clauses are
+# served by pg_trgm GIN indexes created by the same migration.
+
+# content table -> (FTS5 table, indexed columns)
+FTS_TABLES: dict[str, tuple[str, list[str]]] = {
+    "item": ("item_fts", ["name", "desc", "code"]),
+    "supplier": ("supplier_fts", ["name", "website", "email", "phone", "desc"]),
+    "bidder": ("bidder_fts", ["name", "website", "email", "phone", "desc"]),
+    "bidding": ("bidding_fts", ["city", "process_number"]),
+}
+
+FTS_MIN_TERM_LENGTH = 3  # Trigram tokenizer: shorter terms match nothing
+
+# Seconds before the list of FTS tables of a database is read again, so tables
+# created or dropped by a migration while the app runs are picked up
+FTS_CHECK_INTERVAL = float(os.getenv("FTS_CHECK_INTERVAL", "60"))
+
+# Database URL -> (time of the check, names of the FTS tables that exist there)
+_available_fts: dict[str, tuple[float, set[str]]] = {}
+
+
+def available_fts_tables(engine: Engine) -> set[str]:
+    """Names of the FTS5 tables present in the database (re-read every FTS_CHECK_INTERVAL s)."""
+    if engine.dialect.name != "sqlite":
+        return set()
+    key = str(engine.url)
+    now = time.monotonic()
+    checked_at, tables = _available_fts.get(key, (float("-inf"), set()))
+    if now - checked_at >= FTS_CHECK_INTERVAL:
+        with engine.connect() as connection:
+            tables = set(
+                connection.execute(
+                    text(
+                        "SELECT name FROM sqlite_master "
+                        "WHERE type = 'table' AND name LIKE '%\\_fts' ESCAPE '\\'"
+                    )
+                ).scalars()
+            )
+        _available_fts[key] = (now, tables)
+    return tables
+
+
+def like_clause(expressions: Sequence[Any], term: str) -> ColumnElement[bool] | None:
+    """Case-insensitive substring match of `term` in any of the expressions."""
+    if not expressions:
+        return None
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    return or_(
+        *(
+            (expr if _is_text(expr.type) else cast(expr, String)).ilike(
+                pattern, escape="\\"
+            )
+            for expr in expressions
+        )
+    )
+
+
+def fts_clause(
+    content_table: str, id_column: Any, term: str, columns: Sequence[str]
+) -> ColumnElement[bool]:
+    """`id IN (rowids of the FTS table matching term in the given columns)`."""
+    fts_table, _ = FTS_TABLES[content_table]
+    column_filter = " ".join(f'"{name}"' for name in columns)
+    phrase = '"' + term.replace('"', '""') + '"'
+    fts = table(fts_table, column("rowid"))
+    matching_ids = select(fts.c.rowid).where(
+        text(f"{fts_table} MATCH :fts_query").bindparams(
+            fts_query=f"{{{column_filter}}} : {phrase}"
+        )
+    )
+    return id_column.in_(matching_ids)
+
+
+def search_clause(
+    engine: Engine,
+    statement: Any,
+    content_table: str,
+    term: str,
+    columns: Sequence[str],
+) -> ColumnElement[bool] | None:
+    """
+    WHERE clause matching `term` in the given columns of `statement`.
+
+    Columns of `content_table` covered by its FTS index are searched through the
+    index; every other selected column (e.g. joined labels) uses LIKE. Columns the
+    statement does not select are ignored; returns None when none is left.
+    """
+    selected = statement.selected_columns
+    names = [name for name in columns if name in selected]
+    if not names:
+        return None
+
+    indexed: list[str] = []
+    fts_table, fts_columns = FTS_TABLES.get(content_table, (None, []))
+    if (
+        fts_table is not None
+        and len(term) >= FTS_MIN_TERM_LENGTH
+        and fts_table in available_fts_tables(engine)
+    ):
+        # Only columns selected straight from the content table (not labels)
+        indexed = [
+            name
+            for name in names
+            if name in fts_columns
+            and getattr(selected[name], "table", None) is not None
+            and selected[name].table.name == content_table
+        ]
+
+    clauses = []
+    if indexed:
+        clauses.append(
+            fts_clause(content_table, selected["id"], term, indexed)
+            if "id" in selected
+            else like_clause([selected[name] for name in indexed], term)
+        )
+    like = like_clause([selected[name] for name in names if name not in indexed], term)
+    if like is not None:
+        clauses.append(like)
+    return or_(*clauses) if len(clauses) > 1 else clauses[0]
+
+
+def _is_text(sql_type: Any) -> bool:
+    """True for String columns, including TypeDecorators over String (SQLModel's AutoString)."""
+    return isinstance(sql_type, String) or isinstance(
+        getattr(sql_type, "impl_instance", None), String
+    )
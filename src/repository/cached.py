@@ -0,0 +1,277 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, override
+import pandas as pd
+from sqlalchemy import Engine, Select, select
+from sqlalchemy.exc import (
+    NoResultFound,
+    OperationalError,
+    ProgrammingError,
+    SQLAlchemyError,
+)
+from sqlmodel import SQLModel
+
+from db.models import TableVersion
+from .interface import BulkResult
+from .sqlmodel import SQLModelRepository
+from .unit_of_work import freeze
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two reads of the table version counter; 0 checks on every read
+VERSION_CHECK_INTERVAL = float(os.getenv("CACHE_VERSION_CHECK_INTERVAL", "1.0"))
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _TableCache:
+    """Cached reads of one table, shared by every repository for that table."""
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    entries: dict[tuple, Any] = field(default_factory=dict)
+    stats: CacheStats = field(default_factory=CacheStats)
+    generation: int = 0  # Bumped on invalidation; reads started before it are not stored
+    version: int | None = None  # Last table_version seen
+    checked_at: float = float("-inf")
+    track_versions: bool = True
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.generation += 1
+            self.stats.invalidations += 1
+
+
+# --- Process-wide cache registry ---
+# Keyed by (database URL, table name), so the cache outlives the repository
+# instances (re-created on every Streamlit rerun) and is shared by all sessions.
+_caches: dict[tuple[str, str], _TableCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _get_table_cache(engine: Engine, table_name: str) -> _TableCache:
+    key = (str(engine.url), table_name)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = _TableCache()
+        return cache
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    """Hit/miss/invalidation counters of every table cache, keyed by table name."""
+    with _caches_lock:
+        return {table_name: cache.stats for (_, table_name), cache in _caches.items()}
+
+
+def clear_caches() -> None:
+    """Drops every cached result (counters are kept)."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.invalidate()
+
+
+def _is_missing_table(error: SQLAlchemyError) -> bool:
+    """Whether the database reported a missing table (SQLite, PostgreSQL, MySQL)."""
+    message = str(getattr(error, "orig", error)).lower()
+    return any(
+        phrase in message for phrase in ("no such table", "does not exist", "doesn't exist")
+    )
+
+
+class CachedSQLModelRepository[T: SQLModel](SQLModelRepository[T]):
+    """
+    SQLModelRepository that keeps read results in a process-wide memory cache.
+
+    Meant for reference tables that change rarely (biddings, suppliers, bidders).
+    `get`, `get_all`, `find_by`, `find_frame_by` and `fetch_frame()` without a
+    statement are cached; other queries go straight to the database.
+
+    The cache of a table is dropped on every write made through any cached
+    repository of that table. Writes made elsewhere are detected through the
+    `table_version` counter (maintained by database triggers), read at most
+    once every `version_check_interval` seconds. Without that table (or the
+    table's row in it) the cache relies on write-through invalidation only; when
+    the counter exists but cannot be read, reads bypass the cache until it can.
+
+    Cached objects are shared between sessions and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        model: type[T],
+        db_url: str = "sqlite:///data/bidtrack.db",
+        engine_instance: Engine | None = None,
+        version_check_interval: float | None = None,
+    ) -> None:
+        super().__init__(model, db_url, engine_instance)
+        self.table_name: str = model.__tablename__
+        self.version_check_interval = (
+            VERSION_CHECK_INTERVAL
+            if version_check_interval is None
+            else version_check_interval
+        )
+        self._cache = _get_table_cache(self.engine, self.table_name)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def invalidate(self) -> None:
+        """Drops the cached results of this repository's table."""
+        self._cache.invalidate()
+
+    # --- Cached reads ---
+
+    @override
+    def get(self, id: int) -> T | None:
+        return self._cached(("get", int(id)), partial(super().get, id))
+
+    @override
+    def get_all(self) -> list[T]:
+        return list(self._cached(("get_all",), super().get_all))
+
+    @override
+    def find_by(self, **filters: Any) -> list[T]:
+        key = ("find_by", freeze(filters))
+        return list(self._cached(key, partial(super().find_by, **filters)))
+
+    @override
+    def find_frame_by(self, **filters: Any) -> pd.DataFrame:
+        key = ("frame", freeze(filters))
+        return self._cached(key, partial(super().find_frame_by, **filters)).copy()
+
+    @override
+    def fetch_frame(
+        self, statement: Select | None = None, columns: list[str] | None = None
+    ) -> pd.DataFrame:
+        if statement is not None or columns is not None:
+            return super().fetch_frame(statement, columns)
+        return self.find_frame_by()
+
+    def _cached(self, key: tuple, load: Callable[[], Any]) -> Any:
+        cache = self._cache
+        if not self._check_version():
+            # Version unknown: read from the database without using the cache
+            with cache.lock:
+                cache.stats.misses += 1
+            return load()
+        with cache.lock:
+            if key in cache.entries:
+                cache.stats.hits += 1
+                return cache.entries[key]
+            cache.stats.misses += 1
+            generation = cache.generation
+        value = load()
+        with cache.lock:
+            # A write during the load invalidated the cache: do not store a stale result
+            if cache.generation == generation:
+                cache.entries[key] = value
+        return value
+
+    def _check_version(self) -> bool:
+        """
+        Drops the cache if the table's version counter moved since the last check.
+
+        Returns False when the counter could not be read this time, so the read
+        must bypass the cache. Version tracking is turned off for good only when
+        the counter does not exist (no table_version table or no row for the table).
+        """
+        cache = self._cache
+        if not cache.track_versions:
+            return True
+        now = time.monotonic()
+        if now - cache.checked_at < self.version_check_interval:
+            return True
+        try:
+            with self.engine.connect() as connection:
+                version = connection.execute(
+                    select(TableVersion.version).where(
+                        TableVersion.table_name == self.table_name
+                    )
+                ).scalar_one()
+        except (NoResultFound, OperationalError, ProgrammingError) as e:
+            if not isinstance(e, NoResultFound) and not _is_missing_table(e):
+                return self._version_check_failed(e)
+            cache.track_versions = False
+            logger.warning(
+                "Contador de versão indisponível para '%s' (%s); "
+                "o cache dependerá apenas das escritas feitas pelo repositório.",
+                self.table_name,
+                e,
+            )
+            return True
+        except SQLAlchemyError as e:
+            return self._version_check_failed(e)
+        with cache.lock:
+            cache.checked_at = now
+            changed = cache.version is not None and version != cache.version
+            cache.version = version
+        if changed:
+            cache.invalidate()
+        return True
+
+    def _version_check_failed(self, error: SQLAlchemyError) -> bool:
+        logger.warning(
+            "Falha ao ler o contador de versão de '%s' (%s); lendo do banco sem cache.",
+            self.table_name,
+            error,
+        )
+        return False
+
+    # --- Writes: always invalidate, even if the write failed halfway ---
+
+    @override
+    def add(self, item: T) -> T:
+        try:
+            return super().add(item)
+        finally:
+            self.invalidate()
+
+    @override
+    def update(self, item_id: int, item_data: dict[str, Any]) -> T | None:
+        try:
+            return super().update(item_id, item_data)
+        finally:
+            self.invalidate()
+
+    @override
+    def delete(self, id: int) -> bool:
+        try:
+            return super().delete(id)
+        finally:
+            self.invalidate()
+
+    @override
+    def add_many(self, items: list[T]) -> BulkResult:
+        try:
+            return super().add_many(items)
+        finally:
+            self.invalidate()
+
+    @override
+    def update_many(self, changes: dict[int, dict[str, Any]]) -> BulkResult:
+        try:
+            return super().update_many(changes)
+        finally:
+            self.invalidate()
+
+    @override
+    def delete_many(self, ids: list[int]) -> BulkResult:
+        try:
+            return super().delete_many(ids)
+        finally:
+            self.invalidate()
+
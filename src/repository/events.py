@@ -0,0 +1,153 @@
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+from sqlalchemy import Engine, event, inspect
+from sqlalchemy.orm import Session, SessionTransaction
+
+logger = logging.getLogger(__name__)
+
+# --- Write listeners ---
+# Caches derived from table rows (figures, summaries...) register here to hear
+# about the rows written to a table. Writes are collected when the ORM flushes
+# them and delivered once the transaction commits, so the listeners see every
+# add/update/delete made through an ORM Session (repositories and dialogs alike),
+# and nothing that was rolled back. Rows are passed as dicts of their column
+# values, taken at flush time (deleted rows are gone after the commit).
+# Writes are kept per transaction: a released SAVEPOINT hands its writes to the
+# enclosing transaction, a rolled back one drops them, and only the commit of the
+# outermost transaction delivers them (the session fires after_commit for
+# SAVEPOINTs too, while the database is still locked by the open transaction).
+
+
+@dataclass
+class WrittenRows:
+    engine: Engine
+    table_name: str
+    inserted: list[dict[str, Any]] = field(default_factory=list)
+    updated: list[dict[str, Any]] = field(default_factory=list)  # Values after the update
+    previous: list[dict[str, Any]] = field(default_factory=list)  # Same rows, before it
+    deleted: list[dict[str, Any]] = field(default_factory=list)
+
+    def values(self, column: str) -> set[Any]:
+        """Values of a column in every written row, old and new (None when not loaded)."""
+        return {
+            row.get(column)
+            for rows in (self.inserted, self.updated, self.previous, self.deleted)
+            for row in rows
+        }
+
+    def extend(self, other: "WrittenRows") -> None:
+        self.inserted.extend(other.inserted)
+        self.updated.extend(other.updated)
+        self.previous.extend(other.previous)
+        self.deleted.extend(other.deleted)
+
+
+WriteListener = Callable[[WrittenRows], None]
+
+_PENDING_KEY = "bidtrack_pending_writes"
+_listeners: dict[str, list[WriteListener]] = {}
+_listeners_lock = threading.Lock()
+
+
+def add_write_listener(table_name: str, listener: WriteListener) -> None:
+    """Calls `listener(written)` after each commit that added, changed or deleted rows of the table."""
+    with _listeners_lock:
+        _listeners.setdefault(table_name, []).append(listener)
+
+
+def remove_write_listener(table_name: str, listener: WriteListener) -> None:
+    with _listeners_lock:
+        if listener in _listeners.get(table_name, []):
+            _listeners[table_name].remove(listener)
+
+
+def _row_values(obj: Any, before: bool = False) -> dict[str, Any]:
+    state = inspect(obj)
+    values = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key not in state.dict:
+            continue
+        history = state.attrs[attr.key].history
+        values[attr.key] = history.deleted[0] if before and history.deleted else state.dict[attr.key]
+    return values
+
+
+def _pending(session: Session) -> dict[SessionTransaction, dict[str, WrittenRows]]:
+    return session.info.setdefault(_PENDING_KEY, {})
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_writes(session: Session, flush_context: Any) -> None:
+    if not _listeners:
+        return
+    transaction = session.get_nested_transaction() or session.get_transaction()
+    pending = _pending(session).setdefault(transaction, {})
+
+    def written(obj: Any) -> WrittenRows | None:
+        table_name = getattr(obj, "__tablename__", None)
+        if table_name not in _listeners:
+            return None
+        if table_name not in pending:
+            pending[table_name] = WrittenRows(session.get_bind(), table_name)
+        return pending[table_name]
+
+    # During after_flush the session still lists what the flush wrote, with the
+    # attribute history of the updated rows
+    for obj in session.new:
+        if (rows := written(obj)) is not None:
+            rows.inserted.append(_row_values(obj))
+    for obj in session.dirty:
+        if (rows := written(obj)) is not None and session.is_modified(obj):
+            rows.updated.append(_row_values(obj))
+            rows.previous.append(_row_values(obj, before=True))
+    for obj in session.deleted:
+        if (rows := written(obj)) is not None:
+            rows.deleted.append(_row_values(obj))
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_writes(session: Session) -> None:
+    pending = _pending(session)
+    if session.in_nested_transaction():
+        # A SAVEPOINT was released: its writes now belong to the enclosing transaction
+        savepoint = session.get_nested_transaction()
+        _hand_over(pending.pop(savepoint, {}), pending.setdefault(savepoint.parent, {}))
+        return
+    session.info.pop(_PENDING_KEY, None)
+    committed: dict[str, WrittenRows] = {}
+    for by_table in pending.values():
+        _hand_over(by_table, committed)
+    for table_name, written in committed.items():
+        _deliver(table_name, written)
+
+
+def _hand_over(source: dict[str, WrittenRows], target: dict[str, WrittenRows]) -> None:
+    for table_name, written in source.items():
+        if table_name in target:
+            target[table_name].extend(written)
+        else:
+            target[table_name] = written
+
+
+def _deliver(table_name: str, written: WrittenRows) -> None:
+    with _listeners_lock:
+        listeners = list(_listeners.get(table_name, []))
+    for listener in listeners:
+        try:
+            listener(written)
+        except Exception:
+            # The write is already committed; a failing cache must not undo it
+            logger.exception("Falha no listener de escrita da tabela '%s'.", table_name)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_writes(session: Session, transaction: SessionTransaction) -> None:
+    # Writes still kept for a transaction when it ends were rolled back
+    # (committed ones were handed over or delivered by _commit_writes)
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+    elif _PENDING_KEY in session.info:
+        session.info[_PENDING_KEY].pop(transaction, None)
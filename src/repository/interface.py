@@ -1,9 +1,23 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import Any  # For dict[str, Any] in update method
 
 # Python 3.9+ allows built-in types like list for generics, so no 'from typing import list'
 
 
+@dataclass
+class BulkResult:
+    """
+    Outcome of a bulk write (add_many, update_many, delete_many).
+
+    Keys are the row ids for update_many/delete_many and the position in the
+    input list for add_many.
+    """
+
+    succeeded: list[int] = field(default_factory=list)
+    failed: dict[int, str] = field(default_factory=dict)  # key -> error message
+
+
 class Repository[T](ABC):
     @abstractmethod
     def add(self, item: T) -> T:
@@ -17,6 +31,16 @@ class Repository[T](ABC):
     def get_all(self) -> list[T]:
         raise NotImplementedError
 
+    @abstractmethod
+    def find_by(self, **filters: Any) -> list[T]:
+        """Returns the rows matching every filter (column=value, or IN for lists)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_where(self, *clauses: Any) -> list[T]:
+        """Returns the rows matching every given SQL expression."""
+        raise NotImplementedError
+
     @abstractmethod
     def update(self, item_id: int, item_data: dict[str, Any]) -> T | None:
         raise NotImplementedError
@@ -24,3 +48,15 @@ class Repository[T](ABC):
     @abstractmethod
     def delete(self, id: int) -> bool:
         raise NotImplementedError
+
+    @abstractmethod
+    def add_many(self, items: list[T]) -> BulkResult:
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_many(self, changes: dict[int, dict[str, Any]]) -> BulkResult:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_many(self, ids: list[int]) -> BulkResult:
+        raise NotImplementedError
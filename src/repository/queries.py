@@ -0,0 +1,255 @@
+from collections.abc import Collection
+from typing import Any
+from sqlalchemy import (
+    ColumnElement,
+    CompoundSelect,
+    Float,
+    Select,
+    cast,
+    desc,
+    false,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    union_all,
+)
+from db.models import Bid, Bidder, Bidding, Item, ItemPriceSummary, Quote, Supplier
+
+# --- Query builders for the display DataFrames ---
+# Quotes and bids are shown with the names of the supplier/bidder and item they
+# reference. These builders resolve the names with LEFT OUTER JOINs, so a page
+# only reads its own rows plus the names those rows point to, instead of loading
+# whole tables to map ids to names in Python. Run them with
+# `SQLModelRepository.fetch_frame`; names of missing parents come back as NULL.
+
+
+def quotes_with_names(
+    item_id: Any = None, bidding_id: Any = None, supplier_id: Any = None
+) -> Select:
+    """
+    SELECT of quote rows plus `supplier_name` and `item_name`.
+
+    Args:
+        item_id: Only quotes of this item (an id or a collection of ids).
+        bidding_id: Only quotes whose item belongs to this bidding (id or ids).
+        supplier_id: Only quotes of this supplier (an id or a collection of ids).
+    """
+    quote, supplier, item = Quote.__table__, Supplier.__table__, Item.__table__
+    statement = (
+        select(
+            *quote.columns,
+            supplier.c.name.label("supplier_name"),
+            item.c.name.label("item_name"),
+        )
+        .select_from(quote)
+        .outerjoin(supplier, quote.c.supplier_id == supplier.c.id)
+        .outerjoin(item, quote.c.item_id == item.c.id)
+    )
+    if item_id is not None:
+        statement = statement.where(_matches(quote.c.item_id, item_id))
+    if bidding_id is not None:
+        statement = statement.where(_matches(item.c.bidding_id, bidding_id))
+    if supplier_id is not None:
+        statement = statement.where(_matches(quote.c.supplier_id, supplier_id))
+    return statement.order_by(quote.c.id)
+
+
+def bids_with_names(item_id: Any = None, bidding_id: Any = None) -> Select:
+    """
+    SELECT of bid rows plus `bidder_name` and `item_name`.
+
+    Args:
+        item_id: Only bids for this item (an id or a collection of ids).
+        bidding_id: Only bids of this bidding (an id or a collection of ids).
+    """
+    bid, bidder, item = Bid.__table__, Bidder.__table__, Item.__table__
+    statement = (
+        select(
+            *bid.columns,
+            bidder.c.name.label("bidder_name"),
+            item.c.name.label("item_name"),
+        )
+        .select_from(bid)
+        .outerjoin(bidder, bid.c.bidder_id == bidder.c.id)
+        .outerjoin(item, bid.c.item_id == item.c.id)
+    )
+    if item_id is not None:
+        statement = statement.where(_matches(bid.c.item_id, item_id))
+    if bidding_id is not None:
+        statement = statement.where(_matches(bid.c.bidding_id, bidding_id))
+    return statement.order_by(bid.c.id)
+
+
+def price_summaries_with_names(item_id: Any) -> Select:
+    """
+    SELECT of item_price_summary rows plus `best_supplier_name` and
+    `leading_bidder_name`.
+
+    Args:
+        item_id: Summaries of this item (an id or a collection of ids).
+    """
+    summary = ItemPriceSummary.__table__
+    supplier, bidder = Supplier.__table__, Bidder.__table__
+    return (
+        select(
+            *summary.columns,
+            supplier.c.name.label("best_supplier_name"),
+            bidder.c.name.label("leading_bidder_name"),
+        )
+        .select_from(summary)
+        .outerjoin(supplier, summary.c.best_supplier_id == supplier.c.id)
+        .outerjoin(bidder, summary.c.leading_bidder_id == bidder.c.id)
+        .where(_matches(summary.c.item_id, item_id))
+        .order_by(summary.c.item_id)
+    )
+
+
+def bidding_export_rows(bidding_id: Any) -> CompoundSelect:
+    """
+    UNION ALL of the quotes and bids of a bidding, one row per quote or bid.
+
+    Columns: record_type ('Orçamento' or 'Lance'), the item's id, code, name,
+    unit and quantity, party_name (supplier or bidder), the quote pricing inputs
+    (NULL for bids), notes, link, created_at and sort_price. Rows come ordered
+    by item, quotes before bids, cheapest first: quotes by calculated price,
+    bids by price (sort_price holds that value).
+    """
+    quote, bid, item = Quote.__table__, Bid.__table__, Item.__table__
+    supplier, bidder = Supplier.__table__, Bidder.__table__
+    item_columns = (
+        item.c.id.label("item_id"),
+        item.c.code.label("item_code"),
+        item.c.name.label("item_name"),
+        item.c.unit.label("item_unit"),
+        item.c.quantity.label("item_quantity"),
+    )
+    quotes = (
+        select(
+            literal("Orçamento").label("record_type"),
+            *item_columns,
+            supplier.c.name.label("party_name"),
+            quote.c.price,
+            quote.c.freight,
+            quote.c.additional_costs,
+            quote.c.taxes,
+            quote.c.margin,
+            quote.c.notes,
+            quote.c.link,
+            quote.c.created_at,
+            _calculated_price_estimate(quote).label("sort_price"),
+        )
+        .select_from(quote)
+        .join(item, quote.c.item_id == item.c.id)
+        .outerjoin(supplier, quote.c.supplier_id == supplier.c.id)
+        .where(_matches(item.c.bidding_id, bidding_id))
+    )
+    bids = (
+        select(
+            literal("Lance"),
+            *item_columns,
+            bidder.c.name,
+            bid.c.price,
+            null().cast(quote.c.freight.type),
+            null().cast(quote.c.additional_costs.type),
+            null().cast(quote.c.taxes.type),
+            null().cast(quote.c.margin.type),
+            bid.c.notes,
+            null().cast(quote.c.link.type),
+            bid.c.created_at,
+            cast(bid.c.price, Float),
+        )
+        .select_from(bid)
+        .join(item, bid.c.item_id == item.c.id)
+        .outerjoin(bidder, bid.c.bidder_id == bidder.c.id)
+        .where(_matches(bid.c.bidding_id, bidding_id))
+    )
+    return union_all(quotes, bids).order_by("item_id", desc("record_type"), "sort_price")
+
+
+def _calculated_price_estimate(quote: Any) -> ColumnElement[float]:
+    """
+    The quote price formula in SQL floats, empty inputs as zero. Only used to
+    order rows; the exact price comes from services.pricing.
+    """
+
+    def value(column: Any) -> ColumnElement[float]:
+        return cast(func.coalesce(column, 0), Float)
+
+    cost = value(quote.c.price) + value(quote.c.freight) + value(quote.c.additional_costs)
+    return cost * (1 + value(quote.c.taxes) / 100) * (1 + value(quote.c.margin) / 100)
+
+
+def price_history_rows(code_key: str | None = None, name_key: str | None = None) -> CompoundSelect:
+    """
+    UNION ALL of the quotes and bids of every item, in any bidding, whose
+    `code_key` or `name_key` (db/keys.py) is the given one.
+
+    Columns: record_type ('Orçamento' or 'Lance'), the item's id, code and name,
+    the bidding's id, date, city and process_number, party_name, the quote
+    pricing inputs (NULL for bids) and created_at. Both keys are indexed, so
+    the items are found without scanning the item table. Rows come ordered by
+    bidding date.
+    """
+    quote, bid, item = Quote.__table__, Bid.__table__, Item.__table__
+    bidding, supplier, bidder = Bidding.__table__, Supplier.__table__, Bidder.__table__
+    key_clauses = []
+    if code_key:
+        key_clauses.append(item.c.code_key == code_key)
+    if name_key:
+        key_clauses.append(item.c.name_key == name_key)
+    group = or_(*key_clauses) if key_clauses else false()
+    common_columns = (
+        item.c.id.label("item_id"),
+        item.c.code.label("item_code"),
+        item.c.name.label("item_name"),
+        bidding.c.id.label("bidding_id"),
+        bidding.c.date.label("bidding_date"),
+        bidding.c.city.label("bidding_city"),
+        bidding.c.process_number.label("bidding_process_number"),
+    )
+    quotes = (
+        select(
+            literal("Orçamento").label("record_type"),
+            *common_columns,
+            supplier.c.name.label("party_name"),
+            quote.c.price,
+            quote.c.freight,
+            quote.c.additional_costs,
+            quote.c.taxes,
+            quote.c.margin,
+            quote.c.created_at,
+        )
+        .select_from(item)
+        .join(bidding, item.c.bidding_id == bidding.c.id)
+        .join(quote, quote.c.item_id == item.c.id)
+        .outerjoin(supplier, quote.c.supplier_id == supplier.c.id)
+        .where(group)
+    )
+    bids = (
+        select(
+            literal("Lance"),
+            *common_columns,
+            bidder.c.name,
+            bid.c.price,
+            null().cast(quote.c.freight.type),
+            null().cast(quote.c.additional_costs.type),
+            null().cast(quote.c.taxes.type),
+            null().cast(quote.c.margin.type),
+            bid.c.created_at,
+        )
+        .select_from(item)
+        .join(bidding, item.c.bidding_id == bidding.c.id)
+        .join(bid, bid.c.item_id == item.c.id)
+        .outerjoin(bidder, bid.c.bidder_id == bidder.c.id)
+        .where(group)
+    )
+    return union_all(quotes, bids).order_by("bidding_date", "bidding_id", "item_id")
+
+
+def _matches(column: Any, value: Any) -> ColumnElement[bool]:
+    """`column = value`, or `column IN (...)` for a collection of values."""
+    if isinstance(value, Collection) and not isinstance(value, (str, bytes)):
+        return column.in_(list(value))
+    return column == value
@@ -1,8 +1,40 @@
+from collections.abc import Callable, Collection, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
 from typing import override, Any
-from sqlalchemy import Engine
-from sqlmodel import SQLModel, create_engine, Session, select
+import pandas as pd
+from sqlalchemy import Boolean, ColumnElement, DateTime, Engine, Float, Integer, Numeric
+from sqlalchemy import CompoundSelect, Select, and_, or_, select as sa_select, tuple_
+from sqlmodel import SQLModel, Session, select
 
-from .interface import Repository  # Updated import for the interface
+from db import search as db_search
+from db.database import get_engine
+from .interface import BulkResult, Repository  # Updated import for the interface
+from .unit_of_work import current_scope, freeze
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated query (see SQLModelRepository.fetch_page)."""
+
+    frame: pd.DataFrame
+    next_cursor: Any = None  # Pass as `after` to get the next page; None on the last page
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _after_created_at(
+    created_at: ColumnElement, id_column: ColumnElement, cursor_created_at: Any, cursor_id: int
+) -> ColumnElement[bool]:
+    """Rows after the cursor in (created_at NULLS LAST, id) order."""
+    if cursor_created_at is None:
+        return and_(created_at.is_(None), id_column > cursor_id)
+    return or_(
+        tuple_(created_at, id_column) > tuple_(cursor_created_at, cursor_id),
+        created_at.is_(None),
+    )
 
 
 class SQLModelRepository[T: SQLModel](Repository[T]):
@@ -16,11 +48,13 @@ class SQLModelRepository[T: SQLModel](Repository[T]):
         if engine_instance:
             self.engine = engine_instance
         else:
-            self.engine = create_engine(db_url)
+            # Shared per-process engine: repositories with the same URL share one pool
+            self.engine = get_engine(db_url)
         # SQLModel.metadata.create_all(self.engine) # Ensure tables are created
 
     @override
     def add(self, item: T) -> T:
+        self._written()
         with Session(self.engine) as session:
             if hasattr(item, "id"):  # Manage ID for new records
                 item.id = None
@@ -32,43 +66,254 @@ class SQLModelRepository[T: SQLModel](Repository[T]):
 
     @override
     def get(self, id: int) -> T | None:
-        with Session(self.engine) as session:
-            return session.get(self.model, id)
+        def load() -> T | None:
+            with Session(self.engine) as session:
+                return session.get(self.model, id)
+
+        return self._read(("get", int(id)), load)
 
     @override
     def get_all(self) -> list[T]:
+        def load() -> list[T]:
+            with Session(self.engine) as session:
+                statement = select(self.model)
+                all_items = session.exec(statement).all()
+                return list(all_items)  # Ensure a list is returned
+
+        return list(self._read(("get_all",), load))
+
+    @override
+    def find_by(self, **filters: Any) -> list[T]:
+        clauses = self._filter_clauses(filters)
+        return list(
+            self._read(("find_by", freeze(filters)), lambda: self.find_where(*clauses))
+        )
+
+    @override
+    def find_where(self, *clauses: Any) -> list[T]:
         with Session(self.engine) as session:
             statement = select(self.model)
-            all_items = session.exec(statement).all()
-            return list(all_items)  # Ensure a list is returned
+            if clauses:
+                statement = statement.where(*clauses)
+            return list(session.exec(statement).all())
+
+    def fetch_frame(
+        self, statement: Select | None = None, columns: list[str] | None = None
+    ) -> pd.DataFrame:
+        """
+        Runs a SELECT and builds a DataFrame straight from the result tuples.
+
+        No ORM objects are created: rows are read as tuples, transposed into one
+        array per column and given a dtype from the selected column's SQL type.
+        Without a statement, every column of the model's table is selected.
+
+        Args:
+            statement: A Core SELECT (e.g. `select(Quote.id, Quote.price)`).
+            columns: Optional names for the result columns, in select order.
+
+        Returns:
+            A DataFrame with one column per selected column (empty but with its
+            columns when the query returns no rows).
+        """
+        if statement is None:
+            statement = self.select_columns()
+        compiled = statement.compile(dialect=self.engine.dialect)
+        key = ("frame", str(compiled), freeze(compiled.params), freeze(columns))
+        frame = self._read(key, lambda: self._load_frame(statement, columns))
+        return frame.copy()
+
+    def iter_frames(
+        self, statement: Select | CompoundSelect, chunk_size: int = 5000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streams a SELECT as DataFrames of at most `chunk_size` rows (typed like fetch_frame).
+
+        Rows are fetched with a server-side cursor where the driver supports it,
+        so memory is bounded by the chunk size. Results are not memoized.
+        """
+        sql_types = [column.type for column in statement.selected_columns]
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=chunk_size
+            ).execute(statement)
+            names = list(result.keys())
+            for rows in result.partitions():
+                yield _rows_to_frame(rows, names, sql_types)
+
+    def _load_frame(self, statement: Select, columns: list[str] | None) -> pd.DataFrame:
+        with self.engine.connect() as connection:
+            result = connection.execute(statement)
+            names = list(columns) if columns else list(result.keys())
+            rows = result.fetchall()
+
+        sql_types = [column.type for column in statement.selected_columns]
+        return _rows_to_frame(rows, names, sql_types)
+
+    def find_frame_by(self, **filters: Any) -> pd.DataFrame:
+        """Like find_by, but returns the matching rows as a DataFrame (see fetch_frame)."""
+        statement = self.select_columns()
+        if filters:
+            statement = statement.where(*self._filter_clauses(filters))
+        return self.fetch_frame(statement)
+
+    def fetch_page(
+        self,
+        statement: Select | None = None,
+        after: Any = None,
+        limit: int = 50,
+        order_by: str = "id",
+        search: str | None = None,
+        search_columns: Sequence[str] = (),
+        filters: dict[str, Any] | None = None,
+    ) -> Page:
+        """
+        Keyset pagination: returns at most `limit` rows following the `after` cursor.
+
+        Rows are ordered by id, or by (created_at, id) with order_by="created_at"
+        (rows without created_at last), and the next page starts after the last
+        row returned, so the cost of a page does not grow with its position (no
+        OFFSET). One extra row is read to know whether there is a next page.
+
+        Args:
+            statement: Base SELECT (all table columns by default). It must select
+                the model's id (and created_at when ordering by it); any ORDER BY
+                it has is replaced.
+            after: Cursor from the previous page's `next_cursor` (None for the first page).
+            limit: Page size.
+            order_by: "id" or "created_at".
+            search: Optional text searched in `search_columns` (see search_clause).
+            search_columns: Names of selected columns to search in.
+            filters: Optional keyword filters on the model's columns, as in find_by.
+        """
+        if statement is None:
+            statement = self.select_columns()
+        if filters:
+            statement = statement.where(*self._filter_clauses(filters))
+        if search:
+            clause = self.search_clause(statement, search, search_columns)
+            if clause is not None:
+                statement = statement.where(clause)
+
+        table_columns = self.model.__table__.columns
+        id_column = table_columns["id"]
+        if order_by == "id":
+            keys = [id_column]
+            if after is not None:
+                statement = statement.where(id_column > after)
+        elif order_by == "created_at":
+            # created_at is nullable: rows without it come last (NULLS LAST,
+            # written as an IS NULL key so every backend accepts it)
+            created_at = table_columns["created_at"]
+            keys = [created_at.is_(None), created_at, id_column]
+            if after is not None:
+                statement = statement.where(_after_created_at(created_at, id_column, *after))
+        else:
+            raise ValueError(f"Ordenação por '{order_by}' não suportada na paginação.")
+        statement = statement.order_by(None).order_by(*keys).limit(limit + 1)
+
+        frame = self.fetch_frame(statement)
+        if len(frame) <= limit:
+            return Page(frame)
+        frame = frame.iloc[:limit]
+        last_row = frame.iloc[-1]
+        if order_by == "id":
+            next_cursor = int(last_row["id"])
+        else:
+            last_created_at = pd.Timestamp(last_row["created_at"])
+            next_cursor = (
+                None if pd.isna(last_created_at) else last_created_at.to_pydatetime(),
+                int(last_row["id"]),
+            )
+        return Page(frame, next_cursor)
+
+    def search_clause(
+        self, statement: Select, term: str, columns: Sequence[str]
+    ) -> ColumnElement[bool] | None:
+        """
+        WHERE clause matching `term` as a case-insensitive substring of any of the
+        given columns of `statement` (table columns or labels such as
+        'supplier_name'). Indexed columns are searched through the full-text
+        index (see db.search). Columns the statement does not select are
+        ignored; returns None when none is left.
+        """
+        return db_search.search_clause(
+            self.engine, statement, self.model.__tablename__, term, columns
+        )
+
+    def select_columns(self, *names: str) -> Select:
+        """Core SELECT of the given columns of the model's table (all columns by default)."""
+        table_columns = self.model.__table__.columns
+        if not names:
+            return sa_select(*table_columns)
+        return sa_select(*(table_columns[name] for name in names))
+
+    # --- Request scope (see repository.unit_of_work) ---
+
+    def _read(self, key: tuple, load: Callable[[], Any]) -> Any:
+        """Runs `load`, memoized in the current script run's scope when there is one."""
+        scope = current_scope()
+        if scope is None:
+            return load()
+        return scope.get_or_load((self.model.__tablename__, *key), load)
+
+    def _written(self) -> None:
+        """Drops what the current run has loaded, as a write may have changed it."""
+        scope = current_scope()
+        if scope is not None:
+            scope.clear()
+
+    def _filter_clauses(self, filters: dict[str, Any]) -> list[ColumnElement[bool]]:
+        """
+        Translates keyword filters into WHERE clauses for the repository's model.
+
+        A scalar value becomes `column = value`, None becomes `column IS NULL` and
+        any list, tuple or set becomes `column IN (...)`.
+        """
+        clauses: list[ColumnElement[bool]] = []
+        for field_name, value in filters.items():
+            column = getattr(self.model, field_name, None)
+            if column is None:
+                raise ValueError(
+                    f"{self.model.__name__} não possui o campo '{field_name}'."
+                )
+            if value is None:
+                clauses.append(column.is_(None))
+            elif isinstance(value, Collection) and not isinstance(value, (str, bytes)):
+                clauses.append(column.in_(list(value)))
+            else:
+                clauses.append(column == value)
+        return clauses
 
     @override
     def update(self, item_id: int, item_data: dict[str, Any]) -> T | None:
+        self._written()
         with Session(self.engine) as session:
             db_item = session.get(self.model, item_id)
             if db_item:
-                item_changed = False
-                for key, value in item_data.items():
-                    # Ensure not to update primary key or protected fields directly
-                    if key not in ["id", "created_at", "updated_at"] and hasattr(
-                        db_item, key
-                    ):
-                        if getattr(db_item, key) != value:
-                            setattr(db_item, key, value)
-                            item_changed = True
-                if item_changed:
-                    # Handle 'updated_at' if it's a model concern and not purely DB
-                    if hasattr(db_item, "updated_at"):
-                        from datetime import datetime  # Conditional import
-
-                        setattr(db_item, "updated_at", datetime.now())
+                if self._apply_changes(db_item, item_data):
                     session.add(db_item)
                     session.commit()
                     session.refresh(db_item)
             return db_item
 
+    def _apply_changes(self, db_item: T, item_data: dict[str, Any]) -> bool:
+        """Copies item_data onto db_item, returning True if any field changed."""
+        item_changed = False
+        for key, value in item_data.items():
+            # Ensure not to update primary key or protected fields directly
+            if key not in ["id", "created_at", "updated_at"] and hasattr(db_item, key):
+                if getattr(db_item, key) != value:
+                    setattr(db_item, key, value)
+                    item_changed = True
+        if item_changed:
+            # Handle 'updated_at' if it's a model concern and not purely DB
+            if hasattr(db_item, "updated_at"):
+                setattr(db_item, "updated_at", datetime.now())
+        return item_changed
+
     @override
     def delete(self, id: int) -> bool:
+        self._written()
         with Session(self.engine) as session:
             item_to_delete = session.get(self.model, id)
             if item_to_delete:
@@ -76,3 +321,157 @@ class SQLModelRepository[T: SQLModel](Repository[T]):
                 session.commit()
                 return True
             return False
+
+    # --- Bulk operations ---
+    # Each batch runs in a single transaction: rows are loaded with one SELECT ... IN,
+    # changed in memory and written in one flush, which the ORM sends as
+    # executemany batches. If the batch fails, it is replayed row by row inside
+    # savepoints (still one commit) so the rows that caused the failure can be reported.
+
+    @override
+    def add_many(self, items: list[T]) -> BulkResult:
+        def add_row(session: Session, index: int) -> None:
+            item = items[index]
+            if hasattr(item, "id"):  # Manage ID for new records
+                item.id = None
+            session.add(item)
+
+        self._written()
+        result = BulkResult()
+        with Session(self.engine, expire_on_commit=False) as session:
+            self._run_batch(session, list(range(len(items))), add_row, result)
+        return result
+
+    @override
+    def update_many(self, changes: dict[int, dict[str, Any]]) -> BulkResult:
+        self._written()
+        result = BulkResult()
+        changes = {int(item_id): data for item_id, data in changes.items()}  # numpy ids from DataFrames
+        with Session(self.engine, expire_on_commit=False) as session:
+            rows = self._preload(session, list(changes))
+            result.failed.update(self._missing(list(changes), rows))
+
+            def update_row(session: Session, item_id: int) -> None:
+                if self._apply_changes(rows[item_id], changes[item_id]):
+                    session.add(rows[item_id])
+
+            self._run_batch(session, [i for i in changes if i in rows], update_row, result)
+        return result
+
+    @override
+    def delete_many(self, ids: list[int]) -> BulkResult:
+        self._written()
+        result = BulkResult()
+        unique_ids = list(dict.fromkeys(int(item_id) for item_id in ids))
+        with Session(self.engine, expire_on_commit=False) as session:
+            rows = self._preload(session, unique_ids)
+            result.failed.update(self._missing(unique_ids, rows))
+
+            def delete_row(session: Session, item_id: int) -> None:
+                session.delete(rows[item_id])
+
+            self._run_batch(
+                session, [i for i in unique_ids if i in rows], delete_row, result
+            )
+        return result
+
+    # --- Derived tables ---
+    # Tables computed from other tables (e.g. item_price_summary) are written with
+    # Core statements: whole rows replaced by primary key, no ORM objects, and no
+    # write listeners (see repository.events) fired for them.
+
+    def replace_many(self, rows: list[dict[str, Any]], batch_size: int = 500) -> None:
+        """Deletes the rows with the same primary keys and inserts `rows`, in one transaction."""
+        if not rows:
+            return
+        self._written()
+        table = self.model.__table__
+        (key_column,) = table.primary_key.columns
+        with self.engine.begin() as connection:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start : start + batch_size]
+                keys = [row[key_column.name] for row in batch]
+                connection.execute(table.delete().where(key_column.in_(keys)))
+                connection.execute(table.insert(), batch)
+
+    def execute_write(self, statement: Any) -> int:
+        """Runs one Core INSERT/UPDATE/DELETE in its own transaction; returns the row count."""
+        self._written()
+        with self.engine.begin() as connection:
+            return connection.execute(statement).rowcount
+
+    def _preload(self, session: Session, ids: list[int]) -> dict[int, T]:
+        """Loads the given rows into the session with one query, keyed by id."""
+        if not ids:
+            return {}
+        statement = select(self.model).where(self.model.id.in_(ids))
+        return {row.id: row for row in session.exec(statement).all()}
+
+    def _missing(self, ids: list[int], rows: dict[int, T]) -> dict[int, str]:
+        return {
+            item_id: f"{self.model.__name__} ID {item_id} não encontrado(a)."
+            for item_id in ids
+            if item_id not in rows
+        }
+
+    def _run_batch(
+        self,
+        session: Session,
+        keys: list[int],
+        apply_row: Callable[[Session, int], None],
+        result: BulkResult,
+    ) -> None:
+        if not keys:
+            return
+        try:
+            for key in keys:
+                apply_row(session, key)
+            session.commit()
+            result.succeeded.extend(keys)
+            return
+        except Exception:
+            session.rollback()
+
+        # Fallback: isolate the failing rows, keeping the good ones in the same transaction
+        for key in keys:
+            try:
+                with session.begin_nested():
+                    apply_row(session, key)
+                result.succeeded.append(key)
+            except Exception as e:
+                # Report the driver's message (e.g. "UNIQUE constraint failed") without the SQL dump
+                result.failed[key] = str(getattr(e, "orig", None) or e)
+        session.commit()
+
+
+def _rows_to_frame(rows: Sequence[Any], names: list[str], sql_types: list[Any]) -> pd.DataFrame:
+    """Transposes result tuples into one typed array per column (see _column_array)."""
+    column_values = list(zip(*rows)) if rows else [() for _ in names]
+    return pd.DataFrame(
+        {
+            name: _column_array(values, sql_type)
+            for name, values, sql_type in zip(names, column_values, sql_types)
+        },
+        columns=names,
+    )
+
+
+def _column_array(values: tuple, sql_type: Any) -> Any:
+    """Converts one result column to an array with a dtype matching its SQL type."""
+    if isinstance(sql_type, Integer):
+        if any(value is None for value in values):
+            return pd.array(values, dtype="Int64")  # Nullable integer (e.g. bidder_id)
+        return pd.array(values, dtype="int64")
+    if isinstance(sql_type, Float):
+        return pd.array([pd.NA if v is None else v for v in values], dtype="Float64").to_numpy(
+            dtype="float64", na_value=float("nan")
+        )
+    if isinstance(sql_type, Numeric) and not sql_type.asdecimal:
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy()
+    if isinstance(sql_type, DateTime):
+        return pd.to_datetime(pd.Series(values, dtype=object), errors="coerce").to_numpy()
+    if isinstance(sql_type, Boolean):
+        return pd.array(values, dtype="boolean")
+    # Decimal (Numeric with asdecimal), strings and enums stay as Python objects
+    return pd.array(values, dtype=object)
+
@@ -0,0 +1,88 @@
+import logging
+from collections.abc import Callable, Collection, Iterator, Set
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+# --- Request-scoped unit of work ---
+# A scope lives for one Streamlit script run. Repository reads made inside it are
+# memoized: the first identical read goes to the database, later ones in the same
+# run get the already-loaded objects. Any write through a repository clears the
+# scope, since it may also change other tables (cascades, SET NULL).
+# The scope is stored in a ContextVar, so each session's script thread sees its own.
+
+
+@dataclass
+class RequestScope:
+    name: str = "run"
+    entries: dict[tuple, Any] = field(default_factory=dict)
+    queries: int = 0  # Statements sent to the database during the scope
+    reused: int = 0  # Reads answered from the scope
+
+    def get_or_load(self, key: tuple, load: Callable[[], Any]) -> Any:
+        if key in self.entries:
+            self.reused += 1
+            return self.entries[key]
+        value = self.entries[key] = load()
+        return value
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+_current_scope: ContextVar[RequestScope | None] = ContextVar(
+    "bidtrack_request_scope", default=None
+)
+
+
+def current_scope() -> RequestScope | None:
+    """The unit of work of the current script run, or None outside `request_scope`."""
+    return _current_scope.get()
+
+
+@contextmanager
+def request_scope(name: str = "run") -> Iterator[RequestScope]:
+    """
+    Opens a unit of work for one script run and logs its query count on exit.
+
+    Nested calls reuse the outer scope.
+    """
+    outer = _current_scope.get()
+    if outer is not None:
+        yield outer
+        return
+    scope = RequestScope(name=name)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        logger.info(
+            "%s: %d consultas ao banco, %d leituras reaproveitadas",
+            scope.name,
+            scope.queries,
+            scope.reused,
+        )
+
+
+def freeze(value: Any) -> Any:
+    """Hashable form of filter values and query parameters, for use in keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, Set):
+        return frozenset(freeze(item) for item in value)
+    # Lists and tuples keep their order and duplicates (e.g. column lists)
+    if isinstance(value, Collection) and not isinstance(value, (str, bytes)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.queries += 1
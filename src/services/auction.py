@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+# --- Live auction (pregão) bid ladder ---
+# During a live session bids arrive every few seconds. The ladder keeps the item's
+# bid history in memory (loaded once from the database), so recording a bid is an
+# append plus one INSERT, and the chart gets one new point instead of being
+# rebuilt from a fresh query.
+
+NO_BIDDER_NAME = "Nenhum Licitante"
+
+
+@dataclass
+class BidLadder:
+    item_id: int
+    bidding_id: int
+    # Bid history in arrival order, one list per column
+    created_at: list[datetime] = field(default_factory=list)
+    prices: list[float] = field(default_factory=list)
+    bidder_names: list[str] = field(default_factory=list)
+    # Bidder name -> (lowest price, when it was offered)
+    best_by_bidder: dict[str, tuple[float, datetime]] = field(default_factory=dict)
+
+    @classmethod
+    def from_frame(cls, item_id: int, bidding_id: int, bids_df: pd.DataFrame) -> "BidLadder":
+        """Builds the ladder from a `bids_with_names` frame of the item."""
+        ladder = cls(item_id=item_id, bidding_id=bidding_id)
+        if len(bids_df) == 0:
+            return ladder
+        ordered = bids_df.sort_values(["created_at", "id"], kind="stable")
+        names = ordered["bidder_name"].astype(object).where(
+            ordered["bidder_name"].notna(), NO_BIDDER_NAME
+        )
+        for created_at, price, name in zip(
+            ordered["created_at"].tolist(),
+            ordered["price"].astype(float).tolist(),
+            names.tolist(),
+        ):
+            ladder.record(price, name, created_at)
+        return ladder
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def record(self, price: float, bidder_name: str | None, created_at: datetime) -> None:
+        """Appends one bid to the history and updates the bidder's best price."""
+        name = bidder_name or NO_BIDDER_NAME
+        self.created_at.append(created_at)
+        self.prices.append(price)
+        self.bidder_names.append(name)
+        best = self.best_by_bidder.get(name)
+        if best is None or price < best[0]:
+            self.best_by_bidder[name] = (price, created_at)
+
+    @property
+    def lowest_price(self) -> float | None:
+        if not self.best_by_bidder:
+            return None
+        return min(price for price, _ in self.best_by_bidder.values())
+
+    def ranking(self) -> pd.DataFrame:
+        """Best price per bidder, lowest first (ties: who offered it first)."""
+        rows = sorted(
+            (price, created_at, name)
+            for name, (price, created_at) in self.best_by_bidder.items()
+        )
+        return pd.DataFrame(
+            {
+                "Posição": range(1, len(rows) + 1),
+                "Licitante": [name for _, _, name in rows],
+                "Melhor Lance (R$)": [price for price, _, _ in rows],
+                "Momento": [created_at for _, created_at, _ in rows],
+            }
+        )
+
+    def last_bids(self, count: int = 10) -> pd.DataFrame:
+        """The most recent bids, newest first."""
+        start = max(len(self) - count, 0)
+        return pd.DataFrame(
+            {
+                "Momento": self.created_at[start:][::-1],
+                "Licitante": self.bidder_names[start:][::-1],
+                "Lance (R$)": self.prices[start:][::-1],
+            }
+        )
+
+
+def create_ladder_figure(ladder: BidLadder, min_quote_price: float | None) -> go.Figure:
+    """Bid evolution with one trace per bidder, to be extended with `add_ladder_point`."""
+    points: dict[str, tuple[list[Any], list[float]]] = {}
+    for created_at, price, name in zip(ladder.created_at, ladder.prices, ladder.bidder_names):
+        xs, ys = points.setdefault(name, ([], []))
+        xs.append(created_at)
+        ys.append(price)
+    # numpy arrays: datetimes in lists/tuples make the chart's JSON ~15x slower
+    fig = go.Figure(
+        [
+            go.Scatter(
+                x=np.array(xs, dtype="datetime64[ms]"),
+                y=np.array(ys, dtype="float64"),
+                name=name,
+                mode="lines+markers",
+            )
+            for name, (xs, ys) in points.items()
+        ]
+    )
+    fig.update_layout(
+        title="Evolução dos Lances",
+        xaxis_title="Momento do Lance",
+        yaxis_title="Preço do Lance (R$)",
+        legend_title_text="Licitantes",
+        dragmode="pan",
+        uirevision=ladder.item_id,  # Keep zoom/pan while points are added
+    )
+    if min_quote_price is not None:
+        fig.add_hline(
+            y=min_quote_price,
+            line_dash="dash",
+            line_color="red",
+            annotation_text=f"Menor Orçamento: R${min_quote_price:,.2f}",
+            annotation_position="bottom right",
+            annotation_font_size=10,
+            annotation_font_color="red",
+        )
+    return fig
+
+
+def add_ladder_point(
+    fig: go.Figure, bidder_name: str | None, created_at: datetime, price: float
+) -> None:
+    """Appends one bid to its bidder's trace (a new trace for a bidder's first bid)."""
+    name = bidder_name or NO_BIDDER_NAME
+    for trace in fig.data:
+        if trace.name == name:
+            trace.x = np.append(trace.x, np.datetime64(created_at, "ms"))
+            trace.y = np.append(trace.y, float(price))
+            return
+    fig.add_trace(
+        go.Scatter(
+            x=np.array([created_at], dtype="datetime64[ms]"),
+            y=np.array([price], dtype="float64"),
+            name=name,
+            mode="lines+markers",
+        )
+    )
@@ -1,5 +1,5 @@
 import pandas as pd
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
 from db.models import (
     Quote,
     Bid,
@@ -7,26 +7,32 @@ from db.models import (
     Bidder,
     Item,  # Added Item for get_quotes_dataframe
 )
+from services.pricing import PRICE_INPUT_COLUMNS, calculate_prices
 
 
 def get_quotes_dataframe(
-    quotes_list: list[Quote],
-    suppliers_list: list[Supplier],
-    items_list: list[Item],  # Added items_list
+    quotes_list: list[Quote] | pd.DataFrame,
+    suppliers_list: list[Supplier] | None = None,
+    items_list: list[Item] | None = None,
 ) -> pd.DataFrame:
     """
     Creates and preprocesses a DataFrame for quotes.
 
     Args:
-        quotes_list: A list of Quote objects.
+        quotes_list: A list of Quote objects, or a DataFrame of quote rows as
+            returned by `SQLModelRepository.fetch_frame` (used as is).
         suppliers_list: A list of Supplier objects.
         items_list: A list of Item objects.
 
+    When quotes_list is a DataFrame that already has 'supplier_name'/'item_name'
+    (see `repository.queries.quotes_with_names`), those names are kept and the
+    corresponding list is not needed.
+
     Returns:
         A pandas DataFrame with quote data, including supplier names, item names,
         calculated_price, and formatted dates.
     """
-    if not quotes_list:
+    if len(quotes_list) == 0:
         # Define columns based on expected output, including new ones
         return pd.DataFrame(
             columns=[
@@ -48,10 +54,17 @@ def get_quotes_dataframe(
             ]
         )
 
-    quotes_df = pd.DataFrame([q.model_dump() for q in quotes_list])
+    if isinstance(quotes_list, pd.DataFrame):
+        quotes_df = quotes_list.copy()
+    else:
+        quotes_df = pd.DataFrame([q.model_dump() for q in quotes_list])
 
-    # Map supplier names
-    if not quotes_df.empty and suppliers_list:
+    # Map supplier names (unless they were joined in SQL)
+    if "supplier_name" in quotes_df.columns:
+        quotes_df["supplier_name"] = quotes_df["supplier_name"].fillna(
+            "Fornecedor Desconhecido"
+        )
+    elif not quotes_df.empty and suppliers_list:
         supplier_map = {s.id: s.name for s in suppliers_list}
         quotes_df["supplier_name"] = (
             quotes_df["supplier_id"].map(supplier_map).fillna("Fornecedor Desconhecido")
@@ -59,8 +72,10 @@ def get_quotes_dataframe(
     elif not quotes_df.empty:
         quotes_df["supplier_name"] = "Fornecedor Desconhecido"
 
-    # Map item names
-    if not quotes_df.empty and items_list:
+    # Map item names (unless they were joined in SQL)
+    if "item_name" in quotes_df.columns:
+        quotes_df["item_name"] = quotes_df["item_name"].fillna("Item Desconhecido")
+    elif not quotes_df.empty and items_list:
         item_map = {i.id: i.name for i in items_list}
         quotes_df["item_name"] = (
             quotes_df["item_id"].map(item_map).fillna("Item Desconhecido")
@@ -78,40 +93,18 @@ def get_quotes_dataframe(
             quotes_df["updated_at"], errors="coerce"
         ).dt.tz_localize(None)
 
-    # Calculate 'calculated_price' using Decimal for precision
-    # Ensure necessary columns are present and are of Decimal type for calculation
-    cols_for_calc = ["price", "freight", "additional_costs", "taxes", "margin"]
-    for col in cols_for_calc:
+    # Pricing columns keep the types loaded from the database; missing columns and
+    # empty cells count as zero
+    for col in PRICE_INPUT_COLUMNS:
         if col not in quotes_df.columns:
             quotes_df[col] = Decimal("0.0")  # Add column if missing, initialize to 0
+        elif quotes_df[col].dtype == object:
+            quotes_df[col] = quotes_df[col].fillna(Decimal("0.0"))
         else:
-            # Convert to Decimal, handling potential errors from various input types
-            def to_decimal_safe(value):
-                if isinstance(value, Decimal):
-                    return value
-                if value is None:
-                    return Decimal("0.0")
-                try:
-                    return Decimal(str(value))
-                except (InvalidOperation, TypeError, ValueError):
-                    return Decimal("NaN")  # Use NaN for values that cannot be converted
-
-            quotes_df[col] = quotes_df[col].apply(to_decimal_safe)
-            # Replace NaN with 0 for calculation, or decide how to handle rows with bad data
-            quotes_df[col] = quotes_df[col].replace(Decimal("NaN"), Decimal("0.0"))
+            quotes_df[col] = quotes_df[col].fillna(0.0)
 
-    # Calculation logic from ui/quote_tab_content.py (assumed correct)
-    base_price = quotes_df["price"]
-    freight = quotes_df["freight"]
-    additional_costs = quotes_df["additional_costs"]
-    taxes_percentage = quotes_df["taxes"]
-    margin_percentage = quotes_df["margin"]
-
-    price_with_freight_costs = base_price + freight + additional_costs
-    taxes_value = price_with_freight_costs * (taxes_percentage / Decimal(100))
-    price_before_margin = price_with_freight_costs + taxes_value
-    margin_value = price_before_margin * (margin_percentage / Decimal(100))
-    quotes_df["calculated_price"] = price_before_margin + margin_value
+    # Vectorized fixed-point price engine (see services/pricing.py)
+    quotes_df["calculated_price"] = calculate_prices(quotes_df)
 
     # Define all columns expected by the UI or for general use
     # This ensures consistency in column order and presence.
@@ -157,22 +150,27 @@ def get_quotes_dataframe(
 
 
 def get_bids_dataframe(
-    bids_list: list[Bid],
-    bidders_list: list[Bidder],
-    items_list: list[Item],  # Added items_list
+    bids_list: list[Bid] | pd.DataFrame,
+    bidders_list: list[Bidder] | None = None,
+    items_list: list[Item] | None = None,
 ) -> pd.DataFrame:
     """
     Creates and preprocesses a DataFrame for bids.
 
     Args:
-        bids_list: A list of Bid objects.
+        bids_list: A list of Bid objects, or a DataFrame of bid rows as
+            returned by `SQLModelRepository.fetch_frame` (used as is).
         bidders_list: A list of Bidder objects.
         items_list: A list of Item objects.
 
+    When bids_list is a DataFrame that already has 'bidder_name'/'item_name'
+    (see `repository.queries.bids_with_names`), those names are kept and the
+    corresponding list is not needed.
+
     Returns:
         A pandas DataFrame with bid data, including bidder names, item names, and formatted dates.
     """
-    if not bids_list:
+    if len(bids_list) == 0:
         return pd.DataFrame(
             columns=[
                 "id",
@@ -188,24 +186,28 @@ def get_bids_dataframe(
             ]
         )
 
-    bids_df = pd.DataFrame([b.model_dump() for b in bids_list])
+    if isinstance(bids_list, pd.DataFrame):
+        bids_df = bids_list.copy()
+    else:
+        bids_df = pd.DataFrame([b.model_dump() for b in bids_list])
 
-    # Map bidder names
-    if not bids_df.empty and bidders_list:
+    # Map bidder names (unless they were joined in SQL)
+    if "bidder_name" in bids_df.columns:
+        bids_df["bidder_name"] = bids_df["bidder_name"].fillna("Licitante Desconhecido")
+    elif not bids_df.empty and bidders_list:
         bidder_map = {b.id: b.name for b in bidders_list}
-        bids_df["bidder_name"] = bids_df["bidder_id"].map(bidder_map)
-        # Handle cases where bidder_id might be None or not in map
-        bids_df["bidder_name"] = bids_df.apply(
-            lambda row: "Licitante Desconhecido"
-            if pd.isna(row["bidder_id"])
-            else bidder_map.get(row["bidder_id"], "Licitante Desconhecido"),
-            axis=1,
+        # Null bidder_id (bid without bidder) and ids missing from the map both
+        # map to NaN and get the same fallback label
+        bids_df["bidder_name"] = (
+            bids_df["bidder_id"].map(bidder_map).fillna("Licitante Desconhecido")
         )
     elif not bids_df.empty:
         bids_df["bidder_name"] = "Licitante Desconhecido"
 
-    # Map item names
-    if not bids_df.empty and items_list:
+    # Map item names (unless they were joined in SQL)
+    if "item_name" in bids_df.columns:
+        bids_df["item_name"] = bids_df["item_name"].fillna("Item Desconhecido")
+    elif not bids_df.empty and items_list:
         item_map = {i.id: i.name for i in items_list}
         bids_df["item_name"] = (
             bids_df["item_id"].map(item_map).fillna("Item Desconhecido")
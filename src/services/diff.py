@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+# --- Diff engine for edited tables ---
+# Compares the frame shown in st.data_editor with what the editor returned,
+# column by column instead of cell by cell, and turns the changed cells into the
+# `{id: {field: new_value}}` payload accepted by `repository.update_many`.
+
+
+@dataclass
+class ChangeSet:
+    mask: pd.DataFrame  # Changed cells: bool frame indexed by id, one column per compared column
+    changes: dict[int, dict[str, Any]] = field(default_factory=dict)  # id -> update payload
+    errors: dict[int, str] = field(default_factory=dict)  # id -> why the row was left out
+
+    @property
+    def changed_ids(self) -> list[int]:
+        """Ids with at least one changed cell (before conversions and validation)."""
+        return self.mask.index[self.mask.any(axis=1)].tolist()
+
+
+def align_frames(
+    original: pd.DataFrame, edited: pd.DataFrame
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Indexes both frames by id and keeps the ids present in both, in edited order.
+
+    `original` may hold 'id' as a column or as its index. Without an 'id' column,
+    edited rows are matched to original rows by position. Rows the editor added
+    (no id yet) are left out: they are not updates.
+    """
+    if "id" in original.columns:
+        original = original.set_index("id")
+    if "id" in edited.columns:
+        edited = edited[edited["id"].notna()].set_index("id")
+    else:
+        edited = edited.iloc[: len(original)].set_axis(original.index[: len(edited)])
+    original.index = original.index.astype("int64")
+    edited.index = edited.index.astype("int64")
+    edited = edited[edited.index.isin(original.index)]
+    return original.loc[edited.index], edited
+
+
+def changed_cells(
+    original: pd.DataFrame, edited: pd.DataFrame, columns: list[str]
+) -> pd.DataFrame:
+    """
+    Boolean mask of the cells of `columns` that differ, for frames aligned by id.
+
+    Empty cells (None, NaN, NaT, pd.NA) are equal to each other; an empty cell
+    and a filled one differ.
+    """
+    compared = [col for col in columns if col in original.columns and col in edited.columns]
+    return pd.DataFrame(
+        {col: _column_changed(original[col], edited[col]) for col in compared},
+        index=edited.index,
+        columns=compared,
+        dtype=bool,
+    )
+
+
+def _column_changed(original: pd.Series, edited: pd.Series) -> np.ndarray:
+    """Dtype-aware inequality of two aligned columns."""
+    original_na = original.isna().to_numpy()
+    edited_na = edited.isna().to_numpy()
+    changed = original_na != edited_na
+    both = ~original_na & ~edited_na
+    if not both.any():
+        return changed
+    left, right = original[both], edited[both]
+
+    if pd.api.types.is_datetime64_any_dtype(left) or pd.api.types.is_datetime64_any_dtype(right):
+        left_ts = _naive_datetimes(left)
+        right_ts = _naive_datetimes(right)
+        differs = (left_ts != right_ts).to_numpy()
+    elif pd.api.types.is_numeric_dtype(left) and pd.api.types.is_numeric_dtype(right):
+        differs = left.to_numpy(dtype="float64") != right.to_numpy(dtype="float64")
+    else:
+        left_values = left.to_numpy(dtype=object)
+        right_values = right.to_numpy(dtype=object)
+        differs = np.asarray(left_values != right_values, dtype=bool)
+        # Cells that are not identical may still hold the same number in two types
+        # (Decimal('10.50000') vs 10.5); only those few are compared in Python
+        for position in np.flatnonzero(differs):
+            differs[position] = _values_differ(left_values[position], right_values[position])
+
+    changed[both] = differs
+    return changed
+
+
+def _naive_datetimes(values: pd.Series) -> pd.Series:
+    converted = pd.to_datetime(values, errors="coerce")
+    if getattr(converted.dt, "tz", None) is not None:
+        converted = converted.dt.tz_localize(None)
+    return converted
+
+
+def _values_differ(original: Any, edited: Any) -> bool:
+    numeric_types = (int, float, Decimal, np.number)
+    if isinstance(original, numeric_types) and isinstance(edited, numeric_types):
+        try:
+            return Decimal(str(original)) != Decimal(str(edited))
+        except InvalidOperation:
+            return True
+    if isinstance(original, pd.Timestamp) or isinstance(edited, pd.Timestamp):
+        try:
+            return _naive_timestamp(original) != _naive_timestamp(edited)
+        except (TypeError, ValueError):
+            return True
+    return True  # Already known to be unequal
+
+
+def _naive_timestamp(value: Any) -> pd.Timestamp:
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize(None) if timestamp.tzinfo else timestamp
+
+
+def build_change_set(
+    original: pd.DataFrame,
+    edited: pd.DataFrame,
+    editable_columns: list[str],
+    required_fields: list[str] | None = None,
+    decimal_fields: list[str] | None = None,
+    special_conversions: dict | None = None,
+    fields_to_remove: list[str] | None = None,
+) -> ChangeSet:
+    """
+    Diffs the edited table against the original and builds the update payload.
+
+    For each row with changed cells, the changed values go through the same
+    steps the management tabs rely on:
+    1. `special_conversions`: {editor column: {"target_field", "conversion_func"}}
+       renames the field and converts the value;
+    2. `required_fields` (target names) must not be empty when they changed;
+    3. `decimal_fields` (target names) are converted to Decimal ('' -> None);
+    4. `fields_to_remove` (and id/created_at/updated_at) are dropped.
+    A row failing a step is reported in `errors` and left out of `changes`.
+    """
+    required_fields = required_fields or []
+    decimal_fields = decimal_fields or []
+    special_conversions = special_conversions or {}
+    removed = {"id", "created_at", "updated_at", *(fields_to_remove or [])}
+
+    original, edited = align_frames(original, edited)
+    mask = changed_cells(original, edited, editable_columns)
+    change_set = ChangeSet(mask=mask)
+    if mask.empty:
+        return change_set
+
+    rows, cols = np.nonzero(mask.to_numpy())
+    edited_values = edited[mask.columns]
+    raw_changes: dict[int, dict[str, Any]] = {}
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        entity_id = int(mask.index[row])
+        column = mask.columns[col]
+        raw_changes.setdefault(entity_id, {})[column] = _to_python(
+            edited_values.iat[row, col]
+        )
+
+    for entity_id, row_changes in raw_changes.items():
+        try:
+            payload = _convert_row(
+                row_changes, required_fields, decimal_fields, special_conversions
+            )
+        except ValueError as e:
+            change_set.errors[entity_id] = str(e)
+            continue
+        for name in removed:
+            payload.pop(name, None)
+        if payload:
+            change_set.changes[entity_id] = payload
+    return change_set
+
+
+def _convert_row(
+    row_changes: dict[str, Any],
+    required_fields: list[str],
+    decimal_fields: list[str],
+    special_conversions: dict,
+) -> dict[str, Any]:
+    payload: dict[str, Any] = {}
+    editor_column_of: dict[str, str] = {}
+    for column, value in row_changes.items():
+        target = column
+        if column in special_conversions:
+            conversion = special_conversions[column]
+            target = conversion["target_field"]
+            try:
+                value = conversion["conversion_func"](value)
+            except Exception as e:
+                raise ValueError(
+                    f"Erro ao converter '{column}' ('{value}') para '{target}': {e}."
+                ) from e
+        payload[target] = value
+        editor_column_of[target] = column
+
+    for target in required_fields:
+        if target in payload:
+            value = payload[target]
+            if value is None or (isinstance(value, str) and not value.strip()):
+                raise ValueError(
+                    f"Campo obrigatório '{editor_column_of[target]}' (destino: '{target}') "
+                    "está vazio ou inválido. Alterações não salvas para esta linha."
+                )
+
+    for target in decimal_fields:
+        value = payload.get(target)
+        if target in payload and value is not None and not isinstance(value, Decimal):
+            text = str(value).strip()
+            try:
+                payload[target] = Decimal(text) if text else None  # '' clears the field
+            except InvalidOperation as e:
+                raise ValueError(
+                    f"Valor inválido para campo decimal '{editor_column_of[target]}' "
+                    f"('{value}'): {e}. Alterações não salvas para esta linha."
+                ) from e
+    return payload
+
+
+def _to_python(value: Any) -> Any:
+    """Editor cell -> value for the model: empty cells become None, numpy scalars Python."""
+    if value is None or (not isinstance(value, (list, tuple, dict)) and pd.isna(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -0,0 +1,169 @@
+import codecs
+import importlib.util
+import tempfile
+from collections.abc import Iterator
+from typing import IO, Any
+import numpy as np
+import pandas as pd
+
+from repository.queries import bidding_export_rows
+from services.pricing import calculate_prices
+
+# --- Export of a whole bidding (quotes and bids) to CSV/XLSX ---
+# One UNION ALL query returns every quote and bid of the bidding with its item.
+# The rows are streamed in chunks of `chunk_size` (server-side cursor), the
+# calculated price is computed per chunk with the pricing engine and each chunk
+# is written to the output right away, so memory is bounded by the chunk size and
+# not by the number of quotes. The output is a spooled temporary file that moves
+# to disk once it grows past SPOOL_MAX_SIZE.
+
+CHUNK_SIZE = 5000
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+QUOTE_RECORD = "Orçamento"
+EXPORT_FORMATS = ["csv", "xlsx"]
+EXPORT_MIME_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Query/engine column -> exported header, in export order
+EXPORT_COLUMNS = {
+    "record_type": "Tipo",
+    "item_code": "Código do Item",
+    "item_name": "Item",
+    "item_unit": "Unidade",
+    "item_quantity": "Quantidade",
+    "party_name": "Fornecedor/Licitante",
+    "price": "Preço (R$)",
+    "freight": "Frete (R$)",
+    "additional_costs": "Custos Adicionais (R$)",
+    "taxes": "Impostos (%)",
+    "margin": "Margem (%)",
+    "calculated_price": "Preço Calculado (R$)",
+    "notes": "Observações",
+    "link": "Link",
+    "created_at": "Data",
+}
+_NUMERIC_COLUMNS = [
+    "item_quantity",
+    "price",
+    "freight",
+    "additional_costs",
+    "taxes",
+    "margin",
+    "calculated_price",
+]
+
+
+class ExportError(RuntimeError):
+    """The export cannot be produced (e.g. a missing optional dependency)."""
+
+
+def available_formats() -> list[str]:
+    """Export formats usable in this environment (XLSX needs openpyxl)."""
+    if importlib.util.find_spec("openpyxl") is None:
+        return ["csv"]
+    return list(EXPORT_FORMATS)
+
+
+def iter_export_chunks(
+    quote_repo, bidding_id: int, chunk_size: int = CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields the bidding's quotes and bids in chunks, with the exported headers.
+
+    Each item's quotes come first, cheapest calculated price first, then its
+    bids from the lowest price (see `bidding_export_rows`).
+
+    Quotes get their 'calculated_price' from the pricing engine (the same values
+    shown in the quotes table); bids leave it, and the other quote-only
+    columns, empty.
+    """
+    for chunk in quote_repo.iter_frames(bidding_export_rows(bidding_id), chunk_size):
+        is_quote = (chunk["record_type"] == QUOTE_RECORD).to_numpy()
+        calculated = pd.Series(None, index=chunk.index, dtype=object)
+        if is_quote.any():
+            calculated[is_quote] = calculate_prices(chunk[is_quote])
+        chunk["calculated_price"] = calculated
+        for col in _NUMERIC_COLUMNS:
+            # Decimal objects/None -> float64/NaN, so both writers see plain numbers
+            chunk[col] = chunk[col].to_numpy(dtype="float64", na_value=np.nan)
+        chunk["created_at"] = chunk["created_at"].dt.floor("s")
+        yield chunk[list(EXPORT_COLUMNS)].rename(columns=EXPORT_COLUMNS)
+
+
+def write_csv(chunks: Iterator[pd.DataFrame], output: IO[bytes]) -> int:
+    """
+    Writes the chunks as one CSV in the format Excel opens in Portuguese.
+
+    ';' separator, ',' decimals, ISO dates and UTF-8 with BOM. Returns the rows
+    written.
+    """
+    rows = 0
+    output.write(codecs.BOM_UTF8)
+    header = True
+    for chunk in chunks:
+        chunk = chunk.copy()
+        for col in chunk.select_dtypes("float64").columns:
+            # Much faster than to_csv(decimal=","), which formats cell by cell
+            chunk[col] = (
+                chunk[col].astype(str).str.replace(".", ",", regex=False).where(chunk[col].notna(), "")
+            )
+        output.write(chunk.to_csv(sep=";", index=False, header=header).encode("utf-8"))
+        header = False
+        rows += len(chunk)
+    if header:  # No rows: still write the header
+        output.write(
+            pd.DataFrame(columns=list(EXPORT_COLUMNS.values()))
+            .to_csv(sep=";", index=False)
+            .encode("utf-8")
+        )
+    return rows
+
+
+def write_xlsx(chunks: Iterator[pd.DataFrame], output: IO[bytes]) -> int:
+    """Writes the chunks to one worksheet, row by row (openpyxl write-only mode)."""
+    try:
+        from openpyxl import Workbook  # Optional: only needed for XLSX files
+    except ImportError as e:
+        raise ExportError(
+            "A exportação em XLSX requer o pacote 'openpyxl' (pip install openpyxl)."
+        ) from e
+
+    # write_only streams rows to a temporary file instead of keeping cell objects
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Licitação")
+    sheet.append(list(EXPORT_COLUMNS.values()))
+    rows = 0
+    for chunk in chunks:
+        # NaN/NaT -> None (empty cell); datetimes as Python objects
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+        rows += len(chunk)
+    workbook.save(output)
+    return rows
+
+
+def export_bidding(
+    quote_repo, bidding_id: int, file_format: str, chunk_size: int = CHUNK_SIZE
+) -> IO[bytes]:
+    """
+    Exports the bidding's quotes and bids to a 'csv' or 'xlsx' file.
+
+    Returns a temporary file positioned at its start; the caller closes it.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ExportError(f"Formato não suportado: '{file_format}'. Use CSV ou XLSX.")
+    output: Any = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+b")
+    try:
+        chunks = iter_export_chunks(quote_repo, bidding_id, chunk_size)
+        if file_format == "csv":
+            write_csv(chunks, output)
+        else:
+            write_xlsx(chunks, output)
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return output
@@ -0,0 +1,344 @@
+import csv
+import io
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import IO, Any
+import pandas as pd
+
+from db.keys import normalize_name
+from db.models import Item
+
+# --- Bulk import of edital items (CSV/XLSX) ---
+# Files are read in chunks of `chunk_size` rows, so memory stays bounded by the
+# chunk size whatever the file size (50k-row editais included). Each chunk is
+# mapped to Item fields, validated with column-wise operations and, unless it is a
+# dry run, inserted with one `add_many` transaction.
+
+CHUNK_SIZE = 1000
+PREVIEW_ROWS = 20
+MAX_REPORTED_ERRORS = 1000  # Further errors are only counted
+
+IMPORT_FIELDS = ["code", "name", "desc", "unit", "quantity", "notes"]
+REQUIRED_IMPORT_FIELDS = ["code", "name", "unit", "quantity"]
+
+# Item field -> accepted headers (compared without accents, case or extra spaces)
+ITEM_COLUMN_ALIASES: dict[str, list[str]] = {
+    "code": ["code", "codigo", "cod", "codigo do item", "item", "numero do item", "n item", "no item"],
+    "name": ["name", "nome", "nome do item", "produto", "objeto", "denominacao"],
+    "desc": ["desc", "descricao", "descricao detalhada", "especificacao", "detalhamento"],
+    "unit": ["unit", "unidade", "un", "und", "unid", "unidade de medida", "unidade de fornecimento"],
+    "quantity": ["quantity", "quantidade", "qtd", "qtde", "quant", "quantidade total"],
+    "notes": ["notes", "observacoes", "observacao", "obs", "notas"],
+}
+
+FIELD_LABELS = {
+    "code": "código",
+    "name": "nome",
+    "desc": "descrição",
+    "unit": "unidade",
+    "quantity": "quantidade",
+    "notes": "observações",
+}
+
+
+class ImportFileError(ValueError):
+    """The file cannot be imported at all (unknown format, missing columns...)."""
+
+
+@dataclass
+class RowError:
+    row: int  # Line/row number in the file, header included (as shown by spreadsheet apps)
+    message: str
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    rows_valid: int = 0
+    rows_imported: int = 0
+    error_count: int = 0
+    errors: list[RowError] = field(default_factory=list)  # First MAX_REPORTED_ERRORS
+    preview: pd.DataFrame = field(default_factory=pd.DataFrame)  # First valid rows
+    column_mapping: dict[str, str] = field(default_factory=dict)  # File header -> field
+
+    def add_error(self, row: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(row, message))
+
+    def errors_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {"Linha": [e.row for e in self.errors], "Erro": [e.message for e in self.errors]}
+        )
+
+
+def match_headers(headers: list[Any], aliases: dict[str, list[str]]) -> dict[str, str]:
+    """File header -> field, for the headers matching an alias (first match per field)."""
+    alias_to_field = {
+        normalize_name(alias): field_name
+        for field_name, field_aliases in aliases.items()
+        for alias in field_aliases
+    }
+    mapping: dict[str, str] = {}
+    for header in headers:
+        field_name = alias_to_field.get(normalize_name(header))
+        if field_name is not None and field_name not in mapping.values():
+            mapping[str(header)] = field_name
+    return mapping
+
+
+def map_columns(headers: list[Any]) -> dict[str, str]:
+    """
+    Maps the file headers to Item fields (file header -> field).
+
+    When there is no name column, the description column is used as the name.
+    Raises ImportFileError when a required field has no column.
+    """
+    mapping = match_headers(headers, ITEM_COLUMN_ALIASES)
+    if "name" not in mapping.values() and "desc" in mapping.values():
+        desc_header = next(h for h, f in mapping.items() if f == "desc")
+        mapping[desc_header] = "name"
+    missing = [f for f in REQUIRED_IMPORT_FIELDS if f not in mapping.values()]
+    if missing:
+        raise ImportFileError(
+            "Coluna(s) obrigatória(s) não encontrada(s): "
+            + ", ".join(FIELD_LABELS[f] for f in missing)
+            + ". Cabeçalhos lidos: "
+            + ", ".join(str(h) for h in headers)
+        )
+    return mapping
+
+
+def read_table_chunks(
+    file: IO[bytes], file_name: str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields the rows of a CSV or XLSX file in chunks, indexed by their row number.
+
+    The first (non-empty) row is the header. CSV cells are read as text; XLSX
+    cells keep their type (numbers stay numbers).
+    """
+    extension = file_name.rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        yield from _read_csv_chunks(file, chunk_size)
+    elif extension == "xlsx":
+        yield from _read_xlsx_chunks(file, chunk_size)
+    else:
+        raise ImportFileError(f"Formato não suportado: '.{extension}'. Use CSV ou XLSX.")
+
+
+def _read_csv_chunks(file: IO[bytes], chunk_size: int) -> Iterator[pd.DataFrame]:
+    sample = file.read(64 * 1024)
+    file.seek(0)
+    try:
+        # A sample cut in the middle of a character still decodes up to it
+        text_sample = sample.decode("utf-8-sig", errors="strict") if sample else ""
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError as e:
+        if e.start < len(sample) - 3:
+            text_sample = sample.decode("latin-1")
+            encoding = "latin-1"  # Spreadsheets exported by Excel in Portuguese
+        else:
+            text_sample = sample[: e.start].decode("utf-8-sig")
+            encoding = "utf-8-sig"
+    lines = text_sample.split("\n")
+    # Blank lines before the header are skipped; the ones after it are kept so
+    # every row gets the number of its line in the file
+    leading_blank = next((i for i, line in enumerate(lines) if line.strip("\r")), 0)
+    try:
+        separator = csv.Sniffer().sniff(lines[leading_blank], ";,\t|").delimiter
+    except csv.Error:
+        separator = ";" if text_sample.count(";") > text_sample.count(",") else ","
+
+    text_file = io.TextIOWrapper(file, encoding=encoding, newline="")
+    reader = pd.read_csv(
+        text_file,
+        sep=separator,
+        dtype=str,
+        keep_default_na=False,
+        skip_blank_lines=False,
+        skiprows=leading_blank,
+        chunksize=chunk_size,
+    )
+    first_row = leading_blank + 2  # The line after the header
+    try:
+        for chunk in reader:
+            chunk.index = pd.RangeIndex(first_row, first_row + len(chunk))
+            first_row += len(chunk)
+            blank = (chunk.fillna("") == "").all(axis=1)
+            if not blank.all():
+                yield chunk[~blank]  # Blank rows are skipped, like in XLSX files
+    finally:
+        reader.close()
+        text_file.detach()  # Leave the caller's file open
+
+
+def _read_xlsx_chunks(file: IO[bytes], chunk_size: int) -> Iterator[pd.DataFrame]:
+    try:
+        from openpyxl import load_workbook  # Optional: only needed for XLSX files
+    except ImportError as e:
+        raise ImportFileError(
+            "A importação de arquivos XLSX requer o pacote 'openpyxl' (pip install openpyxl)."
+        ) from e
+
+    # read_only streams the sheet row by row instead of loading it whole
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers: list[Any] | None = None
+        row_number = 0
+        for row in rows:
+            row_number += 1
+            if any(cell not in (None, "") for cell in row):
+                headers = [str(cell) if cell is not None else "" for cell in row]
+                break
+        if headers is None:
+            return
+
+        buffer: list[tuple] = []
+        row_numbers: list[int] = []
+        for row in rows:
+            row_number += 1
+            if not any(cell not in (None, "") for cell in row):
+                continue  # Blank rows are skipped, keeping the numbering of the others
+            buffer.append(tuple(row[: len(headers)]) + (None,) * (len(headers) - len(row)))
+            row_numbers.append(row_number)
+            if len(buffer) == chunk_size:
+                yield pd.DataFrame(buffer, columns=headers, index=row_numbers, dtype=object)
+                buffer, row_numbers = [], []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=headers, index=row_numbers, dtype=object)
+    finally:
+        workbook.close()
+
+
+def parse_numbers(values: pd.Series) -> pd.Series:
+    """
+    Numbers written as '1.234,56', '1234.56' or '10' -> float (NaN when invalid).
+
+    XLSX cells may already hold numbers, possibly mixed with text in one column.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    text = values.astype("string").str.strip()
+    decimal_comma = text.str.contains(",", regex=False, na=False)
+    text = text.mask(
+        decimal_comma, text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    )
+    return pd.to_numeric(text, errors="coerce").astype("float64")
+
+
+def validate_chunk(
+    chunk: pd.DataFrame,
+    mapping: dict[str, str],
+    taken_codes: set[str],
+    report: ImportReport,
+) -> pd.DataFrame:
+    """
+    Returns the valid rows of a chunk as Item fields; invalid rows go to the report.
+
+    The chunk is indexed by file row number (see `read_table_chunks`), which is
+    kept in the 'row' column of the result.
+
+    `taken_codes` holds the codes already in the bidding or earlier in the file,
+    and is updated with the codes of the valid rows.
+    """
+    rows = pd.DataFrame(index=chunk.index)
+    for header, field_name in mapping.items():
+        rows[field_name] = chunk[header]
+    for field_name in IMPORT_FIELDS:
+        if field_name not in rows.columns:
+            rows[field_name] = None
+
+    text_fields = ["code", "name", "desc", "unit", "notes"]
+    for field_name in text_fields:
+        values = rows[field_name].astype("string").str.strip()
+        values = values.str.replace(r"\.0$", "", regex=True) if field_name == "code" else values
+        rows[field_name] = values.mask(values == "")  # Empty cells -> NA
+
+    quantity_text = rows["quantity"]
+    quantity_given = quantity_text.astype("string").str.strip().fillna("") != ""
+    rows["quantity"] = parse_numbers(quantity_text)
+    problems: dict[str, pd.Series] = {
+        "código vazio": rows["code"].isna(),
+        "nome vazio": rows["name"].isna(),
+        "unidade vazia": rows["unit"].isna(),
+        "quantidade vazia": ~quantity_given,
+        "quantidade inválida": quantity_given & rows["quantity"].isna(),
+        "quantidade negativa": rows["quantity"] < 0,
+    }
+    duplicated_in_chunk = rows["code"].duplicated(keep="first") & rows["code"].notna()
+    # Set lookups: Series.isin would rebuild an array of all the codes for every chunk
+    already_taken = pd.Series(
+        [code in taken_codes for code in rows["code"].tolist()], index=rows.index
+    )
+    problems["código repetido"] = duplicated_in_chunk | already_taken
+
+    problems = {message: flags.fillna(False).astype(bool) for message, flags in problems.items()}
+    invalid = pd.Series(False, index=rows.index)
+    for flags in problems.values():
+        invalid |= flags
+
+    for index in rows.index[invalid]:
+        messages = [message for message, flags in problems.items() if flags.at[index]]
+        if "quantidade inválida" in messages:
+            messages[messages.index("quantidade inválida")] = (
+                f"quantidade inválida ('{quantity_text.at[index]}')"
+            )
+        if "código repetido" in messages:
+            messages[messages.index("código repetido")] = (
+                f"código '{rows.at[index, 'code']}' repetido no arquivo ou já cadastrado na licitação"
+            )
+        report.add_error(int(index), "; ".join(messages))
+
+    valid = rows.loc[~invalid, IMPORT_FIELDS].copy()
+    valid.insert(0, "row", valid.index)
+    taken_codes.update(valid["code"].tolist())
+    return valid
+
+
+def import_items(
+    file: IO[bytes],
+    file_name: str,
+    bidding_id: int,
+    item_repo,
+    dry_run: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+) -> ImportReport:
+    """
+    Validates (and, unless `dry_run`, inserts) the items of a CSV/XLSX file into a bidding.
+
+    Each chunk is inserted in its own transaction; rows rejected by the database
+    are reported with their row number and do not affect the rest of the chunk.
+    Raises ImportFileError when the file itself cannot be read.
+    """
+    report = ImportReport()
+    taken_codes = {
+        item.code for item in item_repo.find_by(bidding_id=bidding_id) if item.code
+    }
+    mapping: dict[str, str] | None = None
+    for chunk in read_table_chunks(file, file_name, chunk_size):
+        if mapping is None:
+            mapping = map_columns(list(chunk.columns))
+            report.column_mapping = mapping
+        report.rows_read += len(chunk)
+        valid = validate_chunk(chunk, mapping, taken_codes, report)
+        report.rows_valid += len(valid)
+        if len(report.preview) < PREVIEW_ROWS and len(valid) > 0:
+            report.preview = pd.concat(
+                [report.preview, valid.head(PREVIEW_ROWS - len(report.preview))],
+                ignore_index=True,
+            )
+        if dry_run or len(valid) == 0:
+            continue
+
+        records = valid.astype(object).where(valid.notna(), None).to_dict("records")
+        items = [
+            Item(bidding_id=bidding_id, **{f: record[f] for f in IMPORT_FIELDS})
+            for record in records
+        ]
+        result = item_repo.add_many(items)
+        report.rows_imported += len(result.succeeded)
+        for index, error in result.failed.items():
+            report.add_error(int(records[index]["row"]), f"Erro ao gravar: {error}")
+    return report
@@ -1,6 +1,96 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+
+from repository.events import WrittenRows, add_write_listener
+
+# --- Figure cache ---
+# Building a Plotly Express figure takes 50-100 ms, and the item charts are rebuilt
+# on every rerun of the item panel even when nothing changed. Figures are kept in a
+# process-wide LRU keyed by the data they show: (kind, item_id, latest updated_at,
+# row count, min quote price). Writes to the item's quotes or bids (and renames of
+# suppliers/bidders, which label the bars and lines) drop the affected entries
+# through the repository write listeners.
+# The cache holds each figure's JSON, shared by every session, and every hit
+# rebuilds a new go.Figure from it (~25 ms): callers may change what they get.
+
+FIGURE_CACHE_SIZE = int(os.getenv("FIGURE_CACHE_SIZE", "128"))
+
+_figure_cache: OrderedDict[tuple, str] = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+# --- Large bid histories ---
+# Above WEBGL_MIN_BIDS bids the bids chart is drawn with WebGL (Scattergl) instead
+# of SVG, and each bidder's series is reduced to MAX_POINTS_PER_BIDDER points with
+# LTTB (Largest-Triangle-Three-Buckets), which keeps the visual shape of the line.
+# A bidder's lowest and last bids are always kept: they are what the chart is read for.
+
+WEBGL_MIN_BIDS = 1000
+MAX_POINTS_PER_BIDDER = 500
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Positions of the points LTTB keeps out of the series (x ascending).
+
+    The first and last points are kept; every bucket in between contributes the
+    point forming the largest triangle with the previously kept point and the
+    average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = x.astype("float64")
+    y = y.astype("float64")
+    # Bucket boundaries over the points between the first and the last one
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Average point of every bucket, plus the final point as the last "bucket"
+    counts = np.diff(np.append(edges, n))
+    mean_x = (np.add.reduceat(x, edges) / counts).tolist()
+    mean_y = (np.add.reduceat(y, edges) / counts).tolist()
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_x, next_y = mean_x[bucket + 1], mean_y[bucket + 1]
+        prev_x, prev_y = x[previous], y[previous]
+        areas = np.abs(
+            (prev_x - next_x) * (y[start:end] - prev_y)
+            - (prev_x - x[start:end]) * (next_y - prev_y)
+        )
+        previous = start + int(areas.argmax())
+        kept[bucket + 1] = previous
+    return kept
+
+
+def downsample_bids(
+    bids_df: pd.DataFrame, max_points: int = MAX_POINTS_PER_BIDDER
+) -> pd.DataFrame:
+    """
+    Reduces each bidder's bids (sorted by created_at) to about `max_points` with LTTB.
+
+    Each bidder's lowest and last bids are always kept.
+    """
+    times = bids_df["created_at"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    prices = bids_df["price"].to_numpy(dtype="float64")
+    kept_positions: list[np.ndarray] = []
+    for group in bids_df.groupby("bidder_name", sort=False, dropna=False).indices.values():
+        if len(group) <= max_points:
+            kept_positions.append(group)
+            continue
+        group_prices = prices[group]
+        kept = lttb_indices(times[group], group_prices, max_points)
+        kept = np.union1d(kept, [int(np.argmin(group_prices)), len(group) - 1])
+        kept_positions.append(group[kept])
+    return bids_df.iloc[np.sort(np.concatenate(kept_positions))]
 
 
 # --- Funções Auxiliares para Gráficos ---
@@ -44,6 +134,10 @@ def create_bids_figure(
             if len(bids_df_display) > 1
             else bids_df_display
         )
+        total_bids = len(b_df_sorted)
+        use_webgl = total_bids > WEBGL_MIN_BIDS
+        if use_webgl:
+            b_df_sorted = downsample_bids(b_df_sorted)
         fig = px.line(
             b_df_sorted,
             x="created_at",  # English column name
@@ -56,7 +150,22 @@ def create_bids_figure(
                 "bidder_name": "Licitante",
             },
             markers=True,
+            render_mode="webgl" if use_webgl else "svg",
         )
+        if len(b_df_sorted) < total_bids:
+            fig.add_annotation(
+                text=f"Exibindo {len(b_df_sorted)} de {total_bids} lances (amostragem); "
+                "menor e último lance de cada licitante preservados",
+                xref="paper",
+                yref="paper",
+                x=0,
+                y=1.02,
+                xanchor="left",
+                yanchor="bottom",
+                showarrow=False,
+                font_size=10,
+                font_color="gray",
+            )
     else:
         fig = px.bar(
             bids_df_display,
@@ -86,3 +195,115 @@ def create_bids_figure(
             annotation_font_color="red",
         )
     return fig
+
+
+def create_price_history_figure(
+    summary_df: pd.DataFrame, current_item_id: int | None = None
+) -> go.Figure:
+    """
+    Lowest quote (calculated price) and winning bid of each item of a product
+    group over time; one point per bidding (see summarize_price_history).
+    """
+    fig = go.Figure()
+    hover_labels = summary_df["bidding_label"]
+    series = [
+        ("min_quote_price", "best_supplier", "Menor Orçamento", "Fornecedor"),
+        ("winning_bid", "winner", "Lance Vencedor", "Licitante"),
+    ]
+    for price_col, party_col, name, party_label in series:
+        points = summary_df[summary_df[price_col].notna()]
+        fig.add_trace(
+            go.Scatter(
+                x=points["reference_date"],
+                y=points[price_col],
+                name=name,
+                mode="lines+markers",
+                customdata=np.column_stack(
+                    [hover_labels[points.index], points[party_col].fillna("—")]
+                )
+                if len(points) > 0
+                else None,
+                hovertemplate=f"%{{customdata[0]}}<br>{name}: R$ %{{y:,.2f}}"
+                f"<br>{party_label}: %{{customdata[1]}}<extra></extra>",
+            )
+        )
+    if current_item_id is not None:
+        current = summary_df[summary_df["item_id"] == current_item_id]
+        if len(current) > 0 and pd.notna(current["reference_date"].iloc[0]):
+            fig.add_vline(
+                x=pd.Timestamp(current["reference_date"].iloc[0]).to_pydatetime(),
+                line_dash="dot",
+                line_color="gray",
+            )
+    fig.update_layout(
+        title="Histórico de Preços do Produto",
+        xaxis_title="Data da Licitação",
+        yaxis_title="Preço (R$)",
+        legend_title_text="",
+        dragmode="pan",
+        hovermode="closest",
+    )
+    return fig
+
+
+def _data_version(df: pd.DataFrame) -> tuple:
+    """(latest updated_at, row count) of a quotes/bids frame."""
+    if "updated_at" not in df.columns or df.empty:
+        return (None, len(df))
+    return (pd.Timestamp(df["updated_at"].max()), len(df))
+
+
+def _cached_figure(key: tuple, build: Callable[[], go.Figure]) -> go.Figure:
+    with _figure_cache_lock:
+        fig_json = _figure_cache.get(key)
+        if fig_json is not None:
+            _figure_cache.move_to_end(key)
+    if fig_json is not None:
+        return pio.from_json(fig_json)
+    fig = build()
+    fig_json = fig.to_json()
+    with _figure_cache_lock:
+        _figure_cache[key] = fig_json
+        _figure_cache.move_to_end(key)
+        while len(_figure_cache) > FIGURE_CACHE_SIZE:
+            _figure_cache.popitem(last=False)
+    return fig
+
+
+def cached_quotes_figure(item_id: int, quotes_df_display: pd.DataFrame) -> go.Figure:
+    """create_quotes_figure, reused while the item's quotes are unchanged."""
+    key = ("quotes", item_id, *_data_version(quotes_df_display), None)
+    return _cached_figure(key, lambda: create_quotes_figure(quotes_df_display))
+
+
+def cached_bids_figure(
+    item_id: int, bids_df_display: pd.DataFrame, min_quote_price: float | None
+) -> go.Figure:
+    """create_bids_figure, reused while the item's bids and min quote are unchanged."""
+    key = ("bids", item_id, *_data_version(bids_df_display), min_quote_price)
+    return _cached_figure(
+        key, lambda: create_bids_figure(bids_df_display, min_quote_price)
+    )
+
+
+def invalidate_figures(kind: str | None = None, item_ids: set[Any] | None = None) -> None:
+    """Drops cached figures of a kind ('quotes'/'bids', all by default) and items (all by default)."""
+    with _figure_cache_lock:
+        for key in list(_figure_cache):
+            if (kind is None or key[0] == kind) and (item_ids is None or key[1] in item_ids):
+                del _figure_cache[key]
+
+
+def _on_item_rows_written(kind: str) -> Callable[[WrittenRows], None]:
+    def listener(written: WrittenRows) -> None:
+        item_ids = written.values("item_id")
+        # A row without its item_id loaded could belong to any item
+        invalidate_figures(kind, None if None in item_ids else item_ids)
+
+    return listener
+
+
+add_write_listener("quote", _on_item_rows_written("quotes"))
+add_write_listener("bid", _on_item_rows_written("bids"))
+add_write_listener("supplier", lambda written: invalidate_figures("quotes"))
+add_write_listener("bidder", lambda written: invalidate_figures("bids"))
@@ -0,0 +1,117 @@
+from typing import Any
+import numpy as np
+import pandas as pd
+
+from db.keys import normalize_code, normalize_name
+from repository.queries import price_history_rows
+from services.pricing import calculate_prices
+
+# --- Price history of a product across biddings ---
+# Item.code is not unique: the same product shows up in many biddings, each time
+# as a new item row. Items are grouped by the matching keys stored on them
+# (Item.code_key/name_key, see db/keys.py), which are indexed, so the quotes and
+# bids of a whole group come from one query instead of a scan of every item name.
+
+QUOTE_RECORD = "Orçamento"
+BID_RECORD = "Lance"
+
+# Group by -> label shown in the UI
+MATCH_MODES = {
+    "both": "Código ou nome",
+    "code": "Código",
+    "name": "Nome",
+}
+
+
+def group_keys(item: Any, match: str = "both") -> tuple[str | None, str | None]:
+    """(code_key, name_key) that define the item's group; None for a key not used."""
+    if match not in MATCH_MODES:
+        raise ValueError(f"Agrupamento não suportado: '{match}'.")
+    code_key = (normalize_code(item.code) or None) if match in ("both", "code") else None
+    name_key = (normalize_name(item.name) or None) if match in ("both", "name") else None
+    return code_key, name_key
+
+
+def load_price_history(quote_repo, item: Any, match: str = "both") -> pd.DataFrame:
+    """
+    Every quote and bid of the items grouped with `item` (the item included).
+
+    One row per quote/bid (see `price_history_rows`), plus 'calculated_price'
+    for quotes (pricing engine; NaN for bids) and 'reference_date': the
+    bidding's date, or the quote/bid's own date for biddings without one.
+    """
+    code_key, name_key = group_keys(item, match)
+    history = quote_repo.fetch_frame(price_history_rows(code_key, name_key))
+    is_quote = (history["record_type"] == QUOTE_RECORD).to_numpy()
+    calculated = pd.Series(np.nan, index=history.index, dtype="float64")
+    if is_quote.any():
+        calculated[is_quote] = calculate_prices(history[is_quote]).astype("float64")
+    history["calculated_price"] = calculated
+    history["price"] = history["price"].to_numpy(dtype="float64", na_value=np.nan)
+    # Bidding dates may be stored with a time zone; compare them as naive datetimes
+    bidding_dates = pd.to_datetime(history["bidding_date"], errors="coerce", utc=True)
+    history["reference_date"] = bidding_dates.dt.tz_localize(None).fillna(
+        pd.to_datetime(history["created_at"], errors="coerce")
+    )
+    return history
+
+
+def summarize_price_history(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per item of the group, ordered by reference date.
+
+    Columns: item_id, bidding_id, reference_date, bidding_label, quote_count,
+    min_quote_price (calculated) and best_supplier, bid_count, winning_bid (the
+    lowest bid) and winner.
+    """
+    columns = [
+        "item_id",
+        "bidding_id",
+        "reference_date",
+        "bidding_label",
+        "quote_count",
+        "min_quote_price",
+        "best_supplier",
+        "bid_count",
+        "winning_bid",
+        "winner",
+    ]
+    if history.empty:
+        return pd.DataFrame(columns=columns)
+
+    items = history.groupby("item_id", sort=False).agg(
+        bidding_id=("bidding_id", "first"),
+        reference_date=("reference_date", "min"),
+        bidding_city=("bidding_city", "first"),
+        bidding_process_number=("bidding_process_number", "first"),
+    )
+    items["bidding_label"] = (
+        items["bidding_city"].fillna("") + " - " + items["bidding_process_number"].fillna("")
+    )
+
+    def lowest(records: pd.DataFrame, price_column: str, prefix: str) -> pd.DataFrame:
+        # Lowest record per item (ties: the oldest), with the count of records
+        ordered = records.sort_values(["item_id", price_column, "created_at"])
+        first = ordered.drop_duplicates("item_id").set_index("item_id")
+        return pd.DataFrame(
+            {
+                f"{prefix}_count": records.groupby("item_id").size(),
+                f"{prefix}_price": first[price_column],
+                f"{prefix}_party": first["party_name"],
+            }
+        )
+
+    quotes = lowest(history[history["record_type"] == QUOTE_RECORD], "calculated_price", "quote")
+    bids = lowest(history[history["record_type"] == BID_RECORD], "price", "bid")
+    summary = items.join(quotes).join(bids).reset_index()
+    summary = summary.rename(
+        columns={
+            "quote_price": "min_quote_price",
+            "quote_party": "best_supplier",
+            "bid_price": "winning_bid",
+            "bid_party": "winner",
+        }
+    )
+    for col in ("quote_count", "bid_count"):
+        summary[col] = summary[col].fillna(0).astype("int64")
+    return summary.sort_values(["reference_date", "item_id"], ignore_index=True)[columns]
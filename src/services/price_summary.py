@@ -0,0 +1,249 @@
+from collections.abc import Collection
+from datetime import datetime
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any
+import pandas as pd
+from sqlalchemy import Engine, case, or_, select
+
+from db.models import Bid, Item, ItemPriceSummary, Quote
+from repository.events import WrittenRows, add_write_listener
+from repository.queries import price_summaries_with_names
+from repository.sqlmodel import SQLModelRepository
+from services.pricing import PRICE_INPUT_COLUMNS, calculate_prices
+
+# --- Per-item price summary (item_price_summary table) ---
+# The main view and the management tabs show, per item, the min/avg/max calculated
+# quote price, the best supplier, the lowest bid, the bid count, the leading bidder
+# and the last bid time. Instead of aggregating the raw quotes and bids on every
+# render, they read one summary row per item, maintained on each write:
+#   - new bids (the live auction case) update the row in place with one UPDATE
+#     that compares the bid with the stored lowest bid;
+#   - other quote/bid writes recompute the rows of the items they touched;
+#   - deleting a supplier or bidder (which cascades to quotes/bids in the
+#     database) drops every row;
+#   - deleting an item or a bidding drops the rows of its items through ON
+#     DELETE CASCADE (SQLite enforces it because db/database.py turns foreign
+#     keys on); the delete listener also prunes rows left without an item.
+# Items without a row are summarized when first read.
+
+REFRESH_BATCH_SIZE = 500
+_AVG_QUANTUM = Decimal("0.0001")
+
+
+class PriceSummaryStore:
+    """Reads and maintains item_price_summary rows of one database."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.summary_repo = SQLModelRepository(ItemPriceSummary, engine_instance=engine)
+        self.quote_repo = SQLModelRepository(Quote, engine_instance=engine)
+        self.bid_repo = SQLModelRepository(Bid, engine_instance=engine)
+
+    def frame(self, item_ids: Collection[int]) -> pd.DataFrame:
+        """
+        Summaries of the given items, with best_supplier_name/leading_bidder_name.
+
+        Rows missing from the table are computed and stored first.
+        """
+        item_ids = {int(item_id) for item_id in item_ids}
+        if not item_ids:
+            return self.summary_repo.fetch_frame(price_summaries_with_names([]))
+        summaries = self.summary_repo.fetch_frame(price_summaries_with_names(item_ids))
+        missing = item_ids - set(summaries["item_id"].tolist())
+        if missing:
+            self.refresh(missing)
+            summaries = self.summary_repo.fetch_frame(price_summaries_with_names(item_ids))
+        return summaries
+
+    def get(self, item_id: int) -> pd.Series | None:
+        """Summary of one item (see `frame`), or None if the item does not exist."""
+        summaries = self.frame([item_id])
+        return summaries.iloc[0] if len(summaries) > 0 else None
+
+    def refresh(self, item_ids: Collection[int]) -> None:
+        """Recomputes the summaries of the given items from their quotes and bids."""
+        item_ids = sorted(int(item_id) for item_id in item_ids)
+        for start in range(0, len(item_ids), REFRESH_BATCH_SIZE):
+            batch = item_ids[start : start + REFRESH_BATCH_SIZE]
+            self.summary_repo.replace_many(self.compute(batch))
+
+    def compute(self, item_ids: list[int]) -> list[dict[str, Any]]:
+        """Summary rows of the given items (zero counts for items without quotes/bids)."""
+        quotes = self.quote_repo.fetch_frame(
+            self.quote_repo.select_columns("id", "item_id", "supplier_id", *PRICE_INPUT_COLUMNS)
+            .where(Quote.item_id.in_(item_ids))
+            .order_by(Quote.id)
+        )
+        bids = self.bid_repo.fetch_frame(
+            self.bid_repo.select_columns("id", "item_id", "bidder_id", "price", "created_at")
+            .where(Bid.item_id.in_(item_ids))
+        )
+        now = datetime.now()
+        rows = {
+            item_id: {
+                "item_id": item_id,
+                "quote_count": 0,
+                "min_quote_price": None,
+                "avg_quote_price": None,
+                "max_quote_price": None,
+                "best_supplier_id": None,
+                "bid_count": 0,
+                "lowest_bid_price": None,
+                "leading_bidder_id": None,
+                "last_bid_at": None,
+                "refreshed_at": now,
+            }
+            for item_id in item_ids
+        }
+
+        if len(quotes) > 0:
+            quotes["calculated_price"] = calculate_prices(quotes)
+            # Cheapest first; ties go to the oldest quote
+            quotes["sort_price"] = quotes["calculated_price"].astype("float64")
+            ordered = quotes.sort_values(["item_id", "sort_price", "id"], kind="stable")
+            grouped = ordered.groupby("item_id", sort=False)["calculated_price"]
+            counts, totals = grouped.size(), grouped.sum()
+            cheapest = ordered.drop_duplicates("item_id", keep="first").set_index("item_id")
+            priciest = ordered.drop_duplicates("item_id", keep="last").set_index("item_id")
+            for item_id, count in counts.items():
+                row = rows[int(item_id)]
+                row["quote_count"] = int(count)
+                row["min_quote_price"] = cheapest.at[item_id, "calculated_price"]
+                row["max_quote_price"] = priciest.at[item_id, "calculated_price"]
+                row["avg_quote_price"] = (totals[item_id] / count).quantize(
+                    _AVG_QUANTUM, rounding=ROUND_HALF_EVEN
+                )
+                row["best_supplier_id"] = int(cheapest.at[item_id, "supplier_id"])
+
+        if len(bids) > 0:
+            # Lowest first; ties go to the bidder who offered the price first
+            bids["sort_price"] = bids["price"].astype("float64")
+            ordered = bids.sort_values(["item_id", "sort_price", "created_at", "id"])
+            leaders = ordered.drop_duplicates("item_id", keep="first").set_index("item_id")
+            grouped = bids.groupby("item_id")
+            counts, last_bid_at = grouped.size(), grouped["created_at"].max()
+            for item_id, count in counts.items():
+                row = rows[int(item_id)]
+                leader_id = leaders.at[item_id, "bidder_id"]
+                row["bid_count"] = int(count)
+                row["lowest_bid_price"] = leaders.at[item_id, "price"]
+                row["leading_bidder_id"] = None if pd.isna(leader_id) else int(leader_id)
+                row["last_bid_at"] = (
+                    None if pd.isna(last_bid_at[item_id]) else last_bid_at[item_id].to_pydatetime()
+                )
+
+        return list(rows.values())
+
+    def record_bids(self, bids: list[dict[str, Any]]) -> None:
+        """
+        Applies newly inserted bids to the summaries of their items, in place.
+
+        One UPDATE per item compares the item's lowest new bid with the stored
+        lowest bid (SET expressions read the old row values, so concurrent
+        writers do not lose each other's counts). Items without a row are
+        recomputed.
+        """
+        by_item: dict[int, list[dict[str, Any]]] = {}
+        for bid in bids:
+            by_item.setdefault(int(bid["item_id"]), []).append(bid)
+
+        summary = ItemPriceSummary.__table__
+        missing: list[int] = []
+        for item_id, item_bids in by_item.items():
+            # Lowest of the new bids; ties go to the first one offered
+            best = min(
+                item_bids,
+                key=lambda bid: (Decimal(str(bid["price"])), bid.get("created_at") or datetime.max),
+            )
+            last_at = max(
+                (bid["created_at"] for bid in item_bids if bid.get("created_at") is not None),
+                default=None,
+            )
+            price = Decimal(str(best["price"]))
+            takes_lead = or_(
+                summary.c.lowest_bid_price.is_(None), summary.c.lowest_bid_price > price
+            )
+            values: dict[str, Any] = {
+                "bid_count": summary.c.bid_count + len(item_bids),
+                "lowest_bid_price": case((takes_lead, price), else_=summary.c.lowest_bid_price),
+                "leading_bidder_id": case(
+                    (takes_lead, best.get("bidder_id")), else_=summary.c.leading_bidder_id
+                ),
+                "refreshed_at": datetime.now(),
+            }
+            if last_at is not None:
+                values["last_bid_at"] = case(
+                    (
+                        or_(summary.c.last_bid_at.is_(None), summary.c.last_bid_at < last_at),
+                        last_at,
+                    ),
+                    else_=summary.c.last_bid_at,
+                )
+            updated = self.summary_repo.execute_write(
+                summary.update().where(summary.c.item_id == item_id).values(**values)
+            )
+            if updated == 0:
+                missing.append(item_id)
+        if missing:
+            self.refresh(missing)
+
+    def clear(self) -> None:
+        """Drops every summary row (they are recomputed when read)."""
+        self.summary_repo.execute_write(ItemPriceSummary.__table__.delete())
+
+    def drop_orphans(self) -> int:
+        """Drops the rows whose item no longer exists; returns how many."""
+        summary = ItemPriceSummary.__table__
+        return self.summary_repo.execute_write(
+            summary.delete().where(summary.c.item_id.not_in(select(Item.__table__.c.id)))
+        )
+
+
+# --- Write listeners (see repository.events) ---
+
+
+def _touched_items(written: WrittenRows) -> set[int] | None:
+    item_ids = written.values("item_id")
+    if None in item_ids:
+        return None  # A row without its item_id loaded could belong to any item
+    return {int(item_id) for item_id in item_ids}
+
+
+def _on_quotes_written(written: WrittenRows) -> None:
+    store = PriceSummaryStore(written.engine)
+    item_ids = _touched_items(written)
+    if item_ids is None:
+        store.clear()
+    else:
+        store.refresh(item_ids)
+
+
+def _on_bids_written(written: WrittenRows) -> None:
+    store = PriceSummaryStore(written.engine)
+    item_ids = _touched_items(written)
+    if item_ids is None:
+        store.clear()
+    elif written.updated or written.deleted:
+        store.refresh(item_ids)
+    else:
+        store.record_bids(written.inserted)
+
+
+def _on_parties_written(written: WrittenRows) -> None:
+    # Renames only change the joined names; deletes cascade to quotes/bids in SQL
+    if written.deleted:
+        PriceSummaryStore(written.engine).clear()
+
+
+def _on_items_written(written: WrittenRows) -> None:
+    # The cascade already removed the rows of deleted items; this catches rows
+    # left behind by connections without foreign keys enforced
+    if written.deleted:
+        PriceSummaryStore(written.engine).drop_orphans()
+
+
+add_write_listener("quote", _on_quotes_written)
+add_write_listener("bid", _on_bids_written)
+add_write_listener("supplier", _on_parties_written)
+add_write_listener("bidder", _on_parties_written)
+add_write_listener("item", _on_items_written)
+add_write_listener("bidding", _on_items_written)
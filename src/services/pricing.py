@@ -0,0 +1,276 @@
+import numpy as np
+import pandas as pd
+from decimal import Decimal, InvalidOperation
+from pandas.api.types import infer_dtype, is_bool_dtype, is_float_dtype, is_integer_dtype
+
+# --- Fixed-point pricing engine ---
+# Quote prices are computed on int64 arrays instead of Python Decimal objects.
+# Every input is scaled to an integer at the precision it is stored with:
+#   price, freight, additional_costs -> Numeric(20, 5)  -> units of 1e-5
+#   taxes (percent)                  -> Numeric(5, 2)   -> units of 1e-2 %
+#   margin (percent, float column)   -> up to 4 places  -> units of 1e-4 %
+#
+# With those scales the formula
+#   (price + freight + additional_costs) * (1 + taxes/100) * (1 + margin/100)
+# is an exact rational N / 10**15, which the engine computes with integer
+# arithmetic and converts to Decimal unrounded: the same value the Decimal
+# formula gives (that formula is exact too while the price stays below
+# 10**12, where every intermediate fits in Decimal's 28 digits). The exponent
+# of that Decimal is tracked per row from the inputs' own exponents, so the
+# result is digit for digit the one of the Decimal formula ('12.0' stays '12.0').
+# Rows whose inputs do not fit these scales, whose cells Decimal would read
+# differently (strings, booleans, ...), or whose intermediate products would
+# overflow int64, are computed with the Decimal formula instead.
+
+COST_SCALE = 5
+TAXES_SCALE = 2
+MARGIN_SCALE = 4
+UNIT_SCALE = COST_SCALE + 4 + 6  # N is in units of 10**-15
+
+PRICE_INPUT_COLUMNS = ["price", "freight", "additional_costs", "taxes", "margin"]
+
+_TAXES_ONE = 100 * 10**TAXES_SCALE  # 100% expressed in taxes units
+_MARGIN_ONE = 100 * 10**MARGIN_SCALE  # 100% expressed in margin units
+_HIGH_SCALE = 4  # N = high * 10**11 + low, high in units of 1e-4
+_DIVISOR = 10 ** (UNIT_SCALE - _HIGH_SCALE)  # 10**11
+_SPLIT = 10**6
+_INT64_SAFE = 2.0**62  # float bound that keeps int64 products away from overflow
+_FLOAT_DIGITS = 1e15  # float64 reads back any decimal of up to 15 digits
+_DECIMAL_EXACT = 1e12  # Below this the Decimal formula does not round (28 digits)
+_NUMERIC_KINDS = ("decimal", "floating", "integer", "mixed-integer-float", "empty")
+
+
+def to_decimal_safe(value) -> Decimal:
+    """Converts a cell to Decimal the way the quotes table always has (invalid -> NaN)."""
+    if isinstance(value, Decimal):
+        return value
+    if value is None:
+        return Decimal("0.0")
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, TypeError, ValueError):
+        return Decimal("NaN")  # Use NaN for values that cannot be converted
+
+
+def _decimal_input(value) -> Decimal:
+    converted = to_decimal_safe(value)
+    return Decimal("0.0") if converted.is_qnan() else converted
+
+
+def calculate_price_decimal(
+    price, freight, additional_costs, taxes, margin
+) -> Decimal:
+    """Reference quote price formula, evaluated with Decimal (unrounded)."""
+    price_with_freight_costs = (
+        _decimal_input(price) + _decimal_input(freight) + _decimal_input(additional_costs)
+    )
+    taxes_value = price_with_freight_costs * (_decimal_input(taxes) / Decimal(100))
+    price_before_margin = price_with_freight_costs + taxes_value
+    margin_value = price_before_margin * (_decimal_input(margin) / Decimal(100))
+    return price_before_margin + margin_value
+
+
+def _is_plain_number(value) -> bool:
+    return value is None or type(value) in (Decimal, float, int)
+
+
+def _reads_like_decimal(values: pd.Series) -> np.ndarray:
+    """Mask of the cells whose float64 value is the number `to_decimal_safe` reads."""
+    if values.dtype == object:
+        if infer_dtype(values, skipna=True) in _NUMERIC_KINDS:
+            return np.ones(len(values), dtype=bool)
+        return values.map(_is_plain_number).to_numpy(dtype=bool)
+    # str() of a bool is not a number, and of a float32 is its own shortest repr
+    plain = is_integer_dtype(values.dtype) or (
+        is_float_dtype(values.dtype) and values.dtype.itemsize == 8
+    )
+    return np.full(len(values), plain and not is_bool_dtype(values.dtype))
+
+
+def _trailing_zeros(values: np.ndarray, limit: int) -> np.ndarray:
+    """Trailing decimal zeros of non-zero int64 values, counted up to `limit`."""
+    zeros = np.zeros(len(values), dtype=np.int64)
+    for power in range(1, limit + 1):
+        zeros += (values != 0) & (values % 10**power == 0)
+    return zeros
+
+
+def _text_exponents(texts: np.ndarray) -> np.ndarray:
+    """Exponent of Decimal(text) for numeric strings (str() of Decimal, float or int)."""
+    dot = np.strings.find(texts, ".")
+    exponents = np.where(dot >= 0, dot + 1 - np.strings.str_len(texts), 0)
+    scientific = np.flatnonzero(
+        (np.strings.find(texts, "E") >= 0) | (np.strings.find(texts, "e") >= 0)
+    )
+    for position in scientific:  # '1E+2', '1e-05': rare, parsed one by one
+        try:
+            exponents[position] = Decimal(str(texts[position])).as_tuple().exponent
+        except InvalidOperation:
+            pass  # Not a number: the row is not exact anyway
+    return exponents
+
+
+def _decimal_exponents(values: pd.Series, units: np.ndarray, scale: int) -> np.ndarray:
+    """
+    Exponent of the Decimal the Decimal formula reads from each cell: str() of the
+    cell, Decimal("0.0") for empty cells. `units` are only used for float columns.
+    """
+    empty = values.isna().to_numpy(dtype=bool)
+    if values.dtype == object:
+        texts = np.array(["0.0" if na else str(v) for v, na in zip(values, empty)], dtype=str)
+        exponents = _text_exponents(texts)
+    elif is_integer_dtype(values.dtype):
+        exponents = np.zeros(len(values), dtype=np.int64)
+    else:
+        # repr() of a float holding units / 10**scale: its digits without trailing
+        # zeros, and at least one decimal place ('12.0', '0.0')
+        places = np.where(units == 0, 1, scale - _trailing_zeros(units, scale))
+        exponents = -np.maximum(places, 1)
+    return np.where(empty, -1, exponents).astype(np.int64)
+
+
+def _to_fixed(
+    values: pd.Series, scale: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scales a column to int64 units of 10**-scale.
+
+    Returns the units, a mask telling which rows were represented exactly, the
+    float values and the exponent of each cell as the Decimal formula reads it.
+    Empty or invalid cells count as zero, like in the Decimal formula.
+    """
+    try:
+        # Fast path: numeric or Decimal/None cells convert without parsing
+        floats = values.to_numpy(dtype="float64", na_value=np.nan)
+    except (TypeError, ValueError):
+        floats = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64")
+    finite = ~np.isinf(floats)  # Infinity is kept by the Decimal formula
+    negative_zero = (floats == 0) & np.signbit(floats)  # -0 changes the sign of zero results
+    floats = np.where(np.isfinite(floats), floats, 0.0)
+    scaled = np.rint(floats * 10.0**scale)
+    fits = np.abs(scaled) < _FLOAT_DIGITS
+    units = np.where(fits, scaled, 0.0).astype(np.int64)
+    exact = (
+        finite
+        & ~negative_zero
+        & fits
+        & (units / 10.0**scale == floats)
+        & _reads_like_decimal(values)
+    )
+    exponents = np.zeros(len(values), dtype=np.int64)
+    if exact.any():
+        exponents = _decimal_exponents(values, units, scale)
+        # More decimal places than the scale (e.g. Decimal('0.1000000000000000001'))
+        exact &= exponents >= -scale
+    return units, exact, floats, exponents
+
+
+def _percent_exponents(units: np.ndarray, exponents: np.ndarray, scale: int) -> np.ndarray:
+    """Exponent of `percent / Decimal(100)`: exact, with the fewest digits down to 2 more places."""
+    coefficients = units // 10 ** np.clip(exponents + scale, 0, None)
+    return np.where(
+        coefficients == 0, exponents, exponents - 2 + _trailing_zeros(coefficients, 2)
+    )
+
+
+def calculate_price_units(
+    price: pd.Series,
+    freight: pd.Series,
+    additional_costs: pd.Series,
+    taxes: pd.Series,
+    margin: pd.Series,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized quote price N in units of 10**-15, split as N = high * 10**11 + low.
+
+    Returns (high, low, exponent, exact); 0 <= low < 10**11 and `exponent` is the
+    exponent of the Decimal formula's result. Rows outside the `exact` mask must
+    be computed with `calculate_price_decimal`.
+    """
+    price_u, price_ok, price_f, price_e = _to_fixed(price, COST_SCALE)
+    freight_u, freight_ok, freight_f, freight_e = _to_fixed(freight, COST_SCALE)
+    costs_u, costs_ok, costs_f, costs_e = _to_fixed(additional_costs, COST_SCALE)
+    taxes_u, taxes_ok, taxes_f, taxes_e = _to_fixed(taxes, TAXES_SCALE)
+    margin_u, margin_ok, margin_f, margin_e = _to_fixed(margin, MARGIN_SCALE)
+
+    cost = price_u + freight_u + costs_u
+    taxes_factor = _TAXES_ONE + taxes_u
+    margin_factor = _MARGIN_ONE + margin_u
+
+    # Overflow guards, checked in float before doing the int64 products
+    x1_float = cost.astype("float64") * taxes_factor
+    hi_float = np.floor(x1_float / _SPLIT)
+    # Bounds every intermediate of the Decimal formula
+    magnitude = (
+        (np.abs(price_f) + np.abs(freight_f) + np.abs(costs_f))
+        * (1 + np.abs(taxes_f) / 100)
+        * (1 + np.abs(margin_f) / 100)
+    )
+    ok = (
+        price_ok
+        & freight_ok
+        & costs_ok
+        & taxes_ok
+        & margin_ok
+        & (np.abs(x1_float) < _INT64_SAFE)
+        & (np.abs(hi_float * margin_factor) < _INT64_SAFE)
+        & (np.abs(margin_factor) < 2.0**40)
+        & (magnitude < _DECIMAL_EXACT)
+    )
+    cost = np.where(ok, cost, 0)
+    taxes_factor = np.where(ok, taxes_factor, 0)
+    margin_factor = np.where(ok, margin_factor, 0)
+
+    # N = cost * taxes_factor * margin_factor does not fit in int64, so it is
+    # built from x1 = hi * 10**6 + lo and divided by 10**11 exactly.
+    x1 = cost * taxes_factor
+    hi, lo = np.divmod(x1, _SPLIT)
+    a = hi * margin_factor  # N = a * 10**6 + lo * margin_factor
+    qa, ra = np.divmod(a, _DIVISOR // _SPLIT)
+    q2, remainder = np.divmod(ra * _SPLIT + lo * margin_factor, _DIVISOR)
+
+    # Exponents of the Decimal formula's steps: sums keep the smallest exponent,
+    # products add them (every step is exact below _DECIMAL_EXACT)
+    with_costs = np.minimum(np.minimum(price_e, freight_e), costs_e)
+    before_margin = np.minimum(
+        with_costs, with_costs + _percent_exponents(taxes_u, taxes_e, TAXES_SCALE)
+    )
+    exponent = np.minimum(
+        before_margin, before_margin + _percent_exponents(margin_u, margin_e, MARGIN_SCALE)
+    )
+    return qa + q2, remainder, exponent, ok
+
+
+def _units_to_decimal(high: int, low: int, exponent: int) -> Decimal:
+    # N / 10**15 written with the Decimal formula's exponent (N is a multiple of it)
+    return Decimal((high * _DIVISOR + low) // 10 ** (UNIT_SCALE + exponent)).scaleb(exponent)
+
+
+def calculate_prices(quotes_df: pd.DataFrame) -> pd.Series:
+    """
+    Calculates 'calculated_price' for every row of a quotes DataFrame.
+
+    Missing pricing columns count as zero. The result holds the Decimal values
+    of the Decimal formula, digit for digit (same value and exponent); conversion
+    to Decimal happens only here, at the edge.
+    """
+    if quotes_df.empty:
+        return pd.Series([], index=quotes_df.index, dtype=object)
+
+    inputs = {
+        col: quotes_df[col]
+        if col in quotes_df.columns
+        else pd.Series(0.0, index=quotes_df.index)  # Read as Decimal("0.0")
+        for col in PRICE_INPUT_COLUMNS
+    }
+    high, low, exponent, exact = calculate_price_units(**inputs)
+
+    results = [
+        _units_to_decimal(h, l, e)
+        for h, l, e in zip(high.tolist(), low.tolist(), exponent.tolist())
+    ]
+    # Rows the fixed-point path could not represent fall back to the Decimal formula
+    for position in np.flatnonzero(~exact):
+        row = {col: inputs[col].iloc[position] for col in PRICE_INPUT_COLUMNS}
+        results[position] = calculate_price_decimal(**row)
+    return pd.Series(results, index=quotes_df.index, dtype=object)
@@ -0,0 +1,313 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import IO, Any
+import numpy as np
+import pandas as pd
+
+from db.keys import normalize_code, normalize_name
+from db.models import Item, Quote
+from repository.queries import quotes_with_names
+from services.item_import import (
+    CHUNK_SIZE,
+    ImportFileError,
+    RowError,
+    match_headers,
+    parse_numbers,
+    read_table_chunks,
+)
+
+# --- Bulk import of supplier price lists ---
+# Each price-list row is matched to an item of the chosen bidding by code, or by
+# normalized name when the code does not match, through an in-memory index built
+# once per import. Matched rows create the supplier's quote for the item, or update
+# it when the supplier already quoted that item. Rows that match no item (or more
+# than one, by name) go to a review queue, where they can be assigned by hand.
+
+MAX_REPORTED_ERRORS = 1000  # Further errors are only counted
+MAX_REVIEW_ROWS = 5000  # Further unmatched rows are only counted
+
+QUOTE_COLUMN_ALIASES: dict[str, list[str]] = {
+    "code": ["code", "codigo", "cod", "codigo do item", "item", "referencia", "ref", "sku"],
+    "name": ["name", "nome", "descricao", "produto", "item descricao", "especificacao"],
+    "price": ["price", "preco", "preco unitario", "valor", "valor unitario", "custo", "preco de custo"],
+    "freight": ["freight", "frete"],
+    "additional_costs": ["additional costs", "custos adicionais", "outros custos"],
+    "taxes": ["taxes", "impostos", "imposto"],
+    "notes": ["notes", "observacoes", "observacao", "obs", "notas"],
+    "link": ["link", "url", "site"],
+}
+QUOTE_DECIMAL_FIELDS = ["price", "freight", "additional_costs", "taxes"]
+QUOTE_TEXT_FIELDS = ["notes", "link"]
+
+MATCHED_BY_CODE = "código"
+MATCHED_BY_NAME = "nome"
+_AMBIGUOUS = -1  # Name index value for names shared by several items
+
+
+class ItemIndex:
+    """Items of one bidding, looked up by normalized code or normalized name."""
+
+    def __init__(self, items: list[Item]) -> None:
+        self.by_code: dict[str, int] = {}
+        self.by_name: dict[str, int] = {}
+        self.labels: dict[int, str] = {}
+        for item in items:
+            code_key = normalize_code(item.code)
+            if code_key:
+                self.by_code.setdefault(code_key, item.id)
+            name_key = normalize_name(item.name)
+            if name_key:
+                previous = self.by_name.get(name_key)
+                self.by_name[name_key] = item.id if previous in (None, item.id) else _AMBIGUOUS
+            self.labels[item.id] = f"{item.code} - {item.name}"
+
+    def match(self, codes: pd.Series, names: pd.Series) -> tuple[pd.Series, pd.Series]:
+        """
+        Item id (NA when unmatched) and how it was matched, for each row.
+
+        Codes are tried first; names only for the rows whose code did not match.
+        Rows whose name matches several items get NA and how == 'ambíguo'.
+        """
+        code_ids = pd.Series(_lookup(codes, normalize_code, self.by_code), index=codes.index)
+        item_ids = code_ids.astype("Int64")
+        how = pd.Series(np.where(code_ids.notna(), MATCHED_BY_CODE, None), index=codes.index)
+
+        unmatched = item_ids.isna()
+        if unmatched.any():
+            names = names[unmatched]
+            name_ids = pd.Series(_lookup(names, normalize_name, self.by_name), index=names.index)
+            ambiguous = name_ids == _AMBIGUOUS
+            found = name_ids.notna() & ~ambiguous
+            item_ids[found[found].index] = name_ids[found].astype("int64")
+            how[found[found].index] = MATCHED_BY_NAME
+            how[ambiguous[ambiguous].index] = "ambíguo"
+        return item_ids, how
+
+
+def _lookup(values: pd.Series, normalize, index: dict[str, int]) -> list[int | None]:
+    # A plain loop: Series.map on string arrays costs more than the lookups themselves
+    return [
+        index.get(normalize(value)) if isinstance(value, str) else None
+        for value in values.tolist()
+    ]
+
+
+@dataclass
+class QuoteImportReport:
+    rows_read: int = 0
+    matched_by_code: int = 0
+    matched_by_name: int = 0
+    created: int = 0  # In a dry run: quotes that would be created
+    updated: int = 0  # In a dry run: quotes that would be updated
+    error_count: int = 0
+    errors: list[RowError] = field(default_factory=list)  # First MAX_REPORTED_ERRORS
+    review_count: int = 0
+    review: list[dict[str, Any]] = field(default_factory=list)  # First MAX_REVIEW_ROWS
+    column_mapping: dict[str, str] = field(default_factory=dict)  # File header -> field
+
+    def add_error(self, row: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(row, message))
+
+    def errors_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {"Linha": [e.row for e in self.errors], "Erro": [e.message for e in self.errors]}
+        )
+
+    def review_frame(self) -> pd.DataFrame:
+        columns = ["row", "code", "name", *QUOTE_DECIMAL_FIELDS, *QUOTE_TEXT_FIELDS, "reason"]
+        return pd.DataFrame(self.review, columns=columns)
+
+
+class QuoteUpserter:
+    """
+    Creates or updates the quotes of one supplier for the items of one bidding.
+
+    The supplier's existing quotes are read once; when the supplier has several
+    quotes for an item, the most recent one is updated. An item appearing twice in
+    the same import is written once (first row) and the repeats are reported.
+    """
+
+    def __init__(self, quote_repo, bidding_id: int, supplier_id: int, default_margin: float) -> None:
+        self.quote_repo = quote_repo
+        self.supplier_id = supplier_id
+        self.default_margin = default_margin
+        existing = quote_repo.fetch_frame(
+            quotes_with_names(bidding_id=bidding_id, supplier_id=supplier_id)
+        )
+        # Ordered by id: later (more recent) quotes overwrite earlier ones
+        self.quote_by_item: dict[int, int] = dict(
+            zip(existing["item_id"].tolist(), existing["id"].tolist())
+        ) if len(existing) else {}
+        self.row_by_item: dict[int, int] = {}  # Item -> file row that set its quote
+
+    def write(self, rows: pd.DataFrame, report: QuoteImportReport, dry_run: bool) -> None:
+        """Writes matched rows ('row', 'item_id' and the quote fields) in one transaction per kind."""
+        new_quotes: list[Quote] = []
+        new_quote_rows: list[int] = []
+        updates: dict[int, dict[str, Any]] = {}
+        update_rows: dict[int, int] = {}
+        for record in rows.to_dict("records"):
+            row, item_id = int(record["row"]), int(record["item_id"])
+            if item_id in self.row_by_item:
+                report.add_error(
+                    row, f"item já recebeu o preço da linha {self.row_by_item[item_id]}"
+                )
+                continue
+            self.row_by_item[item_id] = row
+            values = _quote_values(record)
+            quote_id = self.quote_by_item.get(item_id)
+            if quote_id is None:
+                new_quotes.append(
+                    Quote(
+                        item_id=item_id,
+                        supplier_id=self.supplier_id,
+                        margin=self.default_margin,
+                        **values,
+                    )
+                )
+                new_quote_rows.append(row)
+            else:
+                updates[quote_id] = values
+                update_rows[quote_id] = row
+
+        if dry_run:
+            report.created += len(new_quotes)
+            report.updated += len(updates)
+            return
+        if new_quotes:
+            result = self.quote_repo.add_many(new_quotes)
+            report.created += len(result.succeeded)
+            for index in result.succeeded:
+                self.quote_by_item[new_quotes[index].item_id] = new_quotes[index].id
+            for index, error in result.failed.items():
+                report.add_error(new_quote_rows[index], f"Erro ao gravar: {error}")
+        if updates:
+            result = self.quote_repo.update_many(updates)
+            report.updated += len(result.succeeded)
+            for quote_id, error in result.failed.items():
+                report.add_error(update_rows[quote_id], f"Erro ao atualizar: {error}")
+
+
+def _quote_values(record: dict[str, Any]) -> dict[str, Any]:
+    """Quote fields given in the row (price always; the others only when filled)."""
+    values: dict[str, Any] = {}
+    for field_name in QUOTE_DECIMAL_FIELDS:
+        value = record.get(field_name)
+        if value is not None and not pd.isna(value):
+            values[field_name] = Decimal(str(round(float(value), 5)))
+    for field_name in QUOTE_TEXT_FIELDS:
+        value = record.get(field_name)
+        if value is not None and not pd.isna(value):
+            values[field_name] = value
+    return values
+
+
+def _prepare_chunk(
+    chunk: pd.DataFrame, mapping: dict[str, str], report: QuoteImportReport
+) -> pd.DataFrame:
+    """Price-list rows as quote fields; rows without a valid price go to the report."""
+    rows = pd.DataFrame(index=chunk.index)
+    for header, field_name in mapping.items():
+        rows[field_name] = chunk[header]
+    for field_name in ["code", "name", *QUOTE_DECIMAL_FIELDS, *QUOTE_TEXT_FIELDS]:
+        if field_name not in rows.columns:
+            rows[field_name] = None
+    for field_name in ["code", "name", *QUOTE_TEXT_FIELDS]:
+        values = rows[field_name].astype("string").str.strip()
+        values = values.str.replace(r"\.0$", "", regex=True) if field_name == "code" else values
+        rows[field_name] = values.mask(values == "")
+    raw_prices = rows["price"]
+    for field_name in QUOTE_DECIMAL_FIELDS:
+        rows[field_name] = parse_numbers(rows[field_name])
+
+    invalid_price = rows["price"].isna() | (rows["price"] <= 0)
+    for index in rows.index[invalid_price]:
+        report.add_error(int(index), f"preço ausente ou inválido ('{raw_prices.at[index]}')")
+    unidentified = ~invalid_price & rows["code"].isna() & rows["name"].isna()
+    for index in rows.index[unidentified]:
+        report.add_error(int(index), "linha sem código e sem nome")
+    rows = rows[~invalid_price & ~unidentified]
+    rows.insert(0, "row", rows.index)
+    return rows
+
+
+def import_price_list(
+    file: IO[bytes],
+    file_name: str,
+    bidding_id: int,
+    supplier_id: int,
+    item_repo,
+    quote_repo,
+    default_margin: float,
+    dry_run: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+) -> QuoteImportReport:
+    """
+    Matches a supplier price list (CSV/XLSX) to the bidding's items and writes the quotes.
+
+    New quotes get `default_margin`; updated quotes keep their margin and only
+    receive the fields present in the file. Raises ImportFileError when the file
+    itself cannot be read.
+    """
+    report = QuoteImportReport()
+    index = ItemIndex(item_repo.find_by(bidding_id=bidding_id))
+    upserter = QuoteUpserter(quote_repo, bidding_id, supplier_id, default_margin)
+    mapping: dict[str, str] | None = None
+    for chunk in read_table_chunks(file, file_name, chunk_size):
+        if mapping is None:
+            mapping = match_headers(list(chunk.columns), QUOTE_COLUMN_ALIASES)
+            if "price" not in mapping.values() or not {"code", "name"} & set(mapping.values()):
+                raise ImportFileError(
+                    "A lista de preços precisa de uma coluna de preço e de uma coluna de "
+                    "código ou nome do item. Cabeçalhos lidos: "
+                    + ", ".join(str(h) for h in chunk.columns)
+                )
+            report.column_mapping = mapping
+        report.rows_read += len(chunk)
+
+        rows = _prepare_chunk(chunk, mapping, report)
+        item_ids, how = index.match(rows["code"], rows["name"])
+        report.matched_by_code += int((how == MATCHED_BY_CODE).sum())
+        report.matched_by_name += int((how == MATCHED_BY_NAME).sum())
+
+        unmatched = item_ids.isna()
+        if unmatched.any():
+            _queue_for_review(rows[unmatched], how[unmatched], report)
+        matched = rows[~unmatched].assign(item_id=item_ids[~unmatched])
+        upserter.write(matched, report, dry_run)
+    return report
+
+
+def _queue_for_review(rows: pd.DataFrame, how: pd.Series, report: QuoteImportReport) -> None:
+    report.review_count += len(rows)
+    room = MAX_REVIEW_ROWS - len(report.review)
+    if room <= 0:
+        return
+    queued = rows.head(room).astype(object).where(rows.head(room).notna(), None)
+    reasons = np.where(
+        how.head(room) == "ambíguo",
+        "nome corresponde a mais de um item",
+        "nenhum item com este código ou nome",
+    )
+    for record, reason in zip(queued.to_dict("records"), reasons):
+        record["reason"] = str(reason)
+        report.review.append(record)
+
+
+def import_reviewed_rows(
+    reviewed: pd.DataFrame,
+    bidding_id: int,
+    supplier_id: int,
+    quote_repo,
+    default_margin: float,
+) -> QuoteImportReport:
+    """Writes the review-queue rows that were assigned an item ('item_id' column)."""
+    report = QuoteImportReport()
+    assigned = reviewed[reviewed["item_id"].notna()]
+    report.rows_read = len(assigned)
+    if len(assigned) > 0:
+        upserter = QuoteUpserter(quote_repo, bidding_id, supplier_id, default_margin)
+        upserter.write(assigned, report, dry_run=False)
+    return report
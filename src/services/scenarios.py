@@ -0,0 +1,185 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+from repository.queries import quotes_with_names
+from services.pricing import (
+    COST_SCALE,
+    MARGIN_SCALE,
+    PRICE_INPUT_COLUMNS,
+    TAXES_SCALE,
+    calculate_prices,
+)
+
+# --- What-if pricing scenarios for a whole bidding ---
+# A scenario changes the pricing inputs of every quote of a bidding (e.g. margin
+# -3 points, freight +10%) and recalculates all of them in one pass of the
+# fixed-point pricing engine. Overridden inputs are rounded to the precision the
+# columns are stored with, so the engine keeps its exact int64 path instead of
+# falling back to Decimal row by row. Each item's best quote is then compared
+# with the lowest competitor bid (item_price_summary), together with the
+# break-even margin: the margin at which the quote would match that bid.
+
+_INPUT_SCALES = {
+    "price": COST_SCALE,
+    "freight": COST_SCALE,
+    "additional_costs": COST_SCALE,
+    "taxes": TAXES_SCALE,
+    "margin": MARGIN_SCALE,
+}
+
+
+@dataclass(frozen=True)
+class ScenarioOverrides:
+    """Changes applied to every quote; the defaults leave the stored values as they are."""
+
+    price_pct: float = 0.0  # % change of the product cost
+    freight_pct: float = 0.0  # % change of the freight
+    additional_costs_pct: float = 0.0  # % change of the additional costs
+    taxes_points: float = 0.0  # Percentage points added to the taxes
+    margin_points: float = 0.0  # Percentage points added to the margin
+    margin: float | None = None  # Same margin for every quote (before margin_points)
+
+    @property
+    def is_baseline(self) -> bool:
+        return self == ScenarioOverrides()
+
+
+def _input_floats(quotes_df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in quotes_df.columns:
+        return np.zeros(len(quotes_df))
+    floats = pd.to_numeric(quotes_df[col], errors="coerce").to_numpy(dtype="float64")
+    return np.where(np.isfinite(floats), floats, 0.0)  # Empty counts as zero
+
+
+def apply_overrides(quotes_df: pd.DataFrame, overrides: ScenarioOverrides) -> pd.DataFrame:
+    """Pricing inputs (PRICE_INPUT_COLUMNS) of the quotes under the scenario, as floats."""
+    inputs = {col: _input_floats(quotes_df, col) for col in PRICE_INPUT_COLUMNS}
+    inputs["price"] = inputs["price"] * (1 + overrides.price_pct / 100)
+    inputs["freight"] = inputs["freight"] * (1 + overrides.freight_pct / 100)
+    inputs["additional_costs"] = inputs["additional_costs"] * (
+        1 + overrides.additional_costs_pct / 100
+    )
+    inputs["taxes"] = inputs["taxes"] + overrides.taxes_points
+    if overrides.margin is not None:
+        inputs["margin"] = np.full(len(quotes_df), float(overrides.margin))
+    inputs["margin"] = inputs["margin"] + overrides.margin_points
+    # Rounded like the stored columns, so the engine's exact check holds
+    return pd.DataFrame(
+        {col: np.round(values, _INPUT_SCALES[col]) for col, values in inputs.items()},
+        index=quotes_df.index,
+    )
+
+
+def break_even_margins(inputs: pd.DataFrame, target_prices: np.ndarray) -> np.ndarray:
+    """
+    Margin (%) at which each quote's calculated price equals its target price.
+
+    NaN where there is no target or the cost before margin is not positive.
+    """
+    cost = inputs["price"] + inputs["freight"] + inputs["additional_costs"]
+    before_margin = (cost * (1 + inputs["taxes"] / 100)).to_numpy(dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margins = (target_prices / before_margin - 1) * 100
+    return np.where(before_margin > 0, margins, np.nan)
+
+
+def simulate_quotes(
+    quotes_df: pd.DataFrame, overrides: ScenarioOverrides, lowest_bids: pd.Series
+) -> pd.DataFrame:
+    """
+    Recalculates every quote under the scenario.
+
+    Args:
+        quotes_df: Quote rows with the pricing inputs, 'item_id' and, when
+            available, 'supplier_name'/'item_name' (see `quotes_with_names`).
+        overrides: The scenario.
+        lowest_bids: Lowest competitor bid per item id (float; NaN without bids).
+
+    Returns the quotes with 'current_price' and 'scenario_price' (float, R$),
+    'lowest_bid', 'beats_lowest_bid' and 'break_even_margin'.
+    """
+    result = quotes_df.copy()
+    scenario_inputs = apply_overrides(quotes_df, overrides)
+    current = calculate_prices(quotes_df).astype("float64")
+    result["current_price"] = current
+    result["scenario_price"] = (
+        current if overrides.is_baseline else calculate_prices(scenario_inputs).astype("float64")
+    )
+    lowest = result["item_id"].map(lowest_bids).astype("float64").to_numpy()
+    result["lowest_bid"] = lowest
+    result["beats_lowest_bid"] = result["scenario_price"].to_numpy() < lowest
+    result["break_even_margin"] = break_even_margins(scenario_inputs, lowest)
+    return result
+
+
+def summarize_scenario(simulated: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per item: best quote now and under the scenario, lowest bid, gap,
+    whether each best quote is below the lowest bid, and the highest break-even
+    margin among the item's quotes (with its supplier).
+    """
+    columns = [
+        "item_id",
+        "item_name",
+        "current_best",
+        "scenario_best",
+        "change_pct",
+        "scenario_supplier",
+        "lowest_bid",
+        "gap",
+        "beats_lowest_bid",
+        "current_beats_lowest_bid",
+        "break_even_margin",
+        "break_even_supplier",
+    ]
+    if simulated.empty:
+        return pd.DataFrame(columns=columns)
+
+    by_scenario = simulated.sort_values(["item_id", "scenario_price", "id"])
+    best = by_scenario.drop_duplicates("item_id").set_index("item_id")
+    grouped = simulated.groupby("item_id")
+    summary = pd.DataFrame(
+        {
+            "item_name": best.get("item_name"),
+            "current_best": grouped["current_price"].min(),
+            "scenario_best": best["scenario_price"],
+            "scenario_supplier": best.get("supplier_name"),
+            "lowest_bid": best["lowest_bid"],
+        }
+    )
+    summary["change_pct"] = (summary["scenario_best"] / summary["current_best"] - 1) * 100
+    summary["gap"] = summary["scenario_best"] - summary["lowest_bid"]
+    summary["beats_lowest_bid"] = summary["scenario_best"] < summary["lowest_bid"]
+    summary["current_beats_lowest_bid"] = summary["current_best"] < summary["lowest_bid"]
+
+    # Quote that could keep the most margin and still match the lowest bid
+    with_target = simulated[simulated["break_even_margin"].notna()]
+    widest = (
+        with_target.sort_values(["item_id", "break_even_margin"], ascending=[True, False])
+        .drop_duplicates("item_id")
+        .set_index("item_id")
+    )
+    summary["break_even_margin"] = widest["break_even_margin"]
+    summary["break_even_supplier"] = widest.get("supplier_name")
+    return summary.reset_index().reindex(columns=columns)
+
+
+def simulate_bidding(
+    quote_repo, price_summaries, bidding_id: int, overrides: ScenarioOverrides
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Runs a scenario over every quote of a bidding.
+
+    Returns (quotes, items): `simulate_quotes` and `summarize_scenario` results.
+    Lowest bids come from the item price summaries.
+    """
+    quotes_df = quote_repo.fetch_frame(quotes_with_names(bidding_id=bidding_id))
+    item_ids = quotes_df["item_id"].unique().tolist()
+    summaries = price_summaries.frame(item_ids)
+    lowest_bids = pd.Series(
+        pd.to_numeric(summaries["lowest_bid_price"], errors="coerce").to_numpy(dtype="float64"),
+        index=summaries["item_id"].to_numpy(),
+    )
+    simulated = simulate_quotes(quotes_df, overrides, lowest_bids)
+    return simulated, summarize_scenario(simulated)
@@ -0,0 +1,311 @@
+import threading
+from array import array
+from collections.abc import Collection, Iterable
+from typing import Any
+import numpy as np
+import pandas as pd
+from sqlalchemy import Engine
+
+from db.keys import normalize_name
+from db.models import Item
+from repository.events import WrittenRows, add_write_listener
+from repository.queries import quotes_with_names
+from repository.sqlmodel import SQLModelRepository
+from services.dataframes import get_quotes_dataframe
+
+# --- Similar items across biddings ---
+# The same product is written differently in each edital ("Papel A4 75g" vs
+# "PAPEL SULFITE A4 75G/M2"), so exact keys (db/keys.py) miss most matches. Items
+# are compared by the character trigrams of their normalized name + description:
+#   - normalized text is plain ASCII, so a trigram is coded as the 24-bit int of
+#     its three bytes, and the trigrams of a whole batch of items are extracted
+#     with numpy over one buffer of all their texts;
+#   - an inverted index maps each trigram to the positions of the items that
+#     contain it (array('i') postings, appended in place);
+#   - a query concatenates the postings of its trigrams and counts, with one
+#     np.bincount, how many trigrams each item shares with it;
+#   - the score is the cosine of the two trigram sets,
+#     shared / sqrt(|query| * |item|), and the top k come from np.argpartition.
+# One index per database is built on first use and then kept up to date by the
+# item/bidding write listeners (repository/events.py). Changed or deleted items
+# leave dead positions behind, which are compacted once they outnumber the live ones.
+
+SUGGESTION_ITEMS = 5  # Similar items whose quotes are suggested
+SUGGESTION_CANDIDATES = 50  # Items scored before keeping those with quotes
+MIN_SIMILARITY = 0.3
+BUILD_CHUNK_SIZE = 20000
+
+_DTYPES = {"i": np.int32, "q": np.int64}  # array typecode -> numpy dtype
+
+
+def item_text(name: Any, desc: Any = None) -> str:
+    """Normalized 'name desc', padded with spaces so first/last letters form trigrams."""
+    return f" {normalize_name(f'{name or ''} {desc or ''}')} "
+
+
+def trigram_codes(texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Distinct trigrams of each text (as produced by `item_text`).
+
+    Returns (text, code) pairs sorted by code then text: `text` is the index of
+    the text in `texts` and `code` the trigram's bytes as a 24-bit int.
+    """
+    if not texts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    data = np.frombuffer("".join(texts).encode("ascii"), dtype=np.uint8).astype(np.int64)
+    owner = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    # Trigram starting at each byte; keep those that do not cross into the next text
+    codes = (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+    inside = owner[:-2] == owner[2:]
+    # Sort + drop repeats (np.unique hashes first, several times slower here)
+    pairs = np.sort((codes[inside] << 32) | owner[:-2][inside])
+    pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]] if len(pairs) else pairs
+    return pairs & 0xFFFFFFFF, pairs >> 32
+
+
+class ItemSimilarityIndex:
+    """In-memory trigram index of item names/descriptions (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._postings: dict[int, array] = {}  # trigram code -> positions
+        # Per position (one per indexed version of an item)
+        self._item_ids = array("q")
+        self._bidding_ids = array("q")
+        self._sizes = array("i")  # Trigram count
+        self._alive = bytearray()
+        self._positions: dict[int, int] = {}  # item id -> live position
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def add(self, item_id: int, bidding_id: int | None, name: Any, desc: Any = None) -> None:
+        """Indexes an item, replacing its previous version if it was indexed."""
+        self.add_many([(item_id, bidding_id, name, desc)])
+
+    def add_many(self, items: Iterable[tuple[int, int | None, Any, Any]]) -> None:
+        """Indexes (item_id, bidding_id, name, desc) rows, replacing indexed versions."""
+        # An item listed twice (e.g. inserted, then updated) keeps its last row
+        items = list({item[0]: item for item in items}.values())
+        texts, codes = trigram_codes([item_text(name, desc) for _, _, name, desc in items])
+        sizes = np.bincount(texts, minlength=len(items))
+        with self._lock:
+            for item_id, *_ in items:
+                self._discard(item_id)
+            first = len(self._item_ids)
+            # Pairs come grouped by trigram: append each group to its posting
+            positions = (texts + first).astype(_DTYPES["i"])
+            bounds = np.flatnonzero(np.diff(codes)) + 1
+            for code, group in zip(
+                codes[np.r_[0, bounds]].tolist() if len(codes) else [],
+                np.split(positions, bounds),
+            ):
+                posting = self._postings.get(code)
+                if posting is None:
+                    posting = self._postings[code] = array("i")
+                posting.frombytes(group.tobytes())
+            for offset, (item_id, bidding_id, _, _) in enumerate(items):
+                self._item_ids.append(item_id)
+                self._bidding_ids.append(-1 if bidding_id is None else bidding_id)
+                self._alive.append(1)
+                self._positions[item_id] = first + offset
+            self._sizes.frombytes(sizes.astype(_DTYPES["i"]).tobytes())
+            self._compact_if_sparse()  # Replaced versions are dead positions too
+
+    def remove(self, item_id: int) -> None:
+        with self._lock:
+            self._discard(item_id)
+            self._compact_if_sparse()
+
+    def remove_bidding(self, bidding_id: int) -> None:
+        """Removes every item of a bidding (their rows are deleted by the database cascade)."""
+        with self._lock:
+            bidding_ids = np.frombuffer(self._bidding_ids, dtype=_DTYPES["q"])
+            item_ids = np.frombuffer(self._item_ids, dtype=_DTYPES["q"])
+            alive = np.frombuffer(self._alive, dtype=np.bool_)
+            doomed = item_ids[(bidding_ids == bidding_id) & alive].tolist()
+            for item_id in doomed:
+                self._discard(item_id)
+            self._compact_if_sparse()
+
+    def similar(
+        self,
+        name: Any,
+        desc: Any = None,
+        k: int = 10,
+        exclude_item_ids: Collection[int] = (),
+        exclude_bidding_id: int | None = None,
+        min_score: float = 0.0,
+    ) -> list[tuple[int, float]]:
+        """(item_id, score) of the k items most similar to the text, best first."""
+        _, codes = trigram_codes([item_text(name, desc)])
+        with self._lock:
+            return self._similar(codes.tolist(), k, exclude_item_ids, exclude_bidding_id, min_score)
+
+    def _similar(
+        self,
+        codes: list[int],
+        k: int,
+        exclude_item_ids: Collection[int],
+        exclude_bidding_id: int | None,
+        min_score: float,
+    ) -> list[tuple[int, float]]:
+        # numpy views of the arrays die with this call, inside the caller's lock
+        postings = [self._postings[code] for code in codes if code in self._postings]
+        if not postings or not self._positions:
+            return []
+        positions = np.concatenate(
+            [np.frombuffer(posting, dtype=_DTYPES["i"]) for posting in postings]
+        )
+        shared = np.bincount(positions, minlength=len(self._item_ids))
+        sizes = np.frombuffer(self._sizes, dtype=_DTYPES["i"])
+        scores = shared / np.sqrt(len(codes) * np.maximum(sizes, 1))
+        scores[~np.frombuffer(self._alive, dtype=np.bool_)] = 0.0
+        if exclude_bidding_id is not None:
+            bidding_ids = np.frombuffer(self._bidding_ids, dtype=_DTYPES["q"])
+            scores[bidding_ids == exclude_bidding_id] = 0.0
+        for item_id in exclude_item_ids:
+            if (position := self._positions.get(item_id)) is not None:
+                scores[position] = 0.0
+
+        candidates = np.flatnonzero(scores > max(min_score, 0.0))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        item_ids = np.frombuffer(self._item_ids, dtype=_DTYPES["q"])
+        return [(int(item_ids[p]), float(scores[p])) for p in candidates]
+
+    def _discard(self, item_id: int) -> None:
+        position = self._positions.pop(item_id, None)
+        if position is not None:
+            self._alive[position] = 0
+            self._dead += 1
+
+    def _compact_if_sparse(self) -> None:
+        if self._dead <= len(self._positions):
+            return
+        alive = np.frombuffer(self._alive, dtype=np.bool_).copy()
+        new_positions = np.cumsum(alive) - 1
+        for code, posting in list(self._postings.items()):
+            old = np.frombuffer(posting, dtype=_DTYPES["i"])
+            kept = new_positions[old[alive[old]]].astype(_DTYPES["i"])
+            if len(kept):
+                self._postings[code] = array("i", kept.tobytes())
+            else:
+                del self._postings[code]
+        for name in ("_item_ids", "_bidding_ids", "_sizes"):
+            values = getattr(self, name)
+            kept = np.frombuffer(values, dtype=_DTYPES[values.typecode])[alive]
+            setattr(self, name, array(values.typecode, kept.tobytes()))
+        self._alive = bytearray(b"\x01" * int(alive.sum()))
+        self._positions = {int(item_id): p for p, item_id in enumerate(self._item_ids)}
+        self._dead = 0
+
+
+# --- One index per database ---
+
+_indexes: dict[str, ItemSimilarityIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_similarity_index(engine: Engine) -> ItemSimilarityIndex:
+    """The engine's index, built from the item table on first use."""
+    key = str(engine.url)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            return index
+        index = _indexes[key] = ItemSimilarityIndex()
+        # Held while loading: listeners for writes committed meanwhile wait for it
+        # and re-apply their rows (add replaces), so nothing is lost
+        index._lock.acquire()
+    try:
+        item_repo = SQLModelRepository(Item, engine_instance=engine)
+        statement = item_repo.select_columns("id", "bidding_id", "name", "desc")
+        for chunk in item_repo.iter_frames(statement, BUILD_CHUNK_SIZE):
+            chunk["bidding_id"] = chunk["bidding_id"].astype(object).where(
+                chunk["bidding_id"].notna(), None
+            )
+            index.add_many(chunk.itertuples(index=False, name=None))
+    except BaseException:
+        with _indexes_lock:
+            _indexes.pop(key, None)
+        raise
+    finally:
+        index._lock.release()
+    return index
+
+
+def drop_similarity_index(engine: Engine) -> None:
+    """Forgets the engine's index; the next query rebuilds it."""
+    with _indexes_lock:
+        _indexes.pop(str(engine.url), None)
+
+
+def similar_item_quotes(
+    quote_repo, item: Any, k: int = SUGGESTION_ITEMS, min_score: float = MIN_SIMILARITY
+) -> pd.DataFrame:
+    """
+    Quotes of the k items of other biddings most similar to `item`.
+
+    Rows as get_quotes_dataframe (with 'calculated_price'), plus 'similarity';
+    ordered by similarity, then calculated price. Candidates without quotes
+    are skipped.
+    """
+    matches = get_similarity_index(quote_repo.engine).similar(
+        item.name,
+        item.desc,
+        k=SUGGESTION_CANDIDATES,
+        exclude_item_ids=[item.id],
+        exclude_bidding_id=item.bidding_id,
+        min_score=min_score,
+    )
+    if not matches:
+        return get_quotes_dataframe(quotes_list=[]).assign(similarity=[])
+    scores = dict(matches)
+    quotes = get_quotes_dataframe(
+        quotes_list=quote_repo.fetch_frame(quotes_with_names(item_id=list(scores)))
+    )
+    if quotes.empty:
+        return quotes.assign(similarity=[])
+    quotes["similarity"] = quotes["item_id"].map(scores)
+    quoted_items = [item_id for item_id, _ in matches if item_id in set(quotes["item_id"])][:k]
+    quotes = quotes[quotes["item_id"].isin(quoted_items)]
+    quotes["sort_price"] = pd.to_numeric(quotes["calculated_price"], errors="coerce")
+    return (
+        quotes.sort_values(["similarity", "item_id", "sort_price"], ascending=[False, True, True])
+        .drop(columns="sort_price")
+        .reset_index(drop=True)
+    )
+
+
+# --- Write listeners (see repository.events) ---
+
+
+def _on_items_written(written: WrittenRows) -> None:
+    with _indexes_lock:
+        index = _indexes.get(str(written.engine.url))
+    if index is None:
+        return  # Not built yet: it will read the committed rows
+    for row in written.deleted:
+        index.remove(row["id"])
+    rows = written.inserted + written.updated
+    if any(not {"name", "desc", "bidding_id"} <= row.keys() for row in rows):
+        # Not enough to re-index them; rebuild on the next query instead
+        drop_similarity_index(written.engine)
+        return
+    index.add_many((row["id"], row["bidding_id"], row["name"], row["desc"]) for row in rows)
+
+
+def _on_biddings_written(written: WrittenRows) -> None:
+    with _indexes_lock:
+        index = _indexes.get(str(written.engine.url))
+    if index is not None:
+        for row in written.deleted:
+            index.remove_bidding(row["id"])
+
+
+add_write_listener("item", _on_items_written)
+add_write_listener("bidding", _on_biddings_written)
@@ -1,49 +1,53 @@
 import streamlit as st
 import pandas as pd
 from decimal import Decimal
+from repository.sqlmodel import Page
+from services.diff import build_change_set
 from ..utils.utils import get_options_map
 
 
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250]
+DEFAULT_PAGE_SIZE = 50
+
+
 # Helper function to load and prepare data for tabs (can be used as a default)
 def load_and_prepare_data(
     repository,
     entity_name: str,
     columns_to_display: list[str] = None,
     selected_foreign_keys: dict = None,
-):
+    paging: dict = None,
+) -> Page:
     """
-    Loads data from the given repository, prepares it, and handles errors.
-    Can also filter by selected foreign keys if provided.
+    Loads one page of data from the given repository, prepares it, and handles errors.
+    Can also filter by selected foreign keys if provided (the filter runs in SQL).
+    `paging` holds the keyword arguments of `repository.fetch_page` (cursor, page
+    size and search); without it, the first page with the default size is loaded.
     """
+    if selected_foreign_keys:
+        # A parent that is not selected yet means there is nothing to show
+        if any(fk_id is None for fk_id in selected_foreign_keys.values()):
+            return Page(pd.DataFrame())
+    paging = paging or {}
     try:
-        data_list = repository.get_all()
+        # Rows are read straight into a DataFrame (no ORM objects per row)
+        # Filter in SQL so only the rows of the selected parent are loaded
+        page = repository.fetch_page(filters=selected_foreign_keys, **paging)
     except Exception as e:
         st.error(f"Erro ao carregar dados de {entity_name}: {e}")
-        return pd.DataFrame()
-
-    if not data_list:
-        st.info(f"Nenhum(a) {entity_name.lower()} cadastrado(a).")
-        return pd.DataFrame()
-
-    try:
-        df = pd.DataFrame([item.model_dump() for item in data_list])
-    except Exception as e:
-        st.error(f"Erro ao converter dados de {entity_name} para DataFrame: {e}")
-        return pd.DataFrame()
+        return Page(pd.DataFrame())
 
+    df = page.frame
     if df.empty:
-        return df
-
-    if selected_foreign_keys:
-        for fk_column, fk_id in selected_foreign_keys.items():
-            if fk_id is not None and fk_column in df.columns:
-                df = df[df[fk_column] == fk_id]
-            elif fk_id is None and fk_column in df.columns:
-                return pd.DataFrame()
-        if df.empty:
+        if paging.get("search"):
+            st.info(f"Nenhum resultado encontrado para sua busca em {entity_name}.")
+        elif selected_foreign_keys:
             st.info(
                 f"Nenhum(a) {entity_name.lower()} encontrado(a) para a seleção atual."
             )
+        else:
+            st.info(f"Nenhum(a) {entity_name.lower()} cadastrado(a).")
+        return Page(pd.DataFrame())
 
     if "created_at" in df.columns:
         df["created_at"] = pd.to_datetime(
@@ -66,49 +70,73 @@ def load_and_prepare_data(
             st.error(
                 f"DataFrame para {entity_name} não possui coluna 'id', edições não serão possíveis."
             )
-            return df[final_cols].copy() if final_cols else pd.DataFrame()
-        return df[final_cols].copy()
+            return Page(df[final_cols].copy() if final_cols else pd.DataFrame())
+        return Page(df[final_cols].copy(), page.next_cursor)
 
-    return df.copy()
+    return Page(df.copy(), page.next_cursor)
 
 
-def display_search_box_and_filter_df(
-    df_unfiltered: pd.DataFrame,
+def display_search_box(
     search_columns: list[str],
     search_key_suffix: str,
     entity_name_plural: str,
     search_label: str = None,
-):
-    if df_unfiltered is None or df_unfiltered.empty:
-        return df_unfiltered
+) -> str:
+    """Renders the search box and returns the term; the search itself runs in SQL."""
     if search_label is None:
         search_label = (
             f"Buscar em {entity_name_plural} (por {', '.join(search_columns)}):"
         )
-    search_term = st.text_input(search_label, key=f"search_{search_key_suffix}")
-    if not search_term:
-        return df_unfiltered
-    search_term_lower = search_term.lower()
-    valid_search_columns = [
-        col for col in search_columns if col in df_unfiltered.columns
-    ]
-    if not valid_search_columns:
-        return df_unfiltered
-    combined_filter = pd.Series([False] * len(df_unfiltered), index=df_unfiltered.index)
-    for col in valid_search_columns:
-        try:
-            combined_filter |= (
-                df_unfiltered[col]
-                .astype(str)
-                .str.lower()
-                .str.contains(search_term_lower, na=False)
-            )
-        except Exception:
-            pass
-    df_filtered = df_unfiltered[combined_filter]
-    if df_filtered.empty and search_term:
-        st.info(f"Nenhum resultado encontrado para sua busca em {entity_name_plural}.")
-    return df_filtered
+    return st.text_input(search_label, key=f"search_{search_key_suffix}").strip()
+
+
+def get_paging_state(key_suffix: str, signature: tuple) -> list:
+    """
+    Returns the cursor stack of a table: cursors[i] is the `after` cursor of page i.
+
+    The stack is kept in session_state and reset to the first page whenever the
+    signature (parent selection, search term, page size) changes.
+    """
+    state_key = f"paging_{key_suffix}"
+    state = st.session_state.get(state_key)
+    if state is None or state["signature"] != signature:
+        state = {"signature": signature, "cursors": [None]}
+        st.session_state[state_key] = state
+    return state["cursors"]
+
+
+def display_page_navigation(
+    key_suffix: str, cursors: list, next_cursor, rows_on_page: int
+):
+    """Previous/next buttons for a keyset-paginated table."""
+
+    def go_previous():
+        if len(cursors) > 1:
+            cursors.pop()
+
+    def go_next():
+        if next_cursor is not None:
+            cursors.append(next_cursor)
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1], vertical_alignment="center")
+    with col_prev:
+        st.button(
+            "◀ Anterior",
+            key=f"page_prev_{key_suffix}",
+            on_click=go_previous,
+            disabled=len(cursors) <= 1,
+            use_container_width=True,
+        )
+    with col_info:
+        st.caption(f"Página {len(cursors)} · {rows_on_page} registro(s) nesta página")
+    with col_next:
+        st.button(
+            "Próxima ▶",
+            key=f"page_next_{key_suffix}",
+            on_click=go_next,
+            disabled=next_cursor is None,
+            use_container_width=True,
+        )
 
 
 # Updated to accept is_editable
@@ -167,8 +195,6 @@ def handle_save_changes(
             set(default_non_updatable + fields_to_remove_before_update)
         )
 
-    changes_processed_any_row = False
-
     if original_df is None:  # original_df is expected to be indexed by 'id'
         st.error(
             f"DataFrame original de {entity_name_singular} não fornecido. Impossível salvar."
@@ -213,248 +239,37 @@ def handle_save_changes(
             # We might still process existing rows if any were somehow present in original_df and also in edited_df
             # but the current logic implies edited_df would be a subset of original_df rows.
 
-    # Iterate through the edited_df (which has a range index)
-    for edited_idx, edited_row_series in edited_df.iterrows():
-        if edited_idx >= len(original_df.index):
-            # This case implies more rows in edited_df than original_df, which means new rows.
-            # These should be handled by an "add" mechanism, not "update".
-            # For robustness, skip if editor somehow produces more rows than original.
-            st.warning(
-                f"Linha {edited_idx} no editor não corresponde a uma linha original. Pulando."
-            )
-            continue
-
-        entity_id = original_df.index[edited_idx]
-
-        # Check if this entity_id from original_df is valid (it should be, as it's from original_df's index)
-        # No, this check is not needed: if entity_id is from original_df.index, it must be in original_df.index.
-        # if entity_id not in original_df.index:
-        #     st.warning(f"ID de entidade {entity_id} (da linha {edited_idx} do editor) não encontrado no DataFrame original. Pulando.")
-        #     continue
-
-        original_row_series = original_df.loc[entity_id]
-        current_row_update_dict = {}
-        row_had_actual_changes = False
-        skip_this_row_due_to_error = False
-        temp_changed_values_dict = {}
-        for col_name_from_editor in editable_columns:
-            # editable_columns should only contain columns that are in edited_row_series
-            # and also intended to be editable (and thus should be in original_row_series too,
-            # unless it's a new column concept not directly in the model but derived for editing).
-            # For simplicity, assume editable_columns refers to fields in the model that are also in edited_row_series.
-            if col_name_from_editor not in edited_row_series.index:
-                # This column is in the editable_columns list but not in the edited DataFrame.
-                # This might happen if editable_columns is not perfectly synced with df_for_editor_display.
-                # The `actual_editable_columns_for_save` in `display_entity_management_ui` should prevent this.
-                st.warning(
-                    f"Coluna '{col_name_from_editor}' definida como editável mas não encontrada nos dados editados para {entity_name_singular} ID {entity_id}. Pulando esta coluna."
-                )
-                continue
-
-            # If col_name_from_editor is not in original_row_series, it implies it's a new, perhaps virtual, field.
-            # The comparison logic needs to handle this. If it's truly new and not in the model,
-            # it might only be used for special_conversions to target_fields that ARE in the model.
-            original_value = original_row_series.get(
-                col_name_from_editor
-            )  # Use .get() for safety
-            edited_value = edited_row_series[col_name_from_editor]
-
-            changed = False
-            if original_value is None and pd.isna(
-                edited_value
-            ):  # original was None, editor set to NA (empty cell perhaps)
-                changed = False  # Or True if None should be preserved explicitly. Depends on desired behavior for nulls.
-            elif original_value is not None and pd.isna(
-                edited_value
-            ):  # original had value, editor cleared it
-                changed = True
-            elif pd.isna(original_value) and not pd.isna(
-                edited_value
-            ):  # original was NA, editor provided value
-                changed = True
-            elif pd.isna(original_value) and pd.isna(
-                edited_value
-            ):  # Both NA (e.g. np.nan, None, pd.NaT)
-                changed = False
-            elif isinstance(original_value, pd.Timestamp) and isinstance(
-                edited_value, pd.Timestamp
-            ):
-                # Ensure Naive comparison if one is aware and other is naive
-                ts_original = (
-                    original_value.tz_localize(None)
-                    if original_value.tzinfo
-                    else original_value
-                )
-                ts_edited = (
-                    edited_value.tz_localize(None)
-                    if edited_value.tzinfo
-                    else edited_value
-                )
-                changed = ts_original != ts_edited
-            elif isinstance(original_value, pd.Timestamp) or isinstance(
-                edited_value, pd.Timestamp
-            ):  # Type mismatch involving Timestamp
-                changed = True
-            elif isinstance(original_value, Decimal):
-                try:
-                    str_edited_value = str(edited_value).strip()
-                    if not str_edited_value and original_value is not None:
-                        changed = True  # Cleared value
-                    elif not str_edited_value and original_value is None:
-                        changed = False  # Was None, remains effectively None
-                    else:
-                        changed = original_value != Decimal(str_edited_value)
-                except:
-                    changed = True  # Conversion error implies change
-            elif isinstance(edited_value, Decimal) and not isinstance(
-                original_value, Decimal
-            ):  # Original was not Decimal but edited is
-                try:
-                    str_original_value = str(original_value).strip()
-                    if not str_original_value and edited_value is not None:
-                        changed = True
-                    elif not str_original_value and edited_value is None:
-                        changed = False
-                    else:
-                        changed = Decimal(str_original_value) != edited_value
-                except:
-                    changed = True
-            else:  # General case
-                # Try to compare types if possible, then values
-                if type(original_value) != type(edited_value) and not (
-                    pd.isna(original_value) and pd.isna(edited_value)
-                ):
-                    try:
-                        # Attempt to cast edited_value to original_value's type for comparison
-                        # This might not always be appropriate or possible
-                        casted_edited_value = type(original_value)(edited_value)
-                        changed = original_value != casted_edited_value
-                    except (ValueError, TypeError):
-                        changed = True  # If casting fails, consider it a change
-                else:
-                    changed = original_value != edited_value
-
-            if changed:
-                temp_changed_values_dict[col_name_from_editor] = edited_value
-                row_had_actual_changes = True
-        if not row_had_actual_changes:
-            continue
-        changes_processed_any_row = True
-        for col_name_from_editor, raw_edited_value in temp_changed_values_dict.items():
-            target_field = (
-                col_name_from_editor  # Default target is the same as editor column name
-            )
-            try:
-                if col_name_from_editor in special_conversions:
-                    conv_details = special_conversions[col_name_from_editor]
-                    target_field = conv_details["target_field"]
-                    conversion_func = conv_details["conversion_func"]
-                    current_row_update_dict[target_field] = conversion_func(
-                        raw_edited_value
-                    )
-                else:
-                    # If no special conversion, ensure the target_field (which is col_name_from_editor)
-                    # is a valid field for the model (this check is implicitly done by SQLModel/Pydantic on update).
-                    current_row_update_dict[target_field] = raw_edited_value
-            except Exception as e:
-                st.error(
-                    f"{entity_name_singular} ID {entity_id}: Erro ao converter '{col_name_from_editor}' ('{raw_edited_value}') para '{target_field}': {e}."
-                )
-                skip_this_row_due_to_error = True
-                break
-        if skip_this_row_due_to_error:
-            continue
-
-        # Required field validation: based on target_field names
-        for req_field_target_name in required_fields:
-            final_value_to_check = current_row_update_dict.get(req_field_target_name)
-
-            # If the required field wasn't in temp_changed_values_dict (i.e., not edited),
-            # its value would be the original one. But validation should be on the *new* state.
-            # So, if it's not in current_row_update_dict, it means it wasn't changed OR it wasn't an editable column.
-            # If it wasn't changed, its original value must have been valid.
-            # If it IS in current_row_update_dict, we check its new value.
-            if (
-                req_field_target_name in current_row_update_dict
-            ):  # Check if it was part of the update
-                if final_value_to_check is None or (
-                    isinstance(final_value_to_check, str)
-                    and not final_value_to_check.strip()
-                ):
-                    # Find the original editor column name for error message if special_conversion was used
-                    editor_col_for_error = req_field_target_name
-                    for cn_editor, conv_details in special_conversions.items():
-                        if conv_details.get("target_field") == req_field_target_name:
-                            editor_col_for_error = cn_editor
-                            break
-                    st.error(
-                        f"{entity_name_singular} ID {entity_id}: Campo obrigatório '{editor_col_for_error}' (destino: '{req_field_target_name}') está vazio ou inválido. Alterações não salvas para esta linha."
-                    )
-                    skip_this_row_due_to_error = True
-                    break
-            # If a required_field is NOT in current_row_update_dict, it means it was not edited.
-            # We assume its original value (from original_row_series) was valid.
-            # If a required_field was NOT part of editable_columns, it could not have been changed.
-            # This logic assumes required_fields are typically among editable_columns if they are to be enforced on edit.
-
-        if skip_this_row_due_to_error:
-            continue
-
-        # Decimal field validation: based on target_field names
-        for dec_field_target_name in decimal_fields:
-            if dec_field_target_name in current_row_update_dict:
-                val = current_row_update_dict[dec_field_target_name]
-                if val is not None and not isinstance(val, Decimal):
-                    try:
-                        str_val = str(val).strip()
-                        if not str_val:
-                            current_row_update_dict[dec_field_target_name] = (
-                                None  # Allow clearing optional decimal
-                            )
-                        else:
-                            current_row_update_dict[dec_field_target_name] = Decimal(
-                                str_val
-                            )
-                    except Exception as e:
-                        editor_col_for_error = dec_field_target_name
-                        for cn_editor, conv_details in special_conversions.items():
-                            if (
-                                conv_details.get("target_field")
-                                == dec_field_target_name
-                            ):
-                                editor_col_for_error = cn_editor
-                                break
-                        st.error(
-                            f"{entity_name_singular} ID {entity_id}: Valor inválido para campo decimal '{editor_col_for_error}' ('{val}'): {e}. Alterações não salvas para esta linha."
-                        )
-                        skip_this_row_due_to_error = True
-                        break
-        if skip_this_row_due_to_error:
-            continue
-
-        # Remove fields that should not go into the update payload (e.g., 'id', 'created_at', derived display fields)
-        for (
-            field_to_rm
-        ) in fields_to_remove:  # fields_to_remove refers to target model field names
-            current_row_update_dict.pop(field_to_rm, None)
-
-        if (
-            not current_row_update_dict
-        ):  # No actual changes to update after conversions and removals
-            st.info(
-                f"Nenhuma alteração real para {entity_name_singular} ID {entity_id} após processamento."
-            )
-            continue
+    # Vectorized diff: changed cells per column, then conversions/validation only
+    # for the changed rows (see services/diff.py)
+    change_set = build_change_set(
+        original_df,
+        edited_df,
+        editable_columns=editable_columns,
+        required_fields=required_fields,
+        decimal_fields=decimal_fields,
+        special_conversions=special_conversions,
+        fields_to_remove=fields_to_remove,
+    )
+    changes_processed_any_row = bool(change_set.changed_ids)
+    for entity_id, error in change_set.errors.items():
+        st.error(f"{entity_name_singular} ID {entity_id}: {error}")
+    pending_updates = change_set.changes
 
+    if pending_updates:
+        # One transaction for every changed row instead of one update per row
         try:
-            repository.update(entity_id, current_row_update_dict)
-            st.success(
-                f"{entity_name_singular} ID {entity_id} atualizado(a) com sucesso com: {current_row_update_dict}"
-            )
+            result = repository.update_many(pending_updates)
         except Exception as e:
-            st.error(
-                f"Falha ao salvar {entity_name_singular} ID {entity_id}: {e}. Tentativa de payload: {current_row_update_dict}"
-            )
+            st.error(f"Falha ao salvar {entity_name_singular.lower()}s: {e}")
+        else:
+            if result.succeeded:
+                st.success(
+                    f"{len(result.succeeded)} {entity_name_singular.lower()}(s) atualizado(a)(s) com sucesso."
+                )
+            for entity_id, error in result.failed.items():
+                st.error(
+                    f"Falha ao salvar {entity_name_singular} ID {entity_id}: {error}. Tentativa de payload: {pending_updates[entity_id]}"
+                )
 
     if not changes_processed_any_row:
         # This simple check replaces the more complex DataFrame comparison
@@ -536,32 +351,69 @@ def display_entity_management_ui(
             st.info(f"Por favor, {fk_label.lower()} para continuar.")
             proceed_to_data_display = False
     df_display_unfiltered = pd.DataFrame()
+    cursors = [None]
+    next_cursor = None
     if proceed_to_data_display:
+        # The search box comes first: the search runs in the database over every
+        # row of the selection, and the result is then paginated
+        search_term = display_search_box(
+            search_columns=search_columns,
+            search_key_suffix=key_suffix,
+            entity_name_plural=entity_name_plural,
+            search_label=custom_search_label,
+        )
+        page_size = st.selectbox(
+            "Registros por página",
+            options=PAGE_SIZE_OPTIONS,
+            index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+            key=f"page_size_{key_suffix}",
+        )
+        cursors = get_paging_state(
+            key_suffix,
+            (tuple(sorted(selected_foreign_key_ids.items())), search_term, page_size),
+        )
+        # Keyword arguments for repository.fetch_page (keyset pagination)
+        paging = {
+            "after": cursors[-1],
+            "limit": page_size,
+            "search": search_term or None,
+            "search_columns": search_columns,
+        }
         if custom_dataframe_preparation_func:
             try:
-                df_display_unfiltered = custom_dataframe_preparation_func(
-                    repository, selected_foreign_key_ids
+                # Custom functions load the page themselves and return a Page
+                # (or a plain DataFrame when they do not paginate)
+                prepared = custom_dataframe_preparation_func(
+                    repository, selected_foreign_key_ids, paging
                 )
+                if isinstance(prepared, Page):
+                    df_display_unfiltered = prepared.frame
+                    next_cursor = prepared.next_cursor
+                else:
+                    df_display_unfiltered = prepared
                 if df_display_unfiltered is None:
                     st.error(
                         f"Falha ao preparar dados customizados para {entity_name_plural}."
                     )
                     df_display_unfiltered = pd.DataFrame()
+                elif df_display_unfiltered.empty and search_term:
+                    st.info(
+                        f"Nenhum resultado encontrado para sua busca em {entity_name_plural}."
+                    )
             except Exception as e:
                 st.error(
                     f"Erro na função de preparação de dados customizada para {entity_name_plural}: {e}"
                 )
                 df_display_unfiltered = pd.DataFrame()
         else:
-            df_raw = load_and_prepare_data(
+            page = load_and_prepare_data(
                 repository,
                 entity_name_plural,
                 selected_foreign_keys=selected_foreign_key_ids,
+                paging=paging,
             )
-            if df_raw is not None:
-                df_display_unfiltered = df_raw
-            else:
-                df_display_unfiltered = pd.DataFrame() if df_raw is None else df_raw
+            df_display_unfiltered = page.frame
+            next_cursor = page.next_cursor
         if (
             custom_data_processing_hook
             and df_display_unfiltered is not None
@@ -601,15 +453,10 @@ def display_entity_management_ui(
                 if col in df_display_unfiltered.columns
             ]
             df_display_unfiltered = df_display_unfiltered[final_display_cols].copy()
-    df_filtered = display_search_box_and_filter_df(
-        df_unfiltered=df_display_unfiltered
-        if df_display_unfiltered is not None
-        else pd.DataFrame(),
-        search_columns=search_columns,
-        search_key_suffix=key_suffix,
-        entity_name_plural=entity_name_plural,
-        search_label=custom_search_label,
-    )
+    # The search already ran in SQL: the page is the filtered data
+    df_filtered = df_display_unfiltered
+    # Editor state belongs to one page (see display_page_navigation)
+    page_key_suffix = f"{key_suffix}_p{len(cursors)}"
 
     # Prepare original_df_for_save: ensure it's indexed by 'id'
     # This is the DataFrame that handle_save_changes will use as the source of truth for original values.
@@ -684,7 +531,7 @@ def display_entity_management_ui(
     # for the schema, but st.data_editor handles empty df with empty config.
 
     session_key_orig_df_for_autosave_comparison = (
-        f"{editor_key_suffix}_orig_df_for_autosave_compare"
+        f"{page_key_suffix}_orig_df_for_autosave_compare"
     )
 
     if is_editable and auto_save:
@@ -706,51 +553,18 @@ def display_entity_management_ui(
     edited_df_from_editor = display_data_editor(
         df_to_edit=df_for_editor_display,
         column_config=final_column_config_for_editor,
-        editor_key_suffix=key_suffix,  # Use the general key_suffix for editor
+        editor_key_suffix=page_key_suffix,  # One editor state per page
         is_editable=is_editable,
     )
-
-    # Part 2: Reconstruct edited_df_for_save before calling handle_save_changes
-    # original_df_for_save is indexed by 'id' and has all original columns.
-    # edited_df_from_editor has a range_index and only display columns (incl 'id' if added).
-    edited_df_reconstructed_for_save = pd.DataFrame()
-
-    if not edited_df_from_editor.empty and "id" in edited_df_from_editor.columns:
-        # Start with a copy of the original data, indexed by 'id'
-        edited_df_reconstructed_for_save = original_df_for_save.copy()
-        # Iterate through the rows of the edited data (from the editor)
-        for _, edited_row_series in edited_df_from_editor.iterrows():
-            entity_id = edited_row_series["id"]
-            if entity_id in edited_df_reconstructed_for_save.index:
-                for col_name in edited_row_series.index:
-                    if col_name == "id":
-                        continue  # Don't try to update 'id' column itself via this loop
-                    if col_name in edited_df_reconstructed_for_save.columns:
-                        # Update the corresponding cell in the reconstructed DataFrame
-                        edited_df_reconstructed_for_save.loc[entity_id, col_name] = (
-                            edited_row_series[col_name]
-                        )
-            # else: row with this id was not in original_df_for_save (e.g. new row in editor not yet supported by save)
-        # Now edited_df_reconstructed_for_save has original data + updates from editor, and is indexed by 'id'.
-        # For handle_save_changes, we need it to have a range index, like the editor output.
-        # So, reset index. handle_save_changes will use 'id' column for matching.
-        edited_df_reconstructed_for_save = edited_df_reconstructed_for_save.reset_index(
-            drop=True
+    if proceed_to_data_display and (len(cursors) > 1 or next_cursor is not None):
+        display_page_navigation(
+            key_suffix, cursors, next_cursor, rows_on_page=len(df_for_editor_display)
         )
 
-    elif edited_df_from_editor.empty and not df_for_editor_display.empty:
-        # Editor was cleared, but there was data. This means all rows were deleted.
-        # Reconstruct an empty df with same columns as original_df_for_save to signify deletions for handle_save_changes
-        # Current handle_save_changes might not support mass deletion this way, but for consistency:
-        edited_df_reconstructed_for_save = pd.DataFrame(
-            columns=original_df_for_save.columns
-        )
-    else:  # No data to edit or no edits made, or 'id' column missing in editor output
-        edited_df_reconstructed_for_save = (
-            original_df_for_save.reset_index(drop=True)
-            if original_df_for_save is not None
-            else pd.DataFrame()
-        )
+    # Part 2: The editor output goes to handle_save_changes as is: build_change_set
+    # aligns it with original_df_for_save by 'id' (services/diff.py), so only the
+    # displayed columns are compared and rows the editor added (no id) are skipped.
+    edited_df_for_save = edited_df_from_editor
 
     if is_editable:
         actions_taken_this_pass = False
@@ -787,18 +601,23 @@ def display_entity_management_ui(
                 ids_to_delete = ids_before_edit - ids_after_edit
 
                 if ids_to_delete:
-                    for entity_id_to_delete in ids_to_delete:
-                        try:
-                            # Make sure to use int for repository call
-                            repository.delete(int(entity_id_to_delete))
-                            st.success(
-                                f"{entity_name_singular} ID {entity_id_to_delete} deletado(a) com sucesso."
-                            )
-                            deletions_successfully_made_this_pass = True
-                        except Exception as e:
-                            st.error(
-                                f"Erro ao deletar {entity_name_singular} ID {entity_id_to_delete}: {e}"
-                            )
+                    # All deletions of this pass go to the database in one transaction
+                    deletion_result = repository.delete_many(
+                        [int(entity_id) for entity_id in ids_to_delete]
+                    )
+                    for entity_id_deleted in deletion_result.succeeded:
+                        st.success(
+                            f"{entity_name_singular} ID {entity_id_deleted} deletado(a) com sucesso."
+                        )
+                    for entity_id_failed, error in deletion_result.failed.items():
+                        st.error(
+                            f"Erro ao deletar {entity_name_singular} ID {entity_id_failed}: {error}"
+                        )
+                    deletions_successfully_made_this_pass = bool(
+                        deletion_result.succeeded
+                    )
+                    # Only rows actually deleted are removed from the baseline below
+                    ids_to_delete = set(deletion_result.succeeded)
 
                     if deletions_successfully_made_this_pass:
                         actions_taken_this_pass = True
@@ -858,29 +677,27 @@ def display_entity_management_ui(
             if deletions_successfully_made_this_pass or changed_vs_last_saved_state:
                 if (
                     not original_df_for_save.empty
-                    or not edited_df_reconstructed_for_save.empty
+                    or not edited_df_for_save.empty
                     or deletions_successfully_made_this_pass
                 ):
                     if (
                         not deletions_successfully_made_this_pass
-                        and edited_df_reconstructed_for_save.empty
+                        and edited_df_for_save.empty
                         and original_df_for_save.empty
                     ):
                         # This case means editor was cleared, but no actual deletions from DB (was already empty)
                         pass  # No updates to make
                     elif (
-                        not edited_df_reconstructed_for_save.empty
+                        not edited_df_for_save.empty
                         and not original_df_for_save.empty
-                        and original_df_for_save.equals(
-                            edited_df_reconstructed_for_save.set_index("id", drop=False)
-                        )
+                        and not editor_content_changed_from_initial
                         and not deletions_successfully_made_this_pass
                     ):
                         pass  # No actual changes in values for existing rows, and no deletions
                     else:
                         updates_made_by_hsc = handle_save_changes(
                             original_df=original_df_for_save,
-                            edited_df=edited_df_reconstructed_for_save,
+                            edited_df=edited_df_for_save,
                             repository=repository,
                             entity_name_singular=entity_name_singular,
                             editable_columns=actual_editable_columns_for_save,
@@ -925,28 +742,26 @@ def display_entity_management_ui(
                 # and the reconstructed edited_df.
                 if (
                     not original_df_for_save.empty
-                    or not edited_df_reconstructed_for_save.empty
+                    or not edited_df_for_save.empty
                 ):
                     # Avoid calling if both are empty unless deletions happened (covered by actions_taken_this_pass)
                     if (
-                        edited_df_reconstructed_for_save.empty
+                        edited_df_for_save.empty
                         and original_df_for_save.empty
                         and not deletions_successfully_made_this_pass
                     ):
                         pass
                     elif (
-                        not edited_df_reconstructed_for_save.empty
+                        not edited_df_for_save.empty
                         and not original_df_for_save.empty
-                        and original_df_for_save.equals(
-                            edited_df_reconstructed_for_save.set_index("id", drop=False)
-                        )
+                        and not editor_content_changed_from_initial
                         and not deletions_successfully_made_this_pass
                     ):
                         pass  # No actual changes in values for existing rows, and no deletions
                     else:
                         updates_made_by_hsc = handle_save_changes(
                             original_df=original_df_for_save,
-                            edited_df=edited_df_reconstructed_for_save,
+                            edited_df=edited_df_for_save,
                             repository=repository,
                             entity_name_singular=entity_name_singular,
                             editable_columns=actual_editable_columns_for_save,
@@ -0,0 +1,199 @@
+import time
+from datetime import datetime
+from decimal import Decimal
+import streamlit as st
+
+from db.models import Bid
+from repository.queries import bids_with_names
+from services.auction import BidLadder, add_ladder_point, create_ladder_figure
+from ..utils.utils import get_options_map
+
+AUCTION_STATE_KEY = "auction_state"
+NO_BIDDER_OPTION = "___NO_BIDDER___"
+RECENT_BIDS_SHOWN = 10
+
+
+def show_auction_view(bidding_repo, item_repo, bidder_repo, bid_repo, price_summaries):
+    """
+    Live auction screen for one bidding item.
+
+    The item's bids are loaded once into a BidLadder kept in session_state. Each
+    new bid is one INSERT plus an append to the ladder and to the chart, inside a
+    fragment, so the rest of the page is not rerun while bids are entered.
+    """
+    st.title("Pregão ao Vivo")
+
+    col_bidding, col_item = st.columns(2)
+    bidding_options_map, bidding_option_ids = get_options_map(
+        data_list=bidding_repo.get_all(),
+        extra_cols=["city", "process_number", "mode"],
+        default_message="Selecione uma Licitação...",
+    )
+    with col_bidding:
+        bidding_id = st.selectbox(
+            "Licitação:",
+            options=bidding_option_ids,
+            format_func=lambda x: bidding_options_map.get(x, str(x)),
+            key="sb_bidding_auction",
+        )
+    if bidding_id is None:
+        st.info("Selecione a licitação e o item em disputa.")
+        return
+
+    items = item_repo.find_by(bidding_id=bidding_id)
+    item_options_map, item_option_ids = get_options_map(
+        data_list=items,
+        code_col="code",
+        default_message="Selecione um Item...",
+    )
+    with col_item:
+        item_id = st.selectbox(
+            "Item:",
+            options=item_option_ids,
+            format_func=lambda x: item_options_map.get(x, str(x)),
+            key="sb_item_auction",
+        )
+    if item_id is None:
+        st.info("Selecione o item em disputa.")
+        return
+
+    state = st.session_state.get(AUCTION_STATE_KEY)
+    if state is None or state["ladder"].item_id != item_id:
+        state = _load_auction_state(bid_repo, price_summaries, item_id, bidding_id)
+        st.session_state[AUCTION_STATE_KEY] = state
+
+    bidder_options_map, bidder_option_ids = get_options_map(
+        data_list=bidder_repo.get_all(),
+        default_message="Selecione um Licitante...",
+    )
+    bidder_options_map[NO_BIDDER_OPTION] = "Nenhum Licitante"
+    bidder_option_ids = [x for x in bidder_option_ids if x is not None] + [
+        NO_BIDDER_OPTION
+    ]
+    _display_auction_panel(bid_repo, price_summaries, bidder_options_map, bidder_option_ids)
+
+
+def _load_auction_state(bid_repo, price_summaries, item_id: int, bidding_id: int) -> dict:
+    """Reads the item's bids and lowest quote once and builds the ladder and its chart."""
+    ladder = BidLadder.from_frame(
+        item_id, bidding_id, bid_repo.fetch_frame(bids_with_names(item_id=item_id))
+    )
+    summary = price_summaries.get(item_id)
+    min_quote_price = (
+        float(summary["min_quote_price"])
+        if summary is not None and summary["quote_count"] > 0
+        else None
+    )
+    return {
+        "ladder": ladder,
+        "figure": create_ladder_figure(ladder, min_quote_price),
+        "min_quote_price": min_quote_price,
+        "last_latency_ms": None,
+    }
+
+
+@st.fragment
+def _display_auction_panel(bid_repo, price_summaries, bidder_options_map, bidder_option_ids):
+    started = time.perf_counter()
+    state = st.session_state[AUCTION_STATE_KEY]
+    ladder: BidLadder = state["ladder"]
+
+    # Enter submits; the form is cleared for the next bid
+    with st.form("auction_bid_form", clear_on_submit=True, enter_to_submit=True):
+        col_bidder, col_price, col_submit = st.columns(
+            [3, 2, 1], vertical_alignment="bottom"
+        )
+        with col_bidder:
+            bidder_option = st.selectbox(
+                "Licitante*",
+                options=bidder_option_ids,
+                format_func=lambda x: bidder_options_map.get(x, str(x)),
+                index=None,
+                placeholder="Digite para buscar...",
+                key="sb_bidder_auction",
+            )
+        with col_price:
+            price = st.number_input(
+                "Lance (R$)*",
+                min_value=0.01,
+                value=None,
+                format="%.2f",
+                key="bid_price_auction",
+            )
+        with col_submit:
+            submitted = st.form_submit_button("Registrar", use_container_width=True)
+
+    if submitted:
+        if bidder_option is None or price is None:
+            st.error("Informe o licitante e o valor do lance.")
+        else:
+            bidder_id = None if bidder_option == NO_BIDDER_OPTION else bidder_option
+            bidder_name = bidder_options_map.get(bidder_option)
+            created_at = datetime.now()
+            try:
+                bid_repo.add(
+                    Bid(
+                        item_id=ladder.item_id,
+                        bidding_id=ladder.bidding_id,
+                        bidder_id=bidder_id,
+                        price=Decimal(str(price)),
+                        created_at=created_at,
+                    )
+                )
+            except Exception as e:
+                st.error(f"Erro ao registrar lance: {e}")
+            else:
+                ladder.record(price, bidder_name, created_at)
+                add_ladder_point(state["figure"], bidder_name, created_at, price)
+                if (
+                    state["min_quote_price"] is not None
+                    and price < state["min_quote_price"]
+                ):
+                    st.warning(
+                        f"Lance de {bidder_name} abaixo do menor orçamento "
+                        f"(R$ {state['min_quote_price']:,.2f})."
+                    )
+
+    col_metrics, col_reload = st.columns([5, 1], vertical_alignment="bottom")
+    with col_metrics:
+        metric_cols = st.columns(3)
+        lowest = ladder.lowest_price
+        metric_cols[0].metric(
+            "Menor Lance", f"R$ {lowest:,.2f}" if lowest is not None else "—"
+        )
+        metric_cols[1].metric("Lances Registrados", len(ladder))
+        metric_cols[2].metric("Licitantes", len(ladder.best_by_bidder))
+    with col_reload:
+        # Bids recorded elsewhere (other sessions, the main view) are not in the ladder
+        if st.button("🔄 Recarregar", key="btn_reload_auction", use_container_width=True):
+            st.session_state[AUCTION_STATE_KEY] = _load_auction_state(
+                bid_repo, price_summaries, ladder.item_id, ladder.bidding_id
+            )
+            st.rerun(scope="fragment")
+
+    col_ranking, col_recent = st.columns(2)
+    with col_ranking:
+        st.markdown("##### Classificação")
+        st.dataframe(
+            ladder.ranking(),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "Melhor Lance (R$)": st.column_config.NumberColumn(format="R$ %.2f")
+            },
+        )
+    with col_recent:
+        st.markdown("##### Últimos Lances")
+        st.dataframe(
+            ladder.last_bids(RECENT_BIDS_SHOWN),
+            hide_index=True,
+            use_container_width=True,
+            column_config={"Lance (R$)": st.column_config.NumberColumn(format="R$ %.2f")},
+        )
+
+    st.plotly_chart(state["figure"], use_container_width=True, key="auction_chart")
+
+    if submitted:
+        state["last_latency_ms"] = (time.perf_counter() - started) * 1000
+    if state["last_latency_ms"] is not None:
+        st.caption(f"Último lance registrado e exibido em {state['last_latency_ms']:.0f} ms.")
@@ -13,6 +13,9 @@ from ..tabs.item import display_items_tab
 from ..tabs.quote import display_quotes_tab
 from ..tabs.bid import display_bids_tab
 
+ACTIVE_TAB_KEY = "management_active_tab"
+LAST_ACTIVE_TAB_KEY = "management_last_active_tab"
+
 
 def show_management_tables_view(
     bidding_repo,  # : BiddingRepository,
@@ -21,6 +24,7 @@ def show_management_tables_view(
     quote_repo,  # : QuoteRepository,
     bidder_repo,  # : BidderRepository,
     bid_repo,  # : BidRepository
+    price_summaries,  # : PriceSummaryStore
 ):
     """
     Displays the main management tables page with different tabs for each entity.
@@ -28,38 +32,37 @@ def show_management_tables_view(
     """
     st.title("Gerenciamento de Tabelas do Sistema")
 
-    tab_labels = [
-        "Licitações",
-        "Itens",
-        "Fornecedores",
-        "Orçamentos",
-        "Licitantes",
-        "Lances",
-    ]
-
-    tabs = st.tabs(tab_labels)
-
-    # Assign content to each tab by calling the respective display function
-    with tabs[0]:  # Licitações
-        display_biddings_tab(bidding_repo)
-
-    with tabs[1]:  # Itens
+    # Tab label -> function that renders it. Only the active tab runs: st.tabs would
+    # run (and load the data of) every tab on each rerun.
+    tab_renderers = {
+        "Licitações": lambda: display_biddings_tab(bidding_repo),
         # Items tab needs bidding_repo for parent selection
-        display_items_tab(item_repo, bidding_repo)
-
-    with tabs[2]:  # Fornecedores
-        display_suppliers_tab(supplier_repo)
-
-    with tabs[3]:  # Orçamentos
+        "Itens": lambda: display_items_tab(item_repo, bidding_repo, price_summaries),
+        "Fornecedores": lambda: display_suppliers_tab(supplier_repo),
         # Quotes tab needs bidding_repo (parent selection), item_repo, supplier_repo (for data prep)
-        display_quotes_tab(quote_repo, bidding_repo, item_repo, supplier_repo)
+        "Orçamentos": lambda: display_quotes_tab(
+            quote_repo, bidding_repo, item_repo, supplier_repo
+        ),
+        "Licitantes": lambda: display_bidders_tab(bidder_repo),
+        # Bids tab needs bidding_repo (parent selection), item_repo, bidder_repo (for data prep)
+        "Lances": lambda: display_bids_tab(bid_repo, bidding_repo, item_repo, bidder_repo),
+    }
+    tab_labels = list(tab_renderers)
 
-    with tabs[4]:  # Licitantes
-        display_bidders_tab(bidder_repo)
+    # The selection is kept in session_state under the widget key. Clicking the
+    # selected option deselects it (None): keep showing the last active tab then.
+    if st.session_state.get(ACTIVE_TAB_KEY) not in tab_labels:
+        last_tab = st.session_state.get(LAST_ACTIVE_TAB_KEY)
+        st.session_state[ACTIVE_TAB_KEY] = last_tab if last_tab in tab_labels else tab_labels[0]
+    active_tab = st.segmented_control(
+        "Tabela",
+        options=tab_labels,
+        key=ACTIVE_TAB_KEY,
+        label_visibility="collapsed",
+    )
+    st.session_state[LAST_ACTIVE_TAB_KEY] = active_tab
 
-    with tabs[5]:  # Lances
-        # Bids tab needs bidding_repo (parent selection), item_repo, bidder_repo (for data prep)
-        display_bids_tab(bid_repo, bidding_repo, item_repo, bidder_repo)
+    tab_renderers[active_tab]()
 
 
 # Removed all previous configuration dicts and helper functions as they are now in their respective tab_content files.
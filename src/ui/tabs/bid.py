@@ -3,6 +3,8 @@ import pandas as pd
 from decimal import Decimal  # Keep for column config if needed
 from ..components.entity_manager import display_entity_management_ui
 from services.dataframes import get_bids_dataframe  # Corrected import
+from repository.queries import bids_with_names
+from repository.sqlmodel import Page
 
 # Type hinting for repositories (optional but good practice)
 # from db.repositories import BidRepository, BiddingRepository, ItemRepository, BidderRepository
@@ -11,45 +13,28 @@ from services.dataframes import get_bids_dataframe  # Corrected import
 def prepare_bids_dataframe_via_service(
     bid_repo,  # : BidRepository,
     selected_fks: dict,
-    item_repo,  # : ItemRepository,
-    bidder_repo,  # : BidderRepository
-) -> pd.DataFrame:
+    paging: dict = None,
+) -> Page:
     """
-    Prepares the Bids DataFrame by:
-    1. Filtering raw bid data based on the selected bidding_id.
+    Prepares one page of the Bids DataFrame by:
+    1. Loading only the bids of the selected bidding_id, with bidder and item
+       names joined in the database (paginated and searched in SQL via `paging`).
     2. Calling the centralized get_bids_dataframe service function.
     """
     bidding_id = selected_fks.get("bidding_id")
     if bidding_id is None:
-        return pd.DataFrame()  # Return empty if no bidding selected
+        return Page(pd.DataFrame())  # Return empty if no bidding selected
 
-    # 1. Fetch all bids and filter them by bidding_id
-    all_bids_list_models = bid_repo.get_all()  # List of Bid model instances
-    if not all_bids_list_models:
-        return pd.DataFrame()
+    # 1. One query: a page of the bidding's bids plus bidder_name/item_name
+    page = bid_repo.fetch_page(bids_with_names(bidding_id=bidding_id), **(paging or {}))
+    if page.frame.empty:
+        return Page(pd.DataFrame())  # No bids for the selected bidding
 
-    # Filter bids that belong to the selected bidding
-    # Assuming Bid model has a 'bidding_id' attribute
-    filtered_bids_models = [
-        bid for bid in all_bids_list_models if bid.bidding_id == bidding_id
-    ]
+    # 2. Call the service function to get the processed DataFrame
+    # The service function handles date and price conversions.
+    bids_display_df = get_bids_dataframe(bids_list=page.frame)
 
-    if not filtered_bids_models:
-        return pd.DataFrame()  # No bids for the selected bidding
-
-    # 2. Fetch all items and bidders (needed by get_bids_dataframe for mapping)
-    all_items_list_models = item_repo.get_all()
-    all_bidders_list_models = bidder_repo.get_all()
-
-    # 3. Call the service function to get the processed DataFrame
-    # The service function now handles item_name, bidder_name, and date conversions.
-    bids_display_df = get_bids_dataframe(
-        bids_list=filtered_bids_models,
-        bidders_list=all_bidders_list_models if all_bidders_list_models else [],
-        items_list=all_items_list_models if all_items_list_models else [],
-    )
-
-    return bids_display_df
+    return Page(bids_display_df, page.next_cursor)
 
 
 def display_bids_tab(bid_repo, bidding_repo, item_repo, bidder_repo):
@@ -111,10 +96,7 @@ def display_bids_tab(bid_repo, bidding_repo, item_repo, bidder_repo):
         decimal_fields=["price"],  # Still needed for handle_save_changes
         fields_to_remove_before_update=["item_name", "bidder_name"],
         foreign_key_selection_configs=[fk_bidding_selection_config],
-        custom_dataframe_preparation_func=lambda main_repo,
-        fks_dict: prepare_bids_dataframe_via_service(
-            main_repo, fks_dict, item_repo, bidder_repo
-        ),
+        custom_dataframe_preparation_func=prepare_bids_dataframe_via_service,
         editor_key_suffix="bids",
         is_editable=False,  # Set to read-only
     )
@@ -1,12 +1,44 @@
 import streamlit as st
 import pandas as pd
 from decimal import Decimal  # For consistency, though not directly used
-from ..components.entity_manager import display_entity_management_ui
+from repository.sqlmodel import Page
+from services.item_import import ImportFileError, import_items
+from ..components.entity_manager import display_entity_management_ui, load_and_prepare_data
+from ..utils.utils import get_options_map
+
+IMPORT_REPORT_KEY = "item_import_report"
+# Columns of item_price_summary shown next to each item (see services/price_summary.py)
+SUMMARY_COLUMNS = [
+    "min_quote_price",
+    "avg_quote_price",
+    "best_supplier_name",
+    "lowest_bid_price",
+    "leading_bidder_name",
+    "bid_count",
+    "last_bid_at",
+]
 # from db.repositories import ItemRepository, BiddingRepository # For type hinting
 
 
+def prepare_items_with_summary(
+    item_repo, price_summaries, selected_fks: dict, paging: dict = None
+) -> Page:
+    """
+    Loads one page of items (see load_and_prepare_data) and adds the price summary
+    columns of those items, read from item_price_summary.
+    """
+    page = load_and_prepare_data(
+        item_repo, "Itens", selected_foreign_keys=selected_fks, paging=paging
+    )
+    if page.frame.empty:
+        return page
+    summaries = price_summaries.frame(page.frame["id"].tolist())
+    summaries = summaries[["item_id", *SUMMARY_COLUMNS]].rename(columns={"item_id": "id"})
+    return Page(page.frame.merge(summaries, on="id", how="left"), page.next_cursor)
+
+
 def display_items_tab(
-    item_repo, bidding_repo
+    item_repo, bidding_repo, price_summaries
 ):  # item_repo: ItemRepository, bidding_repo: BiddingRepository
     """Displays the content for the Items management tab."""
 
@@ -24,7 +56,15 @@ def display_items_tab(
     }
 
     # Columns specifically for user display in st.data_editor
-    item_cols_to_display = ["name", "desc", "code", "quantity", "unit", "notes"]
+    item_cols_to_display = [
+        "name",
+        "desc",
+        "code",
+        "quantity",
+        "unit",
+        *SUMMARY_COLUMNS,
+        "notes",
+    ]
 
     item_column_config = {
         "id": st.column_config.NumberColumn(
@@ -52,6 +92,25 @@ def display_items_tab(
         "notes": st.column_config.TextColumn(
             "Observações", help="Observações adicionais sobre o item (opcional)."
         ),
+        "min_quote_price": st.column_config.NumberColumn(
+            "Menor Orçamento", format="R$ %.2f", disabled=True
+        ),
+        "avg_quote_price": st.column_config.NumberColumn(
+            "Orçamento Médio", format="R$ %.2f", disabled=True
+        ),
+        "best_supplier_name": st.column_config.TextColumn(
+            "Melhor Fornecedor", disabled=True
+        ),
+        "lowest_bid_price": st.column_config.NumberColumn(
+            "Menor Lance", format="R$ %.2f", disabled=True
+        ),
+        "leading_bidder_name": st.column_config.TextColumn(
+            "Licitante à Frente", disabled=True
+        ),
+        "bid_count": st.column_config.NumberColumn("Lances", disabled=True),
+        "last_bid_at": st.column_config.DatetimeColumn(
+            "Último Lance", format="YYYY-MM-DD HH:mm", disabled=True
+        ),
         "bidding_id": st.column_config.NumberColumn(
             "ID da Licitação",
             disabled=True,
@@ -80,5 +139,106 @@ def display_items_tab(
         foreign_key_selection_configs=[fk_bidding_selection_config],
         # Default load_and_prepare_data in generic_entity_management will handle filtering by selected bidding_id.
         editor_key_suffix="items",
+        custom_dataframe_preparation_func=lambda repo, fks, paging: (
+            prepare_items_with_summary(repo, price_summaries, fks, paging)
+        ),
         is_editable=False,  # Set to read-only
     )
+
+    display_item_import(item_repo, bidding_repo)
+
+
+def display_item_import(item_repo, bidding_repo):
+    """Bulk import of edital items from a CSV/XLSX file, with a dry-run preview."""
+    with st.expander("📥 Importar Itens do Edital (CSV/XLSX)", expanded=False):
+        st.caption(
+            "Colunas reconhecidas: código/item, nome (ou descrição), descrição, unidade, "
+            "quantidade e observações. A primeira linha deve conter os cabeçalhos."
+        )
+        bidding_options_map, bidding_option_ids = get_options_map(
+            data_list=bidding_repo.get_all(),
+            extra_cols=["city", "process_number", "mode"],
+            default_message="Selecione a Licitação de destino...",
+        )
+        bidding_id = st.selectbox(
+            "Licitação de destino*",
+            options=bidding_option_ids,
+            format_func=lambda x: bidding_options_map.get(x, str(x)),
+            key="sb_bidding_item_import",
+        )
+        uploaded_file = st.file_uploader(
+            "Arquivo de itens", type=["csv", "xlsx"], key="item_import_file"
+        )
+
+        col_preview, col_import = st.columns(2)
+        run_preview = col_preview.button(
+            "🔎 Simular Importação",
+            key="btn_item_import_preview",
+            use_container_width=True,
+            disabled=uploaded_file is None or bidding_id is None,
+        )
+        run_import = col_import.button(
+            "💾 Importar Itens",
+            key="btn_item_import_run",
+            type="primary",
+            use_container_width=True,
+            disabled=uploaded_file is None or bidding_id is None,
+        )
+
+        if run_preview or run_import:
+            try:
+                with st.spinner("Lendo arquivo..."):
+                    report = import_items(
+                        uploaded_file,
+                        uploaded_file.name,
+                        bidding_id,
+                        item_repo,
+                        dry_run=run_preview,
+                    )
+            except ImportFileError as e:
+                st.error(str(e))
+                st.session_state.pop(IMPORT_REPORT_KEY, None)
+            else:
+                st.session_state[IMPORT_REPORT_KEY] = (run_preview, report)
+                if run_import and report.rows_imported:
+                    st.rerun()  # Refresh the items table above
+
+        if IMPORT_REPORT_KEY in st.session_state:
+            dry_run, report = st.session_state[IMPORT_REPORT_KEY]
+            _display_import_report(dry_run, report)
+
+
+def _display_import_report(dry_run, report):
+    if dry_run:
+        st.info(
+            f"Simulação: {report.rows_read} linha(s) lida(s), {report.rows_valid} válida(s), "
+            f"{report.error_count} com erro. Nenhum item foi gravado."
+        )
+    elif report.rows_imported:
+        st.success(
+            f"{report.rows_imported} item(ns) importado(s) de {report.rows_read} linha(s) lida(s)."
+        )
+    else:
+        st.warning(f"Nenhum item importado de {report.rows_read} linha(s) lida(s).")
+
+    if report.column_mapping:
+        st.caption(
+            "Mapeamento de colunas: "
+            + ", ".join(f"{header} → {field}" for header, field in report.column_mapping.items())
+        )
+    if dry_run and not report.preview.empty:
+        st.markdown("##### Prévia dos itens válidos")
+        st.dataframe(report.preview, hide_index=True, use_container_width=True)
+    if report.error_count:
+        st.markdown(f"##### Linhas com erro ({report.error_count})")
+        if report.error_count > len(report.errors):
+            st.caption(f"Exibindo as primeiras {len(report.errors)} linhas com erro.")
+        errors_df = report.errors_frame()
+        st.dataframe(errors_df, hide_index=True, use_container_width=True)
+        st.download_button(
+            "Baixar relatório de erros (CSV)",
+            data=errors_df.to_csv(index=False, sep=";").encode("utf-8-sig"),
+            file_name="erros_importacao_itens.csv",
+            mime="text/csv",
+            key="btn_item_import_errors",
+        )
@@ -5,6 +5,13 @@ from decimal import (
 )  # Keep for column config if needed, though calc is now in service
 from ..components.entity_manager import display_entity_management_ui
 from services.dataframes import get_quotes_dataframe  # Corrected import
+from repository.queries import quotes_with_names
+from repository.sqlmodel import Page
+from services.item_import import ImportFileError
+from services.quote_import import ItemIndex, import_price_list, import_reviewed_rows
+from ..utils.utils import get_options_map
+
+PRICE_LIST_REPORT_KEY = "price_list_import_report"
 
 # Type hinting for repositories (optional but good practice)
 # from db.repositories import QuoteRepository, BiddingRepository, ItemRepository, SupplierRepository
@@ -13,66 +20,31 @@ from services.dataframes import get_quotes_dataframe  # Corrected import
 def prepare_quotes_dataframe_via_service(
     quote_repo,  # : QuoteRepository,
     selected_fks: dict,
-    item_repo,  # : ItemRepository,
-    supplier_repo,  # : SupplierRepository
-) -> pd.DataFrame:
+    paging: dict = None,
+) -> Page:
     """
-    Prepares the Quotes DataFrame by:
-    1. Filtering raw quote data based on the selected bidding_id.
+    Prepares one page of the Quotes DataFrame by:
+    1. Loading only the quotes of the selected bidding_id, with supplier and item
+       names joined in the database (paginated and searched in SQL via `paging`).
     2. Calling the centralized get_quotes_dataframe service function.
     """
     bidding_id = selected_fks.get("bidding_id")
     if bidding_id is None:
         # The generic UI will show "select parent" message based on block_if_parent_not_selected
-        return pd.DataFrame()  # Return empty if no bidding selected
-
-    # 1. Fetch all items to filter by bidding_id and later pass for name mapping
-    all_items_list = item_repo.get_all()
-    if not all_items_list:
-        return pd.DataFrame()
-
-    items_df = pd.DataFrame([item.model_dump() for item in all_items_list])
-    if (
-        items_df.empty
-        or "bidding_id" not in items_df.columns
-        or "id" not in items_df.columns
-    ):
-        return pd.DataFrame()
-
-    items_for_selected_bidding = items_df[items_df["bidding_id"] == bidding_id]
-    if items_for_selected_bidding.empty:
-        return pd.DataFrame()  # No items for this bidding, so no quotes to show
-
-    item_ids_for_selected_bidding = set(items_for_selected_bidding["id"])
-
-    # 2. Fetch all quotes and filter them
-    all_quotes_list_models = quote_repo.get_all()  # List of Quote model instances
-    if not all_quotes_list_models:
-        return pd.DataFrame()
-
-    # Filter quotes that belong to the items of the selected bidding
-    filtered_quotes_models = [
-        quote
-        for quote in all_quotes_list_models
-        if quote.item_id in item_ids_for_selected_bidding
-    ]
-
-    if not filtered_quotes_models:
-        return pd.DataFrame()  # No quotes for the items in the selected bidding
+        return Page(pd.DataFrame())  # Return empty if no bidding selected
 
-    # 3. Fetch all suppliers (needed by get_quotes_dataframe for mapping)
-    all_suppliers_list_models = supplier_repo.get_all()
-    # all_items_list_models is already all_items_list
-
-    # 4. Call the service function to get the processed DataFrame
-    # The service function now handles item_name, supplier_name, calculated_price, and date conversions.
-    quotes_display_df = get_quotes_dataframe(
-        quotes_list=filtered_quotes_models,
-        suppliers_list=all_suppliers_list_models if all_suppliers_list_models else [],
-        items_list=all_items_list,  # Pass all items; service will map based on IDs in filtered_quotes_models
+    # 1. One query: a page of the bidding's quotes plus supplier_name/item_name
+    page = quote_repo.fetch_page(
+        quotes_with_names(bidding_id=bidding_id), **(paging or {})
     )
+    if page.frame.empty:
+        return Page(pd.DataFrame())  # No quotes for the items in the selected bidding
+
+    # 2. Call the service function to get the processed DataFrame
+    # The service function handles calculated_price and date conversions.
+    quotes_display_df = get_quotes_dataframe(quotes_list=page.frame)
 
-    return quotes_display_df
+    return Page(quotes_display_df, page.next_cursor)
 
 
 def display_quotes_tab(quote_repo, bidding_repo, item_repo, supplier_repo):
@@ -192,10 +164,198 @@ def display_quotes_tab(quote_repo, bidding_repo, item_repo, supplier_repo):
             "calculated_price",
         ],  # These are display-only
         foreign_key_selection_configs=[fk_bidding_selection_config],
-        custom_dataframe_preparation_func=lambda main_repo,
-        fks_dict: prepare_quotes_dataframe_via_service(
-            main_repo, fks_dict, item_repo, supplier_repo
-        ),
+        custom_dataframe_preparation_func=prepare_quotes_dataframe_via_service,
         editor_key_suffix="quotes",
         is_editable=False,  # Set to read-only
     )
+
+    display_price_list_import(quote_repo, bidding_repo, item_repo, supplier_repo)
+
+
+def display_price_list_import(quote_repo, bidding_repo, item_repo, supplier_repo):
+    """Bulk quote import from a supplier price list, with a review queue for unmatched rows."""
+    with st.expander("📥 Importar Lista de Preços de Fornecedor (CSV/XLSX)", expanded=False):
+        st.caption(
+            "Cada linha é associada a um item da licitação pelo código ou, se o código não "
+            "corresponder, pelo nome. Colunas reconhecidas: código, nome/descrição, preço, "
+            "frete, custos adicionais, impostos, observações e link."
+        )
+        col_bidding, col_supplier, col_margin = st.columns([3, 3, 2])
+        bidding_options_map, bidding_option_ids = get_options_map(
+            data_list=bidding_repo.get_all(),
+            extra_cols=["city", "process_number", "mode"],
+            default_message="Selecione a Licitação...",
+        )
+        with col_bidding:
+            bidding_id = st.selectbox(
+                "Licitação*",
+                options=bidding_option_ids,
+                format_func=lambda x: bidding_options_map.get(x, str(x)),
+                key="sb_bidding_price_list",
+            )
+        supplier_options_map, supplier_option_ids = get_options_map(
+            data_list=supplier_repo.get_all(),
+            default_message="Selecione o Fornecedor...",
+        )
+        with col_supplier:
+            supplier_id = st.selectbox(
+                "Fornecedor*",
+                options=supplier_option_ids,
+                format_func=lambda x: supplier_options_map.get(x, str(x)),
+                key="sb_supplier_price_list",
+            )
+        with col_margin:
+            default_margin = st.number_input(
+                "Margem para novos orçamentos (%)",
+                min_value=0.0,
+                value=20.0,
+                format="%.2f",
+                key="price_list_default_margin",
+                help="Orçamentos já existentes mantêm a margem atual.",
+            )
+        uploaded_file = st.file_uploader(
+            "Lista de preços", type=["csv", "xlsx"], key="price_list_file"
+        )
+
+        ready = uploaded_file is not None and bidding_id is not None and supplier_id is not None
+        col_preview, col_import = st.columns(2)
+        run_preview = col_preview.button(
+            "🔎 Simular Importação",
+            key="btn_price_list_preview",
+            use_container_width=True,
+            disabled=not ready,
+        )
+        run_import = col_import.button(
+            "💾 Importar Orçamentos",
+            key="btn_price_list_import",
+            type="primary",
+            use_container_width=True,
+            disabled=not ready,
+        )
+
+        if run_preview or run_import:
+            try:
+                with st.spinner("Associando itens..."):
+                    report = import_price_list(
+                        uploaded_file,
+                        uploaded_file.name,
+                        bidding_id,
+                        supplier_id,
+                        item_repo,
+                        quote_repo,
+                        default_margin,
+                        dry_run=run_preview,
+                    )
+            except ImportFileError as e:
+                st.error(str(e))
+                st.session_state.pop(PRICE_LIST_REPORT_KEY, None)
+            else:
+                st.session_state[PRICE_LIST_REPORT_KEY] = {
+                    "dry_run": run_preview,
+                    "report": report,
+                    "bidding_id": bidding_id,
+                    "supplier_id": supplier_id,
+                    "default_margin": default_margin,
+                }
+
+        state = st.session_state.get(PRICE_LIST_REPORT_KEY)
+        if state is not None:
+            _display_price_list_report(state)
+            _display_review_queue(state, quote_repo, item_repo)
+
+
+def _display_price_list_report(state):
+    report = state["report"]
+    if state["dry_run"]:
+        st.info(
+            f"Simulação: {report.rows_read} linha(s) lida(s); "
+            f"{report.matched_by_code} associada(s) por código e {report.matched_by_name} por nome; "
+            f"{report.created} orçamento(s) seriam criados e {report.updated} atualizados; "
+            f"{report.review_count} para revisão; {report.error_count} com erro. "
+            "Nenhum orçamento foi gravado."
+        )
+    else:
+        st.success(
+            f"{report.created} orçamento(s) criado(s) e {report.updated} atualizado(s) de "
+            f"{report.rows_read} linha(s) lida(s); {report.review_count} para revisão; "
+            f"{report.error_count} com erro."
+        )
+    if report.column_mapping:
+        st.caption(
+            "Mapeamento de colunas: "
+            + ", ".join(f"{header} → {field}" for header, field in report.column_mapping.items())
+        )
+    if report.error_count:
+        st.markdown(f"##### Linhas com erro ({report.error_count})")
+        if report.error_count > len(report.errors):
+            st.caption(f"Exibindo as primeiras {len(report.errors)} linhas com erro.")
+        st.dataframe(report.errors_frame(), hide_index=True, use_container_width=True)
+
+
+def _display_review_queue(state, quote_repo, item_repo):
+    report = state["report"]
+    if report.review_count:
+        st.markdown(f"##### Fila de revisão ({report.review_count})")
+    result = state.pop("review_result", None)
+    if result is not None:
+        st.success(
+            f"{result.created} orçamento(s) criado(s) e {result.updated} atualizado(s) "
+            "a partir da revisão."
+        )
+        for error in result.errors:
+            st.error(f"Linha {error.row}: {error.message}")
+    if not report.review:
+        return
+    if report.review_count > len(report.review):
+        st.caption(f"Exibindo as primeiras {len(report.review)} linhas sem item associado.")
+    review_df = report.review_frame()
+    st.download_button(
+        "Baixar fila de revisão (CSV)",
+        data=review_df.to_csv(index=False, sep=";").encode("utf-8-sig"),
+        file_name="revisao_lista_precos.csv",
+        mime="text/csv",
+        key="btn_price_list_review_download",
+    )
+    if state["dry_run"]:
+        st.caption("Importe a lista para associar manualmente as linhas da fila.")
+        return
+
+    index = ItemIndex(item_repo.find_by(bidding_id=state["bidding_id"]))
+    label_to_id = {label: item_id for item_id, label in index.labels.items()}
+    review_df.insert(0, "item", None)
+    edited_review_df = st.data_editor(
+        review_df,
+        column_config={
+            "item": st.column_config.SelectboxColumn(
+                "Item da Licitação", options=list(label_to_id), help="Item para esta linha."
+            ),
+            "row": st.column_config.NumberColumn("Linha", disabled=True),
+            "code": st.column_config.TextColumn("Código", disabled=True),
+            "name": st.column_config.TextColumn("Nome", disabled=True),
+            "price": st.column_config.NumberColumn("Preço", format="R$ %.2f", disabled=True),
+            "reason": st.column_config.TextColumn("Motivo", disabled=True),
+        },
+        column_order=["item", "row", "code", "name", "price", "reason"],
+        hide_index=True,
+        use_container_width=True,
+        key="price_list_review_editor",
+    )
+    if st.button("💾 Gravar linhas revisadas", key="btn_price_list_review_save"):
+        reviewed = edited_review_df.assign(item_id=edited_review_df["item"].map(label_to_id))
+        result = import_reviewed_rows(
+            reviewed,
+            state["bidding_id"],
+            state["supplier_id"],
+            quote_repo,
+            state["default_margin"],
+        )
+        state["review_result"] = result
+        # Assigned rows leave the queue; the editor is reset to the remaining rows
+        report.review = [
+            row
+            for row, item_id in zip(report.review, reviewed["item_id"].tolist())
+            if pd.isna(item_id)
+        ]
+        report.review_count -= int(reviewed["item_id"].notna().sum())
+        del st.session_state["price_list_review_editor"]
+        st.rerun()
@@ -0,0 +1,168 @@
+import random
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.pricing import PRICE_INPUT_COLUMNS, calculate_prices
+
+
+def baseline_calculated_price(quotes_df: pd.DataFrame) -> pd.Series:
+    """The formula get_quotes_dataframe used before the fixed-point engine (f14b8d1)."""
+    quotes_df = quotes_df.copy()
+    cols_for_calc = ["price", "freight", "additional_costs", "taxes", "margin"]
+    for col in cols_for_calc:
+        if col not in quotes_df.columns:
+            quotes_df[col] = Decimal("0.0")  # Add column if missing, initialize to 0
+        else:
+            # Convert to Decimal, handling potential errors from various input types
+            def to_decimal_safe(value):
+                if isinstance(value, Decimal):
+                    return value
+                if value is None:
+                    return Decimal("0.0")
+                try:
+                    return Decimal(str(value))
+                except (InvalidOperation, TypeError, ValueError):
+                    return Decimal("NaN")  # Use NaN for values that cannot be converted
+
+            quotes_df[col] = quotes_df[col].apply(to_decimal_safe)
+            # Replace NaN with 0 for calculation, or decide how to handle rows with bad data
+            quotes_df[col] = quotes_df[col].replace(Decimal("NaN"), Decimal("0.0"))
+
+    base_price = quotes_df["price"]
+    freight = quotes_df["freight"]
+    additional_costs = quotes_df["additional_costs"]
+    taxes_percentage = quotes_df["taxes"]
+    margin_percentage = quotes_df["margin"]
+
+    price_with_freight_costs = base_price + freight + additional_costs
+    taxes_value = price_with_freight_costs * (taxes_percentage / Decimal(100))
+    price_before_margin = price_with_freight_costs + taxes_value
+    margin_value = price_before_margin * (margin_percentage / Decimal(100))
+    return price_before_margin + margin_value
+
+
+def assert_matches_baseline(quotes_df: pd.DataFrame) -> None:
+    expected = baseline_calculated_price(quotes_df)
+    actual = calculate_prices(quotes_df)
+    assert actual.index.equals(quotes_df.index)
+    for position, (got, want) in enumerate(zip(actual, expected)):
+        assert isinstance(got, Decimal)
+        assert got.as_tuple() == want.as_tuple(), f"row {position}: {quotes_df.iloc[position].to_dict()}"
+
+
+def random_quotes(rng: random.Random, rows: int, as_decimal: bool) -> pd.DataFrame:
+    def cost(scale: int = 5) -> Decimal:
+        return Decimal(rng.randint(0, 10**10)).scaleb(-scale)
+
+    data = {
+        "price": [cost() for _ in range(rows)],
+        "freight": [cost() if rng.random() < 0.5 else Decimal(0) for _ in range(rows)],
+        "additional_costs": [Decimal(rng.randint(-10**6, 10**7)).scaleb(-5) for _ in range(rows)],
+        "taxes": [Decimal(rng.randint(0, 9999)).scaleb(-2) for _ in range(rows)],
+        "margin": [rng.randint(-5000, 10**6) / 10**4 for _ in range(rows)],
+    }
+    if not as_decimal:
+        for col in ("price", "freight", "additional_costs", "taxes"):
+            data[col] = [float(value) for value in data[col]]
+    return pd.DataFrame(data)
+
+
+@pytest.mark.parametrize("as_decimal", [True, False])
+def test_random_rows_match_baseline(as_decimal):
+    rng = random.Random(20261016)
+    assert_matches_baseline(random_quotes(rng, 5000, as_decimal))
+
+
+def test_ties_at_the_fourth_decimal_are_not_rounded():
+    quotes_df = pd.DataFrame(
+        {
+            # 0.00005 steps land exactly between two 0.0001 values
+            "price": [Decimal("0.00005"), Decimal("0.00015"), Decimal("10.00025"), Decimal("1")],
+            "freight": [Decimal("0")] * 4,
+            "additional_costs": [Decimal("0")] * 4,
+            "taxes": [Decimal("0"), Decimal("0"), Decimal("0"), Decimal("12.50")],
+            "margin": [0.0, 0.0, 0.0, 0.0004],
+        }
+    )
+    assert_matches_baseline(quotes_df)
+    assert calculate_prices(quotes_df).iloc[0] == Decimal("0.00005")
+
+
+def test_invalid_and_empty_cells_match_baseline():
+    cells = [None, np.nan, pd.NA, "abc", "", " 5 ", "1_000", True, Decimal("NaN"), 7, "2.5"]
+    quotes_df = pd.DataFrame(
+        {
+            "price": pd.Series(cells, dtype=object),
+            "freight": [Decimal("1.5")] * len(cells),
+            "additional_costs": pd.Series([None] * len(cells), dtype=object),
+            "taxes": [10.0] * len(cells),
+            "margin": [np.nan] + [5.0] * (len(cells) - 1),
+        }
+    )
+    assert_matches_baseline(quotes_df)
+
+
+def test_exponents_match_baseline():
+    quotes_df = pd.DataFrame(
+        {
+            "price": [Decimal("12.0000"), Decimal("12"), Decimal("1E+1"), Decimal("0.00"), 12.0, 1e-05],
+            "freight": [Decimal("0")] * 6,
+            "additional_costs": [Decimal("0.0")] * 6,
+            "taxes": [Decimal("0"), Decimal("10"), Decimal("6.50"), Decimal("20.0"), 0.0, 12.5],
+            "margin": [0.0, 10.0, 0.5, 0.0, 1.25, 0.0],
+        }
+    )
+    assert_matches_baseline(quotes_df)
+
+
+def test_more_places_than_the_scale_fall_back_to_decimal():
+    quotes_df = pd.DataFrame(
+        {
+            "price": [Decimal("0.1000000000000000001"), Decimal("-0"), Decimal("0.000001")],
+            "freight": [Decimal("0")] * 3,
+            "additional_costs": [Decimal("0")] * 3,
+            "taxes": [Decimal("0"), Decimal("-10"), Decimal("0")],
+            "margin": [0.0, 0.0, 0.0],
+        }
+    )
+    assert_matches_baseline(quotes_df)
+    assert str(calculate_prices(quotes_df).iloc[0]) == "0.10000000000000000010"
+
+
+def test_missing_columns_count_as_zero():
+    quotes_df = pd.DataFrame({"price": [Decimal("10.5"), Decimal("3")], "margin": [20.0, 0.0]})
+    assert_matches_baseline(quotes_df)
+
+
+def test_int64_overflow_rows_fall_back_to_decimal():
+    quotes_df = pd.DataFrame(
+        {
+            "price": [
+                Decimal("99999999999999.99999"),
+                Decimal("123456789012.34567"),
+                Decimal("92233720368.54775"),
+                Decimal("1.23456789"),  # More places than the column stores
+            ],
+            "freight": [Decimal("99999999999999.99999"), Decimal("0"), Decimal("0"), Decimal("0")],
+            "additional_costs": [Decimal("0")] * 4,
+            "taxes": [Decimal("999.99"), Decimal("50.00"), Decimal("999.99"), Decimal("1.00")],
+            "margin": [1e9, 250.5, 99999.9999, 0.00001],
+        }
+    )
+    assert_matches_baseline(quotes_df)
+
+
+def test_infinity_is_kept_like_the_baseline():
+    quotes_df = pd.DataFrame(
+        {"price": [float("inf"), 1.0], "taxes": [10.0, 10.0], "margin": [5.0, 5.0]}
+    )
+    assert_matches_baseline(quotes_df)
+    assert calculate_prices(quotes_df).iloc[0] == Decimal("Infinity")
+
+
+def test_empty_frame():
+    quotes_df = pd.DataFrame(columns=PRICE_INPUT_COLUMNS)
+    assert calculate_prices(quotes_df).empty
@@ -0,0 +1,19 @@
+from services.similarity import ItemSimilarityIndex
+
+
+def test_add_many_keeps_the_last_row_of_an_item():
+    index = ItemSimilarityIndex()
+    index.add_many([(5, 1, "cadeira giratória", None), (5, 1, "mesa de escritório", None)])
+    assert len(index) == 1
+    assert index.similar("cadeira giratória", min_score=0.5) == []
+    assert [item_id for item_id, _ in index.similar("mesa de escritório")] == [5]
+
+
+def test_replacing_items_compacts_the_index():
+    index = ItemSimilarityIndex()
+    index.add_many([(item_id, 1, f"caneta azul {item_id}", None) for item_id in range(10)])
+    for _ in range(3):
+        index.add_many([(item_id, 1, f"caneta preta {item_id}", None) for item_id in range(10)])
+    assert index._dead <= len(index)
+    assert len(index._item_ids) <= 2 * len(index)
+    assert {item_id for item_id, _ in index.similar("caneta preta", k=20)} == set(range(10))
@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session, SQLModel, select
+
+from db.database import get_engine
+from db.models import Bidding, BiddingMode, Item, ItemPriceSummary, Quote, Supplier
+from repository.events import add_write_listener, remove_write_listener
+from repository.sqlmodel import SQLModelRepository
+from services.price_summary import PriceSummaryStore
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file database: the listeners' own connections would block on a lock
+    # held by the writing transaction
+    engine = get_engine(f"sqlite:///{tmp_path / 'bidtrack.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Bidding(id=1, city="Cidade", mode=BiddingMode.PE, process_number="1/2026"))
+        session.add(Item(id=1, code="1", name="Item", unit="un", quantity=1, bidding_id=1))
+        session.add(Supplier(id=1, name="Fornecedor"))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def make_quote(supplier_id: int, price: str) -> Quote:
+    return Quote(item_id=1, supplier_id=supplier_id, price=Decimal(price), margin=10.0)
+
+
+def test_partial_batch_delivers_once_after_the_commit(engine):
+    store = PriceSummaryStore(engine)
+    store.refresh([1])  # The summary row exists before the quotes are added
+    delivered = []
+
+    def listener(written):
+        delivered.append(len(written.inserted))
+
+    add_write_listener("quote", listener)
+    try:
+        result = SQLModelRepository(Quote, engine_instance=engine).add_many(
+            [make_quote(1, "10"), make_quote(99, "20"), make_quote(1, "30")]
+        )
+    finally:
+        remove_write_listener("quote", listener)
+
+    assert result.succeeded == [0, 2]
+    assert list(result.failed) == [1]  # FOREIGN KEY constraint failed
+    assert delivered == [2]
+    with Session(engine) as session:
+        summary = session.exec(select(ItemPriceSummary)).one()
+    (expected,) = store.compute([1])
+    assert summary.quote_count == 2
+    assert summary.min_quote_price == expected["min_quote_price"]
+    assert summary.max_quote_price == expected["max_quote_price"]
+
+
+def test_rolled_back_writes_are_not_delivered(engine):
+    delivered = []
+    add_write_listener("quote", delivered.append)
+    try:
+        with Session(engine) as session:
+            session.add(make_quote(1, "10"))
+            session.flush()
+            with session.begin_nested():
+                session.add(make_quote(1, "20"))
+            session.rollback()
+    finally:
+        remove_write_listener("quote", delivered.append)
+    assert delivered == []